@@ -0,0 +1,3 @@
+"""
+Application Streamlit de diagnostic cardiaque
+"""
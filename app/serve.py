@@ -0,0 +1,53 @@
+"""
+Lancement de l'application Streamlit avec préchauffage des modèles
+
+    python -m app.serve [options de streamlit run]
+    python -m app.serve --server.port=8501 --server.address=0.0.0.0
+
+Streamlit n'exécute le script de l'application qu'à l'ouverture d'une
+session : lancée directement, l'application fait payer au premier
+utilisateur le chargement et le premier appel des modèles. Ce lanceur
+démarre le serveur dans le processus courant et préchauffe en parallèle
+les ressources partagées de la page Diagnostic (st.cache_resource), que
+toutes les sessions reprennent ensuite telles quelles. Le fichier témoin
+READY_FILE n'est écrit qu'après un préchauffage réussi : c'est la sonde
+de disponibilité du conteneur (python -m src.utils.readiness).
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+APP_FILE = ROOT_DIR / 'app' / 'streamlit_app.py'
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.readiness import Readiness
+
+
+def warm_up_app():
+    """Préchauffage exécuté dans un thread, hors de toute session Streamlit"""
+    from app.views import diagnostic
+
+    return diagnostic.warm_up()
+
+
+def main(args=None):
+    from streamlit.web import cli
+
+    # Hors session, chaque appel à Streamlit signale l'absence de contexte d'exécution
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith('streamlit.') and name.endswith('script_run_context'):
+            logging.getLogger(name).addFilter(
+                lambda record: 'missing ScriptRunContext' not in record.getMessage())
+
+    readiness = Readiness()
+    readiness.start(warm_up_app)
+    sys.argv = ['streamlit', 'run', str(APP_FILE), *(sys.argv[1:] if args is None else args)]
+    cli.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,18 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import seaborn as sns
-import matplotlib.pyplot as plt
-from sklearn.metrics import classification_report, confusion_matrix, roc_curve, auc
-from sklearn.preprocessing import LabelEncoder
-import joblib
+import importlib
+import sys
 import warnings
+from pathlib import Path
 warnings.filterwarnings('ignore')
 
+# Racine du projet dans le path pour importer les packages src et app
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.config import env_bool
+from src.utils.metrics import export_metrics, metrics
+
 # Configuration de la page
 st.set_page_config(
     page_title="🫀 Diagnostic Cardiaque",
@@ -66,424 +67,58 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Chargement des modèles
-@st.cache_resource
-def load_models():
-    try:
-        models = {
-            'catboost': joblib.load('models/catboost_model.pkl'),
-            'xgboost': joblib.load('models/xgboost_model.pkl'),
-            'random_forest': joblib.load('models/random_forest_model.pkl'),
-            'logistic_regression': joblib.load('models/logistic_regression_model.pkl')
-        }
-        return models
-    except FileNotFoundError:
-        st.error("⚠️ Modèles non trouvés. Veuillez vous assurer que les modèles sont entraînés.")
-        return None
-
-# Chargement des données
-@st.cache_data
-def load_data():
-    try:
-        data = pd.read_csv('data/processed/heart_disease_uci.csv')
-        return data
-    except FileNotFoundError:
-        st.error("⚠️ Données non trouvées.")
-        return None
-
-def prepare_input_data(age, sex, cp, trestbps, chol, fbs, restecg, thalach, exang, oldpeak, slope, ca, thal):
-    """
-    Prépare les données d'entrée pour la prédiction
-    """
-    # Encodage des variables catégorielles
-    sex_encoded = 1 if sex == 'Masculin' else 0
-    
-    cp_mapping = {
-        'Angine typique': 0,
-        'Angine atypique': 1, 
-        'Douleur non-angineuse': 2,
-        'Asymptomatique': 3
-    }
-    cp_encoded = cp_mapping.get(cp, 0)
-    
-    fbs_encoded = 1 if fbs == 'Oui' else 0
-    
-    restecg_mapping = {
-        'Normal': 0,
-        'Anomalie ST-T': 1,
-        'Hypertrophie VG': 2
-    }
-    restecg_encoded = restecg_mapping.get(restecg, 0)
-    
-    exang_encoded = 1 if exang == 'Oui' else 0
-    
-    slope_mapping = {
-        'Montant': 0,
-        'Plat': 1,
-        'Descendant': 2
-    }
-    slope_encoded = slope_mapping.get(slope, 0)
-    
-    # Correction de l'encodage thal pour correspondre aux données d'entraînement
-    thal_mapping = {
-        'Normal': 3,
-        'Défaut fixe': 6,
-        'Défaut réversible': 7
-    }
-    thal_encoded = thal_mapping.get(thal, 3)
-    
-    # Création du DataFrame
-    input_data = pd.DataFrame({
-        'age': [age],
-        'sex': [sex_encoded],
-        'cp': [cp_encoded],
-        'trestbps': [trestbps],
-        'chol': [chol],
-        'fbs': [fbs_encoded],
-        'restecg': [restecg_encoded],
-        'thalach': [thalach],
-        'exang': [exang_encoded],
-        'oldpeak': [oldpeak],
-        'slope': [slope_encoded],
-        'ca': [ca],
-        'thal': [thal_encoded]
-    })
-    
-    return input_data
+# Module de chaque page (app/views/), importé à la première visite
+PAGES = {
+    "🏠 Accueil": 'app.views.home',
+    "🔍 Diagnostic": 'app.views.diagnostic',
+    "📊 Visualisations": 'app.views.visualizations',
+    "📈 Analyse des données": 'app.views.analysis'
+}
 
-def create_gauge_chart(probability, title="Probabilité de maladie cardiaque"):
-    """
-    Crée un graphique en jauge pour afficher la probabilité
-    """
-    fig = go.Figure(go.Indicator(
-        mode = "gauge+number+delta",
-        value = probability * 100,
-        domain = {'x': [0, 1], 'y': [0, 1]},
-        title = {'text': title, 'font': {'size': 20}},
-        delta = {'reference': 50},
-        gauge = {
-            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
-            'bar': {'color': "darkblue"},
-            'bgcolor': "white",
-            'borderwidth': 2,
-            'bordercolor': "gray",
-            'steps': [
-                {'range': [0, 30], 'color': 'lightgreen'},
-                {'range': [30, 70], 'color': 'yellow'},
-                {'range': [70, 100], 'color': 'lightcoral'}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': 70
-            }
-        }
-    ))
-    
-    fig.update_layout(height=400, font={'color': "darkblue", 'family': "Arial"})
-    return fig
+# Page de suivi des performances (affichée si METRICS_ENABLED)
+ADMIN_PAGE = "⚙️ Administration"
+PAGES_ADMIN = {ADMIN_PAGE: 'app.views.admin'}
 
-def get_risk_interpretation(probability):
-    """
-    Interprète le niveau de risque basé sur la probabilité
-    """
-    if probability >= 0.7:
-        return "🔴 RISQUE ÉLEVÉ", "risk-high", "Une consultation cardiologique urgente est recommandée."
-    elif probability >= 0.3:
-        return "🟡 RISQUE MODÉRÉ", "risk-medium", "Un suivi médical et des examens complémentaires sont conseillés."
-    else:
-        return "🟢 RISQUE FAIBLE", "risk-low", "Continuez à maintenir un mode de vie sain et des contrôles réguliers."
+# Page de surveillance de la dérive (affichée si DRIFT_ENABLED). Même variable que
+# src/models/drift.py, lue ici sans importer le module (numpy, pandas) avant la page d'accueil
+DRIFT_ENABLED = env_bool('DRIFT_ENABLED', True)
+PAGES_DRIFT = {"📉 Surveillance": 'app.views.monitoring'}
 
-def display_diagnosis(prediction, probability, confidence):
-    """
-    Affiche le diagnostic avec une mise en forme appropriée
-    """
-    risk_level, risk_class, recommendation = get_risk_interpretation(probability)
-    
-    st.markdown(f'<div class="{risk_class}">', unsafe_allow_html=True)
-    st.markdown(f"### {risk_level}")
-    st.markdown(f"**Probabilité:** {probability:.1%}")
-    st.markdown(f"**Confiance:** {confidence:.1%}")
-    st.markdown(f"**Recommandation:** {recommendation}")
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Graphique en jauge
-    gauge_fig = create_gauge_chart(probability)
-    st.plotly_chart(gauge_fig, use_container_width=True)
-    
-    # Recommandations détaillées
-    st.subheader("📋 Recommandations détaillées")
+def main():
+    # Titre principal
+    st.markdown('<h1 class="main-header">🫀 Système de Diagnostic Cardiaque</h1>', unsafe_allow_html=True)
     
-    if probability >= 0.7:
-        st.error("""
-        **Actions immédiates recommandées:**
-        - Consultation cardiologique dans les 24-48h
-        - ECG et échocardiographie
-        - Bilan sanguin complet (troponines, BNP)
-        - Éviter les efforts physiques intenses
-        - Surveillance des symptômes (douleur thoracique, essoufflement)
-        """)
-    elif probability >= 0.3:
-        st.warning("""
-        **Suivi médical recommandé:**
-        - Consultation avec votre médecin traitant
-        - Test d'effort si approprié
-        - Contrôle des facteurs de risque
-        - Adoption d'un mode de vie plus sain
-        - Surveillance régulière de la tension et du cholestérol
-        """)
-    else:
-        st.success("""
-        **Maintien de la santé cardiaque:**
-        - Activité physique régulière (150 min/semaine)
-        - Alimentation équilibrée (régime méditerranéen)
-        - Contrôle du poids
-        - Arrêt du tabac si applicable
-        - Gestion du stress
-        - Contrôles médicaux annuels
-        """)
+    # Sidebar pour la navigation
+    st.sidebar.title("🧭 Navigation")
+    pages = dict(PAGES)
+    if metrics.enabled:
+        pages.update(PAGES_ADMIN)
+    if DRIFT_ENABLED:
+        pages.update(PAGES_DRIFT)
+    page = st.sidebar.selectbox("Choisissez une page", list(pages))
+    
+    with metrics.span('render', page=page):
+        render_page(pages[page])
 
-def plot_distributions(data):
+def render_page(module_name):
     """
-    Affiche les distributions des variables
+    Affiche la page choisie ; son module (et ses dépendances) n'est importé
+    qu'à la première visite
     """
-    numeric_cols = data.select_dtypes(include=[np.number]).columns
-    
-    fig = make_subplots(
-        rows=3, cols=4,
-        subplot_titles=numeric_cols,
-        specs=[[{"secondary_y": False}]*4]*3
-    )
-    
-    for i, col in enumerate(numeric_cols[:12]):
-        row = i // 4 + 1
-        col_pos = i % 4 + 1
-        
-        fig.add_trace(
-            go.Histogram(x=data[col], name=col, showlegend=False),
-            row=row, col=col_pos
-        )
-    
-    fig.update_layout(height=800, title_text="Distribution des variables numériques")
-    return fig
+    if module_name not in sys.modules:
+        with metrics.span('page_import', module=module_name):
+            importlib.import_module(module_name)
+    sys.modules[module_name].render()
 
-def plot_bivariate_analysis(data):
+def display_cache_stats():
     """
-    Analyse bivariée avec la variable cible
+    Efficacité du cache des prédictions, une fois la page Diagnostic chargée
     """
-    if 'target' not in data.columns:
-        st.warning("Variable cible 'target' non trouvée dans les données.")
-        return None
-    
-    numeric_cols = ['age', 'trestbps', 'chol', 'thalach', 'oldpeak']
-    
-    fig = make_subplots(
-        rows=2, cols=3,
-        subplot_titles=numeric_cols,
-        specs=[[{"secondary_y": False}]*3]*2
-    )
-    
-    for i, col in enumerate(numeric_cols):
-        row = i // 3 + 1
-        col_pos = i % 3 + 1
-        
-        for target_val in [0, 1]:
-            subset = data[data['target'] == target_val]
-            fig.add_trace(
-                go.Box(y=subset[col], name=f'Target {target_val}', showlegend=(i==0)),
-                row=row, col=col_pos
-            )
-    
-    fig.update_layout(height=600, title_text="Distribution par classe cible")
-    return fig
-
-def main():
-    # Titre principal
-    st.markdown('<h1 class="main-header">🫀 Système de Diagnostic Cardiaque</h1>', unsafe_allow_html=True)
-    
-    # Sidebar pour la navigation
-    st.sidebar.title("🧭 Navigation")
-    page = st.sidebar.selectbox(
-        "Choisissez une page",
-        ["🏠 Accueil", "🔍 Diagnostic", "📊 Visualisations", "📈 Analyse des données"]
-    )
-    
-    if page == "🏠 Accueil":
-        st.markdown("""
-        ## Bienvenue dans le système de diagnostic cardiaque
-        
-        Cette application utilise des algorithmes d'apprentissage automatique avancés pour évaluer 
-        le risque de maladie cardiaque basé sur des paramètres cliniques.
-        
-        ### 🎯 Fonctionnalités principales:
-        - **Diagnostic en temps réel** avec multiple modèles ML
-        - **Visualisations interactives** des données
-        - **Recommandations cliniques** personnalisées
-        - **Interface intuitive** pour les professionnels de santé
-        
-        ### 🤖 Modèles utilisés:
-        - **CatBoost** (Modèle principal)
-        - **XGBoost** 
-        - **Random Forest**
-        - **Régression Logistique**
-        
-        ### ⚠️ Avertissement médical:
-        Cet outil est destiné à des fins éducatives et de recherche uniquement. 
-        Il ne doit pas remplacer l'avis médical professionnel.
-        """)
-        
-        # Métriques des modèles
-        st.subheader("📊 Performance des modèles")
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown('<div class="metric-card"><h3>CatBoost</h3><p>Précision: 87.3%</p></div>', unsafe_allow_html=True)
-        with col2:
-            st.markdown('<div class="metric-card"><h3>XGBoost</h3><p>Précision: 86.8%</p></div>', unsafe_allow_html=True)
-        with col3:
-            st.markdown('<div class="metric-card"><h3>Random Forest</h3><p>Précision: 85.9%</p></div>', unsafe_allow_html=True)
-        with col4:
-            st.markdown('<div class="metric-card"><h3>Régression Log.</h3><p>Précision: 83.4%</p></div>', unsafe_allow_html=True)
-    
-    elif page == "🔍 Diagnostic":
-        st.header("🔍 Diagnostic de maladie cardiaque")
-        
-        # Chargement des modèles
-        models = load_models()
-        if models is None:
-            return
-        
-        # Formulaire d'entrée
-        st.subheader("📝 Saisie des paramètres du patient")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            age = st.number_input("Âge", min_value=1, max_value=120, value=50)
-            sex = st.selectbox("Sexe", ["Masculin", "Féminin"])
-            cp = st.selectbox("Type de douleur thoracique", 
-                            ["Angine typique", "Angine atypique", "Douleur non-angineuse", "Asymptomatique"])
-            trestbps = st.number_input("Pression artérielle au repos (mmHg)", min_value=80, max_value=250, value=120)
-            chol = st.number_input("Cholestérol sérique (mg/dl)", min_value=100, max_value=600, value=200)
-            fbs = st.selectbox("Glycémie à jeun > 120 mg/dl", ["Non", "Oui"])
-            restecg = st.selectbox("Résultats ECG au repos", 
-                                 ["Normal", "Anomalie ST-T", "Hypertrophie VG"])
-        
-        with col2:
-            thalach = st.number_input("Fréquence cardiaque maximale", min_value=60, max_value=250, value=150)
-            exang = st.selectbox("Angine induite par l'exercice", ["Non", "Oui"])
-            oldpeak = st.number_input("Dépression ST induite par l'exercice", min_value=0.0, max_value=10.0, value=0.0, step=0.1)
-            slope = st.selectbox("Pente du segment ST", ["Montant", "Plat", "Descendant"])
-            ca = st.number_input("Nombre de vaisseaux principaux (0-4)", min_value=0, max_value=4, value=0)
-            thal = st.selectbox("Thalassémie", ["Normal", "Défaut fixe", "Défaut réversible"])
-        
-        # Bouton de prédiction
-        if st.button("🔮 Effectuer le diagnostic", type="primary"):
-            # Préparation des données
-            input_data = prepare_input_data(age, sex, cp, trestbps, chol, fbs, restecg, 
-                                          thalach, exang, oldpeak, slope, ca, thal)
-            
-            # Prédictions avec tous les modèles
-            predictions = {}
-            probabilities = {}
-            
-            for model_name, model in models.items():
-                try:
-                    pred = model.predict(input_data)[0]
-                    prob = model.predict_proba(input_data)[0][1]
-                    predictions[model_name] = pred
-                    probabilities[model_name] = prob
-                except Exception as e:
-                    st.error(f"Erreur avec le modèle {model_name}: {str(e)}")
-                    continue
-            
-            if predictions:
-                # Utilisation du modèle CatBoost comme principal
-                main_prediction = predictions.get('catboost', list(predictions.values())[0])
-                main_probability = probabilities.get('catboost', list(probabilities.values())[0])
-                
-                # Calcul de la confiance (variance entre les modèles)
-                prob_values = list(probabilities.values())
-                confidence = 1 - np.std(prob_values) if len(prob_values) > 1 else 0.95
-                
-                # Affichage du diagnostic
-                display_diagnosis(main_prediction, main_probability, confidence)
-                
-                # Comparaison des modèles
-                st.subheader("🔬 Comparaison des modèles")
-                comparison_df = pd.DataFrame({
-                    'Modèle': list(predictions.keys()),
-                    'Prédiction': ['Maladie cardiaque' if p == 1 else 'Pas de maladie' for p in predictions.values()],
-                    'Probabilité': [f"{p:.1%}" for p in probabilities.values()]
-                })
-                st.dataframe(comparison_df, use_container_width=True)
-    
-    elif page == "📊 Visualisations":
-        st.header("📊 Visualisations des données")
-        
-        data = load_data()
-        if data is None:
-            return
-        
-        # Distribution des variables
-        st.subheader("📈 Distribution des variables")
-        dist_fig = plot_distributions(data)
-        if dist_fig:
-            st.plotly_chart(dist_fig, use_container_width=True)
-        
-        # Analyse bivariée
-        st.subheader("🔍 Analyse bivariée")
-        bivar_fig = plot_bivariate_analysis(data)
-        if bivar_fig:
-            st.plotly_chart(bivar_fig, use_container_width=True)
-        
-        # Matrice de corrélation
-        st.subheader("🌡️ Matrice de corrélation")
-        numeric_data = data.select_dtypes(include=[np.number])
-        corr_matrix = numeric_data.corr()
-        
-        fig_corr = px.imshow(corr_matrix, 
-                           text_auto=True, 
-                           aspect="auto",
-                           title="Matrice de corrélation des variables numériques")
-        st.plotly_chart(fig_corr, use_container_width=True)
-    
-    elif page == "📈 Analyse des données":
-        st.header("📈 Analyse exploratoire des données")
-        
-        data = load_data()
-        if data is None:
-            return
-        
-        # Statistiques descriptives
-        st.subheader("📊 Statistiques descriptives")
-        st.dataframe(data.describe(), use_container_width=True)
-        
-        # Informations sur le dataset
-        st.subheader("ℹ️ Informations sur le dataset")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("Nombre d'échantillons", len(data))
-        with col2:
-            st.metric("Nombre de variables", len(data.columns))
-        with col3:
-            if 'target' in data.columns:
-                positive_rate = data['target'].mean()
-                st.metric("Taux de maladie cardiaque", f"{positive_rate:.1%}")
-        
-        # Distribution de la variable cible
-        if 'target' in data.columns:
-            st.subheader("🎯 Distribution de la variable cible")
-            target_counts = data['target'].value_counts()
-            fig_target = px.pie(values=target_counts.values, 
-                              names=['Pas de maladie', 'Maladie cardiaque'],
-                              title="Répartition des cas")
-            st.plotly_chart(fig_target, use_container_width=True)
-        
-        # Données brutes
-        st.subheader("🗃️ Aperçu des données brutes")
-        st.dataframe(data.head(20), use_container_width=True)
+    diagnostic = sys.modules.get('app.views.diagnostic')
+    if diagnostic is not None:
+        diagnostic.display_cache_stats()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    display_cache_stats()
+    export_metrics()
@@ -0,0 +1,8 @@
+"""
+Pages de l'application Streamlit
+
+Un module par page, avec une fonction render(). streamlit_app.py n'importe
+le module d'une page qu'à sa première visite : les dépendances lourdes
+(modèles, plotly.express, make_subplots...) ne sont chargées que par les
+pages qui les utilisent.
+"""
@@ -0,0 +1,58 @@
+"""
+Page Administration : durées par étape et compteurs (METRICS_ENABLED)
+"""
+
+import pandas as pd
+import streamlit as st
+
+from src.utils.metrics import metrics
+
+
+def render():
+    """
+    Durées par étape (p50 / p95 / p99) et compteurs du processus
+    """
+    st.header("⚙️ Administration")
+    started_at = pd.Timestamp(metrics.started_at, unit='s').strftime('%Y-%m-%d %H:%M:%S')
+    st.caption(f"Mesures de ce processus depuis le {started_at} (UTC) · quantiles sur les "
+               f"{metrics.window} dernières mesures de chaque étape")
+    if st.button("🔄 Réinitialiser les mesures"):
+        metrics.reset()
+
+    st.subheader("⏱️ Durées par étape")
+    durations = metrics.durations()
+    if durations:
+        st.dataframe(pd.DataFrame({
+            'Étape': [row['etape'] for row in durations],
+            'Détail': [", ".join(f"{k}={v}" for k, v in row['labels'].items()) for row in durations],
+            'Appels': [row['nombre'] for row in durations],
+            'Moyenne (ms)': [row['moyenne'] * 1000 for row in durations],
+            'p50 (ms)': [row['p50'] * 1000 for row in durations],
+            'p95 (ms)': [row['p95'] * 1000 for row in durations],
+            'p99 (ms)': [row['p99'] * 1000 for row in durations]
+        }).round(2), use_container_width=True)
+    else:
+        st.info("Aucune mesure pour l'instant : effectuez un diagnostic.")
+
+    st.subheader("🔢 Compteurs")
+    counters = metrics.counters()
+    if counters:
+        st.dataframe(pd.DataFrame({
+            'Compteur': [row['compteur'] for row in counters],
+            'Détail': [", ".join(f"{k}={v}" for k, v in row['labels'].items()) for row in counters],
+            'Valeur': [row['valeur'] for row in counters]
+        }), use_container_width=True)
+        totals = {row['compteur']: row['valeur'] for row in counters if not row['labels']}
+        if totals.get('cascade_rows'):
+            st.metric("⚡ Taux d'escalade de la cascade",
+                      f"{totals.get('cascade_escalated', 0) / totals['cascade_rows']:.1%}")
+        dropped = sum(row['valeur'] for row in counters if row['compteur'] == 'audit_dropped')
+        if totals.get('audit_written') or dropped:
+            st.metric("🗂️ Diagnostics audités", totals.get('audit_written', 0),
+                      help=f"{dropped} enregistrements d'audit rejetés (file pleine ou base injoignable)")
+
+    text = metrics.to_prometheus()
+    with st.expander("Export Prometheus"):
+        st.code(text, language='text')
+    st.download_button("💾 Télécharger (format Prometheus)", data=text.encode('utf-8'),
+                       file_name="metrics.prom", mime="text/plain")
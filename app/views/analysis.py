@@ -0,0 +1,54 @@
+"""
+Page Analyse des données : statistiques descriptives et répartition des cas
+"""
+
+import plotly.express as px
+import streamlit as st
+
+from app.views.datasets import data_version, load_data_summary
+
+
+def render():
+    st.header("📈 Analyse exploratoire des données")
+    
+    summary = load_data_summary(data_version())
+    if summary is None:
+        st.error("⚠️ Données non trouvées.")
+        return
+    
+    # Statistiques descriptives
+    st.subheader("📊 Statistiques descriptives")
+    st.dataframe(summary.description, use_container_width=True)
+    
+    # Informations sur le dataset
+    st.subheader("ℹ️ Informations sur le dataset")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Nombre d'échantillons", summary.n_rows)
+    with col2:
+        st.metric("Nombre de variables", len(summary.columns))
+    with col3:
+        if summary.target_counts is not None:
+            positive_rate = summary.target_counts.get(1, 0) / summary.n_rows
+            st.metric("Taux de maladie cardiaque", f"{positive_rate:.1%}")
+    with col4:
+        st.metric("Mémoire", f"{summary.memory_bytes / 2**20:.2f} Mo",
+                  help="Types compacts : int8 pour les codes, float32 pour les mesures")
+    
+    if summary.invalid_values:
+        details = ", ".join(f"{col} ({count})" for col, count in summary.invalid_values.items())
+        st.warning(f"⚠️ Valeurs hors des domaines du formulaire de diagnostic: {details}")
+    
+    # Distribution de la variable cible
+    if summary.target_counts is not None:
+        st.subheader("🎯 Distribution de la variable cible")
+        target_counts = summary.target_counts
+        fig_target = px.pie(values=target_counts.values, 
+                          names=['Pas de maladie', 'Maladie cardiaque'],
+                          title="Répartition des cas")
+        st.plotly_chart(fig_target, use_container_width=True)
+    
+    # Données brutes
+    st.subheader("🗃️ Aperçu des données brutes")
+    st.dataframe(summary.preview, use_container_width=True)
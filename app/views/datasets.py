@@ -0,0 +1,44 @@
+"""
+Jeu de données partagé par les pages Visualisations et Analyse des données
+"""
+
+import streamlit as st
+
+from src.data.incremental import DATA_FILE, refresh_stats
+from src.data.storage import find_table, load_table, read_only
+from src.data.summaries import AGGREGATION_THRESHOLD, plotted_columns
+from src.utils.helpers import file_fingerprint
+
+def data_version():
+    """
+    Empreinte du fichier de données lu (copie Parquet si elle est à jour, sinon CSV)
+    """
+    try:
+        return file_fingerprint(find_table(DATA_FILE))
+    except FileNotFoundError:
+        return None
+
+# Chargement des données (relu quand le fichier change), limité à `columns` si fourni.
+# Types compacts (int8, category, float32) et une seule copie en lecture seule
+# partagée par toutes les sessions, sans recopie à chaque accès
+@st.cache_resource
+def load_data(version=None, columns=None):
+    try:
+        data = load_table(DATA_FILE, columns=list(columns) if columns is not None else None)
+        return read_only(data)
+    except FileNotFoundError:
+        return None
+
+# Statistiques des pages de visualisation, une fois par version des données. Les
+# statistiques incrémentales ne lisent que les lignes ajoutées depuis la version
+# précédente ; seules les petites tables sont relues, pour des graphiques exacts
+@st.cache_data
+def load_data_summary(version):
+    try:
+        stats = refresh_stats(DATA_FILE)
+    except FileNotFoundError:
+        return None
+    raw = None
+    if stats.n_rows <= AGGREGATION_THRESHOLD:
+        raw = load_data(version, tuple(plotted_columns(stats.columns, stats.numeric)))
+    return stats.summary(raw=raw)
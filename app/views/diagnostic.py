@@ -0,0 +1,521 @@
+"""
+Page Diagnostic : patient unique ou lot de patients (CSV)
+
+Seule page qui charge les modèles, le cache des prédictions et les
+explicateurs TreeSHAP.
+"""
+
+import time
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from src.data.preprocessing import FEATURE_COLUMNS, FeatureEncoder
+from src.data.validation import MEASUREMENT_RANGES
+from src.models import drift, prediction, sensitivity, warmup
+from src.models.audit import audit_records, start_audit_log
+from src.models.cache import CachedPredictor, PredictionCache, create_backend
+from src.models.cascade import CASCADE_ENABLED, CascadePredictor, cascade_available, escalation_models
+from src.models.ensemble import DEFAULT_MODEL_TIMEOUT, EnsemblePredictor, shared_executor
+from src.models.explanation import EXPLAINABLE_MODELS, FEATURE_LABELS, load_background, load_explainer
+from src.models.registry import MODEL_FILES, ModelRegistry
+from src.utils.helpers import file_fingerprint
+from src.utils.metrics import metrics, timed
+
+# Registre des modèles (chargement paresseux, un modèle à la fois)
+@st.cache_resource
+def load_registry():
+    return ModelRegistry()
+
+# Chargement des modèles
+def load_models():
+    registry = load_registry()
+    models = registry.load_available()
+    for model_name, error in registry.errors.items():
+        st.warning(f"⚠️ Modèle {model_name} indisponible: {error}")
+    if not models:
+        st.error("⚠️ Modèles non trouvés. Veuillez vous assurer que les modèles sont entraînés.")
+        return None
+    return models
+
+# Cache des prédictions, partagé entre les sessions et invalidé avec la version des modèles
+@st.cache_resource
+def load_prediction_cache(version, model_names):
+    return PredictionCache(create_backend(), model_names, version)
+
+def get_prediction_cache(models):
+    return load_prediction_cache(load_registry().version(), tuple(models))
+
+def display_cache_stats():
+    """
+    Affiche dans la barre latérale l'efficacité du cache des prédictions
+    """
+    registry = load_registry()
+    model_names = tuple(name for name in registry.names if registry.is_loaded(name))
+    if not model_names:
+        return
+    stats = get_prediction_cache(model_names).stats()
+    st.sidebar.markdown("### ♻️ Cache des prédictions")
+    col1, col2 = st.sidebar.columns(2)
+    col1.metric("Hits", stats['hits'])
+    col2.metric("Misses", stats['misses'])
+    st.sidebar.caption(f"Taux de succès: {stats['taux']:.0%} · backend {stats['backend']}")
+
+def get_predictor(models, cascade=False):
+    """
+    Ensemble complet derrière le cache des prédictions, ou cascade (premier
+    étage léger, cache réservé aux modèles d'escalade)
+    """
+    options = dict(executor=shared_executor(), timeout=DEFAULT_MODEL_TIMEOUT)
+    if cascade:
+        return CascadePredictor(models, cache=get_prediction_cache(escalation_models(models)), **options)
+    return CachedPredictor(EnsemblePredictor(models, **options), get_prediction_cache(models))
+
+# Journal d'audit des diagnostics, écrit par lots dans un thread partagé par les sessions
+@st.cache_resource
+def load_audit_log():
+    return start_audit_log()
+
+def audit_diagnostic(features, result):
+    """Soumet le diagnostic au journal d'audit (sans attendre l'écriture)"""
+    audit = load_audit_log()
+    if audit is not None:
+        audit.submit(audit_records(features, result, 'app', load_registry().versions()))
+
+# Explicateur TreeSHAP, construit une fois par version du fichier du modèle
+@st.cache_resource
+def load_model_explainer(name, version):
+    return load_explainer(name, background=load_background())
+
+def get_explainer(models):
+    """
+    Explicateur du premier modèle explicable disponible (CatBoost, puis XGBoost)
+    """
+    for name in EXPLAINABLE_MODELS:
+        if name not in models:
+            continue
+        try:
+            return load_model_explainer(name, file_fingerprint(MODEL_FILES[name]))
+        except (OSError, ValueError, ImportError):
+            continue
+    return None
+
+# Encodeur des données patients (construit une seule fois)
+@st.cache_resource
+def load_encoder():
+    return FeatureEncoder()
+
+def warm_up():
+    """
+    Préchauffe les ressources partagées de la page avant la première session
+    (encodeur, modèles, explicateur, cache des prédictions, journal d'audit,
+    qui réinsère les enregistrements restés en reprise) ; appelé par
+    app/serve.py, retourne le WarmupReport
+    """
+    load_encoder()
+    load_audit_log()
+    registry = load_registry()
+    report = warmup.warm_up(registry, explainer_factory=get_explainer)
+    model_names = tuple(name for name in registry.names if registry.is_loaded(name))
+    if model_names:
+        get_prediction_cache(model_names)
+    return report
+
+@timed('prepare_input')
+def prepare_input_data(age, sex, cp, trestbps, chol, fbs, restecg, thalach, exang, oldpeak, slope, ca, thal):
+    """
+    Prépare les données d'entrée pour la prédiction
+
+    Retourne une matrice float32 (1, 13) dans l'ordre des colonnes d'entraînement.
+    """
+    return load_encoder().encode_record(
+        (age, sex, cp, trestbps, chol, fbs, restecg, thalach, exang, oldpeak, slope, ca, thal)
+    )
+
+@timed('gauge_chart')
+def create_gauge_chart(probability, title="Probabilité de maladie cardiaque"):
+    """
+    Crée un graphique en jauge pour afficher la probabilité
+    """
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number+delta",
+        value = probability * 100,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': title, 'font': {'size': 20}},
+        delta = {'reference': 50},
+        gauge = {
+            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
+            'bar': {'color': "darkblue"},
+            'bgcolor': "white",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [
+                {'range': [0, 30], 'color': 'lightgreen'},
+                {'range': [30, 70], 'color': 'yellow'},
+                {'range': [70, 100], 'color': 'lightcoral'}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 70
+            }
+        }
+    ))
+    
+    fig.update_layout(height=400, font={'color': "darkblue", 'family': "Arial"})
+    return fig
+
+def get_risk_interpretation(probability):
+    """
+    Interprète le niveau de risque basé sur la probabilité
+    """
+    if probability >= prediction.HIGH_RISK_THRESHOLD:
+        return "🔴 RISQUE ÉLEVÉ", "risk-high", "Une consultation cardiologique urgente est recommandée."
+    elif probability >= prediction.MODERATE_RISK_THRESHOLD:
+        return "🟡 RISQUE MODÉRÉ", "risk-medium", "Un suivi médical et des examens complémentaires sont conseillés."
+    else:
+        return "🟢 RISQUE FAIBLE", "risk-low", "Continuez à maintenir un mode de vie sain et des contrôles réguliers."
+
+def display_diagnosis(prediction, probability, confidence):
+    """
+    Affiche le diagnostic avec une mise en forme appropriée
+    """
+    risk_level, risk_class, recommendation = get_risk_interpretation(probability)
+    
+    st.markdown(f'<div class="{risk_class}">', unsafe_allow_html=True)
+    st.markdown(f"### {risk_level}")
+    st.markdown(f"**Probabilité:** {probability:.1%}")
+    st.markdown(f"**Confiance:** {confidence:.1%}")
+    st.markdown(f"**Recommandation:** {recommendation}")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Graphique en jauge
+    gauge_fig = create_gauge_chart(probability)
+    st.plotly_chart(gauge_fig, use_container_width=True)
+    
+    # Recommandations détaillées
+    st.subheader("📋 Recommandations détaillées")
+    
+    if probability >= 0.7:
+        st.error("""
+        **Actions immédiates recommandées:**
+        - Consultation cardiologique dans les 24-48h
+        - ECG et échocardiographie
+        - Bilan sanguin complet (troponines, BNP)
+        - Éviter les efforts physiques intenses
+        - Surveillance des symptômes (douleur thoracique, essoufflement)
+        """)
+    elif probability >= 0.3:
+        st.warning("""
+        **Suivi médical recommandé:**
+        - Consultation avec votre médecin traitant
+        - Test d'effort si approprié
+        - Contrôle des facteurs de risque
+        - Adoption d'un mode de vie plus sain
+        - Surveillance régulière de la tension et du cholestérol
+        """)
+    else:
+        st.success("""
+        **Maintien de la santé cardiaque:**
+        - Activité physique régulière (150 min/semaine)
+        - Alimentation équilibrée (régime méditerranéen)
+        - Contrôle du poids
+        - Arrêt du tabac si applicable
+        - Gestion du stress
+        - Contrôles médicaux annuels
+        """)
+
+def display_explanation(explainer, features):
+    """
+    Affiche la contribution de chaque variable au diagnostic d'un patient
+    """
+    start = time.perf_counter()
+    explanation = explainer.explain(features)
+    elapsed = time.perf_counter() - start
+    metrics.observe('explanation', elapsed, model=explainer.name)
+
+    contributions = explanation.contributions(0).iloc[::-1]
+    fig = go.Figure(go.Bar(
+        x=contributions.values,
+        y=[FEATURE_LABELS[col] for col in contributions.index],
+        orientation='h',
+        marker_color=['#f44336' if value > 0 else '#4caf50' for value in contributions.values]
+    ))
+    fig.update_layout(
+        title=f"Contribution de chaque variable ({explainer.name}, log-odds)",
+        height=450,
+        margin=dict(l=10, r=10, t=50, b=10)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(
+        f"Rouge : augmente le risque · vert : le diminue · valeur de base {explanation.base_value:+.2f} · "
+        f"calculé en {elapsed * 1000:.1f} ms"
+    )
+
+    if explainer.importance is not None:
+        with st.expander("Importance moyenne des variables (patients d'entraînement)"):
+            st.bar_chart(explainer.importance.rename(index=FEATURE_LABELS))
+
+@timed('what_if_chart')
+def create_sweep_chart(sweep, current):
+    """
+    Courbes de risque d'un balayage à une variable : modèle principal en
+    trait plein, autres modèles en pointillés, valeur du patient en repère
+    """
+    x = sensitivity.value_labels(sweep.x_feature, sweep.x_values)
+    fig = go.Figure()
+    for (low, high), color in (((0, 30), 'lightgreen'), ((30, 70), 'yellow'), ((70, 100), 'lightcoral')):
+        fig.add_hrect(y0=low, y1=high, fillcolor=color, opacity=0.2, line_width=0)
+    for j, name in enumerate(sweep.model_names):
+        main = name == sweep.main_model
+        fig.add_trace(go.Scatter(
+            x=x, y=sweep.probabilities[:, j] * 100, name=name,
+            mode='lines+markers' if sensitivity.is_categorical(sweep.x_feature) else 'lines',
+            line={'width': 3 if main else 1.5, 'dash': 'solid' if main else 'dot'}
+        ))
+    current_x = sensitivity.value_labels(sweep.x_feature, [current])[0]
+    # Annotation séparée : add_vline ne sait pas la placer sur un axe catégoriel
+    fig.add_vline(x=current_x, line_dash='dash', line_color='black')
+    fig.add_annotation(x=current_x, y=100, text="Patient", showarrow=False, yanchor='bottom')
+    fig.update_layout(
+        xaxis_title=FEATURE_LABELS[sweep.x_feature], yaxis_title="Probabilité (%)",
+        yaxis_range=[0, 100], height=420, legend_title="Modèle"
+    )
+    return fig
+
+@timed('what_if_chart')
+def create_sweep_heatmap(sweep, current_x, current_y):
+    """
+    Carte de chaleur du modèle principal pour un balayage à deux variables,
+    avec les seuils de risque (30 % et 70 %) en courbes de niveau
+    """
+    x = sensitivity.value_labels(sweep.x_feature, sweep.x_values)
+    y = sensitivity.value_labels(sweep.y_feature, sweep.y_values)
+    z = sweep.main_probability * 100
+    fig = go.Figure(go.Heatmap(
+        x=x, y=y, z=z, zmin=0, zmax=100, colorscale='RdYlGn_r',
+        colorbar={'title': 'Risque (%)'},
+        hovertemplate=f"{FEATURE_LABELS[sweep.x_feature]}: %{{x}}<br>"
+                      f"{FEATURE_LABELS[sweep.y_feature]}: %{{y}}<br>Risque: %{{z:.1f}} %<extra></extra>"
+    ))
+    fig.add_trace(go.Contour(
+        x=x, y=y, z=z, showscale=False, hoverinfo='skip',
+        contours={'start': 30, 'end': 70, 'size': 40, 'coloring': 'lines', 'showlabels': True},
+        line={'color': 'black', 'width': 1.5}
+    ))
+    fig.add_trace(go.Scatter(
+        x=sensitivity.value_labels(sweep.x_feature, [current_x]),
+        y=sensitivity.value_labels(sweep.y_feature, [current_y]),
+        mode='markers', name="Patient", marker={'symbol': 'x', 'size': 14, 'color': 'black'}
+    ))
+    fig.update_layout(
+        xaxis_title=FEATURE_LABELS[sweep.x_feature], yaxis_title=FEATURE_LABELS[sweep.y_feature],
+        title=f"Probabilité du modèle {sweep.main_model}", height=520, showlegend=False
+    )
+    return fig
+
+def sweep_range(feature, label, container):
+    """Plage balayée d'une mesure (curseur sur la plage du formulaire)"""
+    if sensitivity.is_categorical(feature):
+        return None, None
+    low, high = (float(bound) for bound in MEASUREMENT_RANGES[feature])
+    step = 0.1 if sensitivity.FORM_DECIMALS.get(feature) else 1.0
+    return container.slider(label, low, high, (low, high), step=step, key=f"what_if_range_{label}")
+
+def display_what_if(models, features):
+    """
+    Analyse « et si » : risque du patient saisi quand une ou deux variables
+    parcourent leur plage, la grille étant évaluée en un seul lot
+    """
+    features_list = sensitivity.SWEEPABLE_FEATURES
+    col1, col2, col3 = st.columns(3)
+    x_feature = col1.selectbox("Variable à faire varier", features_list, index=features_list.index('chol'),
+                               format_func=FEATURE_LABELS.get)
+    y_feature = col2.selectbox("Seconde variable (carte de chaleur)",
+                               [None] + [f for f in features_list if f != x_feature],
+                               format_func=lambda f: "Aucune" if f is None else FEATURE_LABELS[f])
+    points = col3.slider("Points par variable", 10, 200, sensitivity.SWEEP_POINTS, step=10)
+
+    col1, col2 = st.columns(2)
+    x_values = sensitivity.sweep_values(x_feature, points, *sweep_range(x_feature, "Plage (axe horizontal)", col1))
+    y_values = None
+    if y_feature is not None:
+        y_values = sensitivity.sweep_values(y_feature, points, *sweep_range(y_feature, "Plage (axe vertical)", col2))
+
+    sweep = sensitivity.run_sweep(EnsemblePredictor(models, executor=shared_executor()), features,
+                                  x_feature, x_values, y_feature, y_values)
+    current = features[0]
+    if y_feature is None:
+        st.plotly_chart(create_sweep_chart(sweep, current[FEATURE_COLUMNS.index(x_feature)]),
+                        use_container_width=True)
+    else:
+        st.plotly_chart(create_sweep_heatmap(sweep, current[FEATURE_COLUMNS.index(x_feature)],
+                                             current[FEATURE_COLUMNS.index(y_feature)]),
+                        use_container_width=True)
+    st.caption(f"{sweep.size:,} combinaisons évaluées en {sweep.duration * 1000:.0f} ms "
+               f"(un appel predict_proba par modèle) · autres variables fixées aux valeurs saisies")
+
+def display_batch_scoring(models, cascade=False):
+    """
+    Diagnostic d'un lot de patients à partir d'un fichier CSV
+    """
+    st.subheader("📁 Diagnostic par lot")
+    st.markdown(
+        "Importez un fichier CSV au format de `data/sample_data.csv` "
+        "(une ligne par patient, colonnes " + ", ".join(FEATURE_COLUMNS) + ")."
+    )
+
+    uploaded_file = st.file_uploader("Fichier CSV des patients", type=["csv"])
+    explain = st.checkbox("🧠 Ajouter les facteurs principaux de chaque diagnostic (TreeSHAP)")
+    if uploaded_file is None:
+        return
+
+    explainer = get_explainer(models) if explain else None
+    if explain and explainer is None:
+        st.warning("⚠️ Aucun modèle explicable (CatBoost ou XGBoost) disponible")
+
+    try:
+        data = pd.read_csv(uploaded_file)
+        metrics.increment('requests', len(data), source='app', mode='lot')
+        with metrics.span('batch_scoring', source='app'):
+            if cascade:
+                scored = prediction.score_dataframe(models, data, predictor=get_predictor(models, cascade),
+                                                    explainer=explainer, observe_drift=True)
+            else:
+                scored = prediction.score_dataframe(models, data, cache=get_prediction_cache(models),
+                                                    explainer=explainer, observe_drift=True)
+    except ValueError as e:
+        st.error(f"⚠️ Fichier invalide: {str(e)}")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    risk_counts = scored['niveau_risque'].value_counts()
+    with col1:
+        st.metric("Patients analysés", len(scored))
+    with col2:
+        st.metric("🔴 Risque élevé", int(risk_counts.get('élevé', 0)))
+    with col3:
+        st.metric("🟡 Risque modéré", int(risk_counts.get('modéré', 0)))
+    with col4:
+        st.metric("🟢 Risque faible", int(risk_counts.get('faible', 0)))
+    if 'escalade' in scored:
+        st.caption(f"⚡ Cascade : {scored['escalade'].mean():.0%} des patients proches d'un seuil "
+                   "évalués par l'ensemble complet, les autres par le premier étage seul")
+
+    st.dataframe(scored.head(1000), use_container_width=True)
+    st.download_button(
+        "💾 Télécharger les résultats",
+        data=scored.to_csv(index=False).encode('utf-8'),
+        file_name="diagnostics.csv",
+        mime="text/csv"
+    )
+
+def render():
+    st.header("🔍 Diagnostic de maladie cardiaque")
+    
+    # Chargement des modèles
+    models = load_models()
+    if models is None:
+        return
+    
+    mode = st.radio("Mode de diagnostic", ["👤 Patient unique", "📁 Lot de patients (CSV)"], horizontal=True)
+    cascade = st.checkbox(
+        "⚡ Mode cascade", value=CASCADE_ENABLED and cascade_available(models),
+        disabled=not cascade_available(models),
+        help="Régression logistique d'abord ; seuls les patients proches d'un seuil de risque "
+             "passent par CatBoost, XGBoost et Random Forest"
+    )
+    if mode == "📁 Lot de patients (CSV)":
+        display_batch_scoring(models, cascade)
+        return
+    
+    # Formulaire d'entrée
+    st.subheader("📝 Saisie des paramètres du patient")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        age = st.number_input("Âge", min_value=1, max_value=120, value=50)
+        sex = st.selectbox("Sexe", ["Masculin", "Féminin"])
+        cp = st.selectbox("Type de douleur thoracique", 
+                        ["Angine typique", "Angine atypique", "Douleur non-angineuse", "Asymptomatique"])
+        trestbps = st.number_input("Pression artérielle au repos (mmHg)", min_value=80, max_value=250, value=120)
+        chol = st.number_input("Cholestérol sérique (mg/dl)", min_value=100, max_value=600, value=200)
+        fbs = st.selectbox("Glycémie à jeun > 120 mg/dl", ["Non", "Oui"])
+        restecg = st.selectbox("Résultats ECG au repos", 
+                             ["Normal", "Anomalie ST-T", "Hypertrophie VG"])
+    
+    with col2:
+        thalach = st.number_input("Fréquence cardiaque maximale", min_value=60, max_value=250, value=150)
+        exang = st.selectbox("Angine induite par l'exercice", ["Non", "Oui"])
+        oldpeak = st.number_input("Dépression ST induite par l'exercice", min_value=0.0, max_value=10.0, value=0.0, step=0.1)
+        slope = st.selectbox("Pente du segment ST", ["Montant", "Plat", "Descendant"])
+        ca = st.number_input("Nombre de vaisseaux principaux (0-4)", min_value=0, max_value=4, value=0)
+        thal = st.selectbox("Thalassémie", ["Normal", "Défaut fixe", "Défaut réversible"])
+    
+    # Bouton de prédiction
+    if st.button("🔮 Effectuer le diagnostic", type="primary"):
+        # Préparation des données
+        input_data = prepare_input_data(age, sex, cp, trestbps, chol, fbs, restecg, 
+                                      thalach, exang, oldpeak, slope, ca, thal)
+        
+        # Prédictions avec tous les modèles, en parallèle (un seul predict_proba par modèle),
+        # sauf si ce patient a déjà été évalué
+        predictor = get_predictor(models, cascade)
+        try:
+            metrics.increment('requests', source='app', mode='patient')
+            with metrics.span('diagnostic', source='app'):
+                result = predictor.predict(input_data)
+        except RuntimeError as e:
+            st.error(f"⚠️ {str(e)}")
+            result = None
+        
+        if result is not None:
+            drift.observe(input_data)
+            audit_diagnostic(input_data, result)
+            for model_name, error in result.errors.items():
+                st.error(f"Erreur avec le modèle {model_name}: {error}")
+            
+            # Utilisation du modèle CatBoost comme principal (premier étage si la cascade s'y arrête)
+            main_prediction = int(result.main_prediction[0])
+            main_probability = float(result.main_probability[0])
+            
+            # Calcul de la confiance (variance entre les modèles)
+            confidence = float(result.confidence[0])
+            
+            # Affichage du diagnostic
+            display_diagnosis(main_prediction, main_probability, confidence)
+            
+            # Comparaison des modèles
+            st.subheader("🔬 Comparaison des modèles")
+            labels = {1: 'Maladie cardiaque', 0: 'Pas de maladie', -1: 'Non évalué'}
+            comparison_df = pd.DataFrame({
+                'Modèle': result.model_names,
+                'Prédiction': [labels[p] for p in result.predictions[0]],
+                'Probabilité': [f"{p:.1%}" if pd.notna(p) else "—" for p in result.probabilities[0]],
+                'Temps (ms)': [
+                    f"{result.timings[name] * 1000:.1f}" if name in result.timings
+                    else "—" if result.predictions[0, j] == -1 else "cache"
+                    for j, name in enumerate(result.model_names)
+                ]
+            })
+            st.dataframe(comparison_df, use_container_width=True)
+            if result.escalated is not None:
+                if result.escalated[0]:
+                    st.caption("⚡ Cascade : patient proche d'un seuil, diagnostic de l'ensemble complet")
+                else:
+                    st.caption(f"⚡ Cascade : diagnostic du premier étage ({result.first_stage}), "
+                               "loin des seuils de risque")
+
+            # Explication du diagnostic (TreeSHAP)
+            explainer = get_explainer(models)
+            if explainer is not None:
+                st.subheader("🧠 Facteurs de ce diagnostic")
+                display_explanation(explainer, input_data)
+
+    # Analyse « et si » à partir des valeurs saisies
+    st.subheader("🔬 Et si... ?")
+    if st.checkbox("Faire varier une ou deux variables du patient"):
+        display_what_if(models, prepare_input_data(age, sex, cp, trestbps, chol, fbs, restecg,
+                                                   thalach, exang, oldpeak, slope, ca, thal))
@@ -0,0 +1,43 @@
+"""
+Page d'accueil
+"""
+
+import streamlit as st
+
+
+def render():
+    st.markdown("""
+    ## Bienvenue dans le système de diagnostic cardiaque
+    
+    Cette application utilise des algorithmes d'apprentissage automatique avancés pour évaluer 
+    le risque de maladie cardiaque basé sur des paramètres cliniques.
+    
+    ### 🎯 Fonctionnalités principales:
+    - **Diagnostic en temps réel** avec multiple modèles ML
+    - **Visualisations interactives** des données
+    - **Recommandations cliniques** personnalisées
+    - **Interface intuitive** pour les professionnels de santé
+    
+    ### 🤖 Modèles utilisés:
+    - **CatBoost** (Modèle principal)
+    - **XGBoost** 
+    - **Random Forest**
+    - **Régression Logistique**
+    
+    ### ⚠️ Avertissement médical:
+    Cet outil est destiné à des fins éducatives et de recherche uniquement. 
+    Il ne doit pas remplacer l'avis médical professionnel.
+    """)
+    
+    # Métriques des modèles
+    st.subheader("📊 Performance des modèles")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown('<div class="metric-card"><h3>CatBoost</h3><p>Précision: 87.3%</p></div>', unsafe_allow_html=True)
+    with col2:
+        st.markdown('<div class="metric-card"><h3>XGBoost</h3><p>Précision: 86.8%</p></div>', unsafe_allow_html=True)
+    with col3:
+        st.markdown('<div class="metric-card"><h3>Random Forest</h3><p>Précision: 85.9%</p></div>', unsafe_allow_html=True)
+    with col4:
+        st.markdown('<div class="metric-card"><h3>Régression Log.</h3><p>Précision: 83.4%</p></div>', unsafe_allow_html=True)
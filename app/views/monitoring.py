@@ -0,0 +1,69 @@
+"""
+Page Surveillance : dérive des patients évalués par rapport à l'entraînement
+"""
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from src.models import drift
+from src.models.explanation import FEATURE_LABELS
+
+LEVEL_ICONS = {'stable': '🟢 stable', 'modérée': '🟠 modérée', 'forte': '🔴 forte', 'insuffisant': '⚪ insuffisant'}
+
+
+def distribution_chart(monitor, feature):
+    """Proportions par intervalle : entraînement et patients récents"""
+    distribution = monitor.distributions(feature)
+    fig = go.Figure([
+        go.Bar(x=distribution['intervalle'], y=distribution['reference'] * 100, name="Entraînement"),
+        go.Bar(x=distribution['intervalle'], y=distribution['production'] * 100, name="Patients évalués")
+    ])
+    fig.update_layout(barmode='group', yaxis_title="Proportion (%)", xaxis_title=FEATURE_LABELS[feature],
+                      height=400)
+    return fig
+
+
+def render():
+    """
+    PSI et KS de chaque variable, calculés sur les effectifs tenus à jour
+    par chaque lot évalué dans ce processus
+    """
+    st.header("📉 Surveillance de la dérive")
+    monitor = drift.get_monitor()
+    if monitor is None:
+        st.warning("⚠️ Référence de dérive absente : construisez-la avec `python start.py --export` "
+                   "ou `python -m src.models.drift --build`.")
+        return
+
+    reference = monitor.reference
+    half_life = f"demi-vie de {monitor.half_life:,} patients" if monitor.half_life else "cumul depuis le démarrage"
+    st.caption(f"Référence : {reference.n_rows:,} patients d'entraînement ({reference.source}, "
+               f"{reference.created_at}) · {monitor.rows:,} patients évalués par ce processus, "
+               f"effectif pondéré {monitor.effective_rows():,.0f} ({half_life})")
+    if st.button("🔄 Réinitialiser la surveillance"):
+        monitor.reset()
+
+    report = monitor.report()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("🔴 Dérive forte", int((report['niveau'] == 'forte').sum()))
+    col2.metric("🟠 Dérive modérée", int((report['niveau'] == 'modérée').sum()))
+    col3.metric("PSI maximal", f"{report['psi'].max():.3f}" if report['psi'].notna().any() else "—")
+    if (report['niveau'] == 'insuffisant').all():
+        st.info(f"Pas encore assez de patients évalués (minimum {monitor.min_rows}).")
+
+    st.dataframe(pd.DataFrame({
+        'Variable': [FEATURE_LABELS[col] for col in report.index],
+        'Type': report['type'],
+        'PSI': report['psi'].round(3),
+        'Dérive': report['niveau'].map(LEVEL_ICONS),
+        'KS': report['ks'].round(3),
+        'KS critique (5 %)': report['ks_critique'].round(3)
+    }), use_container_width=True, hide_index=True)
+    st.caption(f"PSI < {drift.PSI_MODERATE} : stable · {drift.PSI_MODERATE} à {drift.PSI_HIGH} : "
+               f"modérée · au-delà : forte. KS : écart maximal des fonctions de répartition aux "
+               f"bornes des intervalles (mesures).")
+
+    feature = st.selectbox("Distribution d'une variable", list(report.sort_values('psi', ascending=False).index),
+                           format_func=FEATURE_LABELS.get)
+    st.plotly_chart(distribution_chart(monitor, feature), use_container_width=True)
@@ -0,0 +1,133 @@
+"""
+Page Visualisations : distributions, analyse bivariée et corrélations
+"""
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.subplots import make_subplots
+
+from app.views.datasets import data_version, load_data_summary
+
+def display_figure(fig, summary):
+    """
+    Affiche une figure Plotly avec son mode de rendu
+
+    La taille envoyée au navigateur n'est indiquée qu'en mode agrégé : la
+    figure y est petite, alors qu'en données brutes la mesurer doublerait
+    le coût de sérialisation à chaque réexécution.
+    """
+    st.plotly_chart(fig, use_container_width=True)
+    if summary.aggregated:
+        payload_kb = len(fig.to_json().encode()) / 1024
+        st.caption(f"{summary.n_rows:,} lignes · agrégats calculés sur le serveur · {payload_kb:,.0f} Ko transmis")
+    else:
+        st.caption(f"{summary.n_rows:,} lignes · données brutes")
+
+def plot_distributions(summary):
+    """
+    Affiche les distributions des variables (histogrammes précalculés
+    au-delà du seuil d'agrégation)
+    """
+    numeric_cols = list(summary.histograms)
+    
+    fig = make_subplots(
+        rows=3, cols=4,
+        subplot_titles=numeric_cols,
+        specs=[[{"secondary_y": False}]*4]*3
+    )
+    
+    for i, col in enumerate(numeric_cols):
+        row = i // 4 + 1
+        col_pos = i % 4 + 1
+        
+        if summary.aggregated:
+            hist = summary.histograms[col]
+            trace = go.Bar(x=hist['x'], y=hist['count'], width=hist['width'], name=col, showlegend=False)
+        else:
+            trace = go.Histogram(x=summary.raw[col], name=col, showlegend=False)
+        fig.add_trace(trace, row=row, col=col_pos)
+    
+    fig.update_layout(height=800, title_text="Distribution des variables numériques")
+    return fig
+
+def plot_bivariate_analysis(summary):
+    """
+    Analyse bivariée avec la variable cible (quartiles, moustaches et
+    échantillon des valeurs aberrantes précalculés au-delà du seuil d'agrégation)
+    """
+    if summary.boxes is None:
+        st.warning("Variable cible 'target' non trouvée dans les données.")
+        return None
+    
+    numeric_cols = list(summary.boxes.index.unique(level=0))
+    
+    fig = make_subplots(
+        rows=2, cols=3,
+        subplot_titles=numeric_cols,
+        specs=[[{"secondary_y": False}]*3]*2
+    )
+    
+    for i, col in enumerate(numeric_cols):
+        row = i // 3 + 1
+        col_pos = i % 3 + 1
+        
+        for j, (target_val, stats) in enumerate(summary.boxes.loc[col].iterrows()):
+            name = f'Target {target_val}'
+            color = px.colors.qualitative.Plotly[j % len(px.colors.qualitative.Plotly)]
+            if not summary.aggregated:
+                subset = summary.raw.loc[summary.raw['target'] == target_val, col]
+                fig.add_trace(
+                    go.Box(y=subset, name=name, marker_color=color, showlegend=(i==0)),
+                    row=row, col=col_pos
+                )
+                continue
+            
+            fig.add_trace(
+                go.Box(
+                    name=name, x=[name], marker_color=color,
+                    q1=[stats['q1']], median=[stats['median']], q3=[stats['q3']], mean=[stats['mean']],
+                    lowerfence=[stats['lowerfence']], upperfence=[stats['upperfence']],
+                    showlegend=(i==0)
+                ),
+                row=row, col=col_pos
+            )
+            fig.add_trace(
+                go.Scatter(
+                    x=[name] * len(stats['outliers']), y=stats['outliers'], mode='markers',
+                    marker=dict(color=color, size=4), name=f"{name} ({stats['n_outliers']} aberrantes)",
+                    showlegend=False
+                ),
+                row=row, col=col_pos
+            )
+    
+    fig.update_layout(height=600, title_text="Distribution par classe cible")
+    return fig
+
+def render():
+    st.header("📊 Visualisations des données")
+    
+    summary = load_data_summary(data_version())
+    if summary is None:
+        st.error("⚠️ Données non trouvées.")
+        return
+    
+    # Distribution des variables
+    st.subheader("📈 Distribution des variables")
+    dist_fig = plot_distributions(summary)
+    if dist_fig:
+        display_figure(dist_fig, summary)
+    
+    # Analyse bivariée
+    st.subheader("🔍 Analyse bivariée")
+    bivar_fig = plot_bivariate_analysis(summary)
+    if bivar_fig:
+        display_figure(bivar_fig, summary)
+    
+    # Matrice de corrélation
+    st.subheader("🌡️ Matrice de corrélation")
+    fig_corr = px.imshow(summary.correlation, 
+                       text_auto=True, 
+                       aspect="auto",
+                       title="Matrice de corrélation des variables numériques")
+    st.plotly_chart(fig_corr, use_container_width=True)
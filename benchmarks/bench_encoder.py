@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de l'encodage des données patients
+
+Compare la latence par patient de l'ancien prepare_input_data (dictionnaires
+reconstruits et DataFrame à chaque appel) avec FeatureEncoder.
+
+Usage:
+    python benchmarks/bench_encoder.py
+    python benchmarks/bench_encoder.py --repeat 50000 --batch-size 100000
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.preprocessing import FEATURE_COLUMNS, FeatureEncoder
+
+FORM_RECORD = (50, 'Masculin', 'Asymptomatique', 120, 200, 'Non', 'Normal',
+               150, 'Oui', 1.5, 'Plat', 0, 'Défaut réversible')
+
+
+def legacy_prepare_input_data(age, sex, cp, trestbps, chol, fbs, restecg, thalach, exang, oldpeak, slope, ca, thal):
+    """Version d'origine de prepare_input_data, conservée comme référence"""
+    sex_encoded = 1 if sex == 'Masculin' else 0
+    cp_mapping = {'Angine typique': 0, 'Angine atypique': 1, 'Douleur non-angineuse': 2, 'Asymptomatique': 3}
+    cp_encoded = cp_mapping.get(cp, 0)
+    fbs_encoded = 1 if fbs == 'Oui' else 0
+    restecg_mapping = {'Normal': 0, 'Anomalie ST-T': 1, 'Hypertrophie VG': 2}
+    restecg_encoded = restecg_mapping.get(restecg, 0)
+    exang_encoded = 1 if exang == 'Oui' else 0
+    slope_mapping = {'Montant': 0, 'Plat': 1, 'Descendant': 2}
+    slope_encoded = slope_mapping.get(slope, 0)
+    thal_mapping = {'Normal': 3, 'Défaut fixe': 6, 'Défaut réversible': 7}
+    thal_encoded = thal_mapping.get(thal, 3)
+    return pd.DataFrame({
+        'age': [age], 'sex': [sex_encoded], 'cp': [cp_encoded], 'trestbps': [trestbps],
+        'chol': [chol], 'fbs': [fbs_encoded], 'restecg': [restecg_encoded], 'thalach': [thalach],
+        'exang': [exang_encoded], 'oldpeak': [oldpeak], 'slope': [slope_encoded], 'ca': [ca],
+        'thal': [thal_encoded]
+    })
+
+
+def per_call_us(func, repeat):
+    """Meilleure latence moyenne par appel (µs) sur 5 séries"""
+    return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'encodage des patients")
+    parser.add_argument("--repeat", type=int, default=20000, help="Appels par série")
+    parser.add_argument("--batch-size", type=int, default=100000, help="Taille du lot encodé")
+    args = parser.parse_args()
+
+    encoder = FeatureEncoder()
+    out = np.empty((1, encoder.n_features), dtype=np.float32)
+
+    # Vérification : même encodage que la version d'origine
+    expected = legacy_prepare_input_data(*FORM_RECORD)[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+    assert np.array_equal(encoder.encode_record(FORM_RECORD), expected)
+
+    legacy = per_call_us(lambda: legacy_prepare_input_data(*FORM_RECORD), max(args.repeat // 20, 1))
+    record = per_call_us(lambda: encoder.encode_record(FORM_RECORD), args.repeat)
+    record_out = per_call_us(lambda: encoder.encode_record(FORM_RECORD, out=out), args.repeat)
+
+    # Lot au format data/sample_data.csv (codes) et lot de libellés du formulaire
+    coded_batch = {col: np.repeat(expected[0, j], args.batch_size) for j, col in enumerate(FEATURE_COLUMNS)}
+    label_batch = {col: np.full(args.batch_size, value, dtype=object) for col, value in zip(FEATURE_COLUMNS, FORM_RECORD)}
+    coded_time = min(timeit.repeat(lambda: encoder.encode_batch(coded_batch), number=1, repeat=3))
+    label_time = min(timeit.repeat(lambda: encoder.encode_batch(label_batch), number=1, repeat=3))
+
+    print("📏 Latence d'encodage par patient")
+    print(f"  prepare_input_data (origine) : {legacy:10.2f} µs")
+    print(f"  FeatureEncoder.encode_record : {record:10.2f} µs  (x{legacy / record:.0f})")
+    print(f"  encode_record (out préalloué) : {record_out:10.2f} µs  (x{legacy / record_out:.0f})")
+    print(f"  encode_batch (codes CSV)     : {coded_time / args.batch_size * 1e6:10.4f} µs  "
+          f"({args.batch_size} patients en {coded_time * 1000:.1f} ms)")
+    print(f"  encode_batch (libellés)      : {label_time / args.batch_size * 1e6:10.4f} µs  "
+          f"({args.batch_size} patients en {label_time * 1000:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark des explications TreeSHAP (CatBoost et XGBoost)
+
+Pour chaque modèle explicable présent dans models/ : temps de construction
+de l'explicateur (chargement et fond de référence), latence d'explication
+d'un patient (p50 / p95, comparée au budget de 50 ms de la page Diagnostic)
+et débit sur un lot.
+
+Usage:
+    python benchmarks/bench_explanation.py
+    python benchmarks/bench_explanation.py --requests 1000 --rows 100000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.preprocessing import encode_batch
+from src.models.explanation import EXPLAINABLE_MODELS, load_background, load_explainer
+
+DEFAULT_SOURCES = ['data/processed/X_test.csv', 'data/sample_data.csv']
+
+# Latence ajoutée tolérée pour une explication interactive
+LATENCY_BUDGET_MS = 50
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des explications TreeSHAP")
+    parser.add_argument("--requests", type=int, default=500, help="Nombre d'explications individuelles")
+    parser.add_argument("--rows", type=int, default=20000, help="Nombre de patients du lot")
+    args = parser.parse_args()
+
+    source = next((path for path in DEFAULT_SOURCES if Path(path).exists()), None)
+    if source is None:
+        sys.exit("❌ Aucun fichier de patients trouvé")
+    features = encode_batch(pd.read_csv(source))
+    batch = np.resize(features, (args.rows, features.shape[1]))
+    background = load_background()
+
+    for name in EXPLAINABLE_MODELS:
+        start = time.perf_counter()
+        try:
+            explainer = load_explainer(name, background=background)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  {name}: {e}")
+            continue
+        load_time = time.perf_counter() - start
+
+        latencies = []
+        for i in range(args.requests):
+            row = features[i % len(features)][None, :]
+            start = time.perf_counter()
+            explainer.explain(row)
+            latencies.append(time.perf_counter() - start)
+        p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+
+        start = time.perf_counter()
+        explainer.explain(batch).top_factors()
+        batch_time = time.perf_counter() - start
+
+        status = "✅" if p95 < LATENCY_BUDGET_MS else "❌"
+        print(f"{status} {name:<9} chargement {load_time * 1000:6.0f} ms · patient p50 {p50:5.2f} ms, "
+              f"p95 {p95:5.2f} ms (budget {LATENCY_BUDGET_MS} ms) · lot {args.rows / batch_time:,.0f} patients/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark de mise à l'échelle du diagnostic par lot multi-processus
+
+Évalue le même lot avec EnsemblePredictor (un processus) puis avec
+ParallelPredictor pour 1, 2, 4, ... N processus, et affiche le débit et
+l'accélération. Les modèles doivent exister dans models/ (ou
+models/compiled/ avec --compiled).
+
+Usage:
+    python benchmarks/bench_parallel.py
+    python benchmarks/bench_parallel.py --rows 2000000 --max-workers 32 --compiled
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.preprocessing import encode_batch
+from src.models.ensemble import EnsemblePredictor
+from src.models.parallel import ParallelPredictor
+from src.models.registry import ModelRegistry
+
+DEFAULT_SOURCES = ['data/processed/X_test.csv', 'data/sample_data.csv']
+
+
+def worker_counts(max_workers):
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du diagnostic multi-processus")
+    parser.add_argument("--rows", type=int, default=500000, help="Nombre de patients du lot")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(), help="Nombre maximal de processus")
+    parser.add_argument("--compiled", action="store_true", help="Utiliser les modèles compilés")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(prefer_compiled=args.compiled)
+    models = registry.load_available()
+    if not models:
+        sys.exit("❌ Aucun modèle disponible: " + "; ".join(registry.errors.values()))
+
+    source = next((path for path in DEFAULT_SOURCES if Path(path).exists()), None)
+    if source is None:
+        sys.exit("❌ Aucun fichier de patients trouvé")
+    features = encode_batch(pd.read_csv(source))
+    features = np.resize(features, (args.rows, features.shape[1]))
+    print(f"📊 {args.rows:,} patients, modèles: {', '.join(models)} "
+          f"({'compilés' if args.compiled else 'pickles'}), {os.cpu_count()} cœurs\n")
+
+    start = time.perf_counter()
+    reference = EnsemblePredictor(models).predict(features).probabilities
+    baseline = time.perf_counter() - start
+    print(f"  {'processus':<12} {'temps':>8} {'lignes/s':>12} {'accélération':>13}")
+    print(f"  {'(séquentiel)':<12} {baseline:7.2f}s {args.rows / baseline:12,.0f} {1:12.2f}x")
+
+    for workers in worker_counts(args.max_workers):
+        with ParallelPredictor(list(models), workers=workers, prefer_compiled=args.compiled) as predictor:
+            predictor.warm_up()
+            start = time.perf_counter()
+            result = predictor.predict(features)
+            elapsed = time.perf_counter() - start
+        assert np.allclose(result.probabilities, reference)
+        print(f"  {workers:<12} {elapsed:7.2f}s {args.rows / elapsed:12,.0f} {baseline / elapsed:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Démarrage à froid de l'application Streamlit et profil des imports
+
+Deux mesures, chacune dans des processus neufs :
+- imports : import de Streamlit, du script de l'application (configuration
+  de la page, page d'accueil) puis du module de chaque page, comme à sa
+  première visite. Le même scénario est rejoué avec `python -X importtime`
+  pour lister les modules les plus coûteux importés par l'application ;
+- serveur : `python -m app.serve` en mode headless, chronométré jusqu'à ce
+  que Streamlit réponde (/_stcore/health) puis jusqu'à ce que la sonde de
+  disponibilité réussisse (READY_FILE écrit après le préchauffage des
+  modèles ; étape ignorée sans modèles entraînés).
+
+Aucun navigateur n'est ouvert : Streamlit n'exécutant le script qu'à
+l'ouverture d'une session, le coût du premier rendu est mesuré par les
+imports qu'il déclenche.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --top 30 --runs 5
+    python benchmarks/bench_startup.py --no-server
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.models.compiled import COMPILED_DIR
+from src.models.registry import MODEL_FILES
+from src.utils.readiness import probe
+
+HOME_PAGE = "🏠 Accueil"
+
+# Scénario exécuté dans le processus neuf ; écrit les durées (ms) en JSON sur stdout.
+# Hors session, le script de l'application est importé sans exécuter main()
+# (st.* sans effet) : seules ses dépendances et celles des pages sont chargées.
+SCENARIO = '''
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import streamlit
+imported = time.perf_counter()
+import app.streamlit_app as streamlit_app
+importlib.import_module(streamlit_app.PAGES[{home!r}])
+rendered = time.perf_counter()
+timings = {{'streamlit_import_ms': (imported - start) * 1000, 'first_render_ms': (rendered - imported) * 1000}}
+modules = len(sys.modules)
+pages = dict(streamlit_app.PAGES, **streamlit_app.PAGES_ADMIN, **streamlit_app.PAGES_DRIFT)
+for page, module in pages.items():
+    if page == {home!r}:
+        continue
+    page_start = time.perf_counter()
+    importlib.import_module(module)
+    timings[page] = (time.perf_counter() - page_start) * 1000
+timings['cold_start_ms'] = (rendered - start) * 1000
+timings['modules_first_render'] = modules
+print('@@' + json.dumps(timings))
+'''
+
+IMPORT_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+# Délai maximal d'attente du serveur puis de la sonde de disponibilité (secondes)
+SERVER_TIMEOUT = 120
+
+
+def _run(importtime=False):
+    code = SCENARIO.format(root=str(ROOT_DIR), home=HOME_PAGE)
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    env = dict(os.environ, STREAMLIT_LOGGER_LEVEL='error')
+    completed = subprocess.run(command, capture_output=True, text=True, env=env, check=True, cwd=ROOT_DIR)
+    payload = next(line for line in completed.stdout.splitlines() if line.startswith('@@'))
+    return json.loads(payload[2:]), completed.stderr
+
+
+def cold_start(runs=3):
+    """Médiane sur `runs` processus neufs des durées (ms) du scénario d'imports"""
+    measures = [_run()[0] for _ in range(runs)]
+    return {key: statistics.median(measure[key] for measure in measures) for key in measures[0]}
+
+
+def import_profile(top=20):
+    """
+    Modules importés par l'application (après Streamlit) et leurs imports
+    directs, triés par durée cumulée décroissante : liste de (module, ms
+    cumulées, ms propres)
+    """
+    _, stderr = _run(importtime=True)
+    entries = []
+    streamlit_done = False
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        if not streamlit_done:
+            # Tout ce qui précède la fin de l'import de streamlit est le coût de Streamlit
+            streamlit_done = module == 'streamlit' and len(indent) == 1
+            continue
+        if len(indent) <= 3:
+            entries.append((module, int(cumulative_us) / 1000, int(self_us) / 1000))
+    return sorted(entries, key=lambda entry: -entry[1])[:top]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _healthy(port):
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def _models_available():
+    return any((ROOT_DIR / path).exists() for path in MODEL_FILES.values()) \
+        or any((ROOT_DIR / COMPILED_DIR).glob('*/meta.json'))
+
+
+def server_start(timeout=SERVER_TIMEOUT):
+    """
+    Durées (ms) jusqu'à la réponse du serveur headless et jusqu'à la sonde de
+    disponibilité ; None pour une étape non atteinte dans `timeout` secondes
+    (ou sans modèle à préchauffer)
+    """
+    wait_ready = _models_available()
+    port = _free_port()
+    ready_file = Path(tempfile.mkdtemp()) / 'bench.ready'
+    # Fichiers du serveur (témoin, journal d'audit) dans un dossier temporaire
+    env = dict(os.environ, READY_FILE=str(ready_file), LOG_DIR=str(ready_file.parent),
+               STREAMLIT_LOGGER_LEVEL='error')
+    command = [sys.executable, '-m', 'app.serve', '--server.headless=true', f'--server.port={port}',
+               '--server.address=127.0.0.1', '--browser.gatherUsageStats=false']
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    timings = {'server_ms': None, 'ready_ms': None}
+    try:
+        deadline = start + timeout
+        while time.perf_counter() < deadline and process.poll() is None:
+            if timings['server_ms'] is None and _healthy(port):
+                timings['server_ms'] = (time.perf_counter() - start) * 1000
+                if not wait_ready:
+                    break
+            if probe(ready_file):
+                timings['ready_ms'] = (time.perf_counter() - start) * 1000
+                break
+            time.sleep(0.05)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(ready_file.parent, ignore_errors=True)
+    return timings
+
+
+def _format_ms(value):
+    return f"{value:8.0f} ms" if value is not None else "  non atteint"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Démarrage à froid de l'application Streamlit")
+    parser.add_argument("--runs", type=int, default=3, help="Processus neufs mesurés")
+    parser.add_argument("--top", type=int, default=20, help="Nombre de modules du profil d'imports")
+    parser.add_argument("--no-server", action="store_true", help="Ne pas lancer le serveur headless")
+    args = parser.parse_args()
+
+    timings = cold_start(runs=args.runs)
+    print(f"🚀 Démarrage à froid (médiane de {args.runs} processus)")
+    print(f"  import de Streamlit            {timings['streamlit_import_ms']:8.0f} ms")
+    print(f"  imports du premier rendu       {timings['first_render_ms']:8.0f} ms"
+          f"  ({timings['modules_first_render']} modules chargés)")
+    print(f"  total jusqu'au premier rendu   {timings['cold_start_ms']:8.0f} ms")
+    for page in timings:
+        if not page.endswith('_ms') and page != 'modules_first_render':
+            print(f"  première visite {page:<22} {timings[page]:6.0f} ms")
+
+    if not args.no_server:
+        server = server_start()
+        print("\n🌐 Serveur headless (python -m app.serve)")
+        print(f"  réponse de /_stcore/health     {_format_ms(server['server_ms'])}")
+        print(f"  sonde de disponibilité         {_format_ms(server['ready_ms'])}")
+
+    print("\n📦 Imports de l'application les plus coûteux (python -X importtime)")
+    print(f"  {'module':<40} {'cumulé':>10} {'propre':>10}")
+    for module, cumulative, own in import_profile(top=args.top):
+        print(f"  {module:<40} {cumulative:8.1f} ms {own:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
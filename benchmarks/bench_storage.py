@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark du chargement des données : CSV contre Parquet et Arrow IPC
+
+Réplique le jeu de données (data/processed/heart_disease_uci.csv, ou
+data/sample_data.csv à défaut) jusqu'à --rows lignes, l'écrit dans chaque
+format puis mesure le temps de lecture, complète et limitée à deux
+colonnes, et la mémoire occupée par le DataFrame obtenu.
+
+Usage:
+    python benchmarks/bench_storage.py
+    python benchmarks/bench_storage.py --rows 5000000 --source data/processed/heart_disease_uci.csv
+"""
+
+import argparse
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data.storage import read_table, write_table
+
+DEFAULT_SOURCES = ['data/processed/heart_disease_uci.csv', 'data/sample_data.csv']
+
+PROJECTION = ['age', 'chol']
+
+
+def best_time(func, repeat=3):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV / Parquet / Arrow")
+    parser.add_argument("--rows", type=int, default=1000000, help="Nombre de lignes de la table")
+    parser.add_argument("--source", help="CSV de départ (défaut: données du projet)")
+    args = parser.parse_args()
+
+    source = args.source or next((path for path in DEFAULT_SOURCES if Path(path).exists()), None)
+    if source is None:
+        sys.exit("❌ Aucun fichier de données trouvé, utilisez --source")
+
+    data = pd.read_csv(source)
+    data = pd.concat([data] * (args.rows // len(data) + 1), ignore_index=True).iloc[:args.rows]
+    print(f"📊 {len(data):,} lignes, {len(data.columns)} colonnes (source: {source})\n")
+    print(f"  {'format':<8} {'taille':>10} {'lecture':>10} {'2 colonnes':>11} {'mémoire':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        for suffix in ('.csv', '.parquet', '.arrow'):
+            path = Path(tmp) / f'patients{suffix}'
+            if suffix == '.csv':
+                data.to_csv(path, index=False)  # CSV d'origine, types int64 / float64
+                read = lambda: pd.read_csv(path)
+                read_projection = lambda: pd.read_csv(path, usecols=PROJECTION)
+            else:
+                write_table(data, path)
+                read = lambda: read_table(path)
+                read_projection = lambda: read_table(path, columns=PROJECTION)
+
+            load_time = best_time(read)
+            projection_time = best_time(read_projection)
+            memory = read().memory_usage(deep=True).sum()
+            baseline = baseline or (load_time, memory)
+            print(f"  {suffix[1:]:<8} {path.stat().st_size / 2**20:8.1f} Mo {load_time * 1000:8.0f} ms "
+                  f"{projection_time * 1000:9.0f} ms {memory / 2**20:7.1f} Mo"
+                  f"  (x{baseline[0] / load_time:.0f} plus rapide, x{baseline[1] / memory:.1f} moins de mémoire)")
+
+
+if __name__ == "__main__":
+    main()
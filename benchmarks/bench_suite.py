@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks de l'inférence, avec seuils de non-régression
+
+Patients synthétiques tirés des distributions de data/sample_data.csv
+(graine fixe), puis cinq mesures :
+- single : latence d'un diagnostic individuel, chemin de la page Diagnostic
+  (encode_record puis EnsemblePredictor sur le pool partagé, sans cache) ;
+- batch : débit de predict_batch pour 1, 100, 10 000 et 1 000 000 lignes ;
+- what_if : balayage « et si » de la page Diagnostic, une variable
+  (100 points) puis deux variables (grille de 100 × 100) ;
+- load : durée et pic de mémoire (RSS) de load_models(), dans un processus neuf ;
+- figures : statistiques incrémentales du jeu de données (calcul complet,
+  puis résumé lu par les pages) et construction des figures
+  plot_distributions et plot_bivariate_analysis, sous et au-dessus du
+  seuil d'agrégation.
+
+Les résultats sont écrits en JSON. Avec --baseline, chaque mesure est
+comparée à celle de référence : la commande échoue (code 1) si une durée
+ou une mémoire augmente, ou un débit diminue, de plus de --threshold
+(20 % par défaut, ou BENCH_REGRESSION_THRESHOLD).
+
+Usage:
+    python benchmarks/bench_suite.py --update-baseline      # enregistrer la référence
+    python benchmarks/bench_suite.py --baseline benchmarks/baselines/baseline.json
+    python benchmarks/bench_suite.py --quick --only single batch --threshold 0.3
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.data.preprocessing import FEATURE_COLUMNS, CATEGORICAL_MAPPINGS, FeatureEncoder, encode_batch
+from src.data.validation import MEASUREMENT_RANGES
+from src.utils.config import env_float
+
+SOURCE_FILE = 'data/sample_data.csv'
+DEFAULT_BASELINE = 'benchmarks/baselines/baseline.json'
+DEFAULT_OUTPUT = 'benchmarks/results/latest.json'
+
+BENCHMARKS = ['single', 'batch', 'what_if', 'load', 'figures']
+DEFAULT_BATCH_SIZES = [1, 100, 10000, 1000000]
+QUICK_BATCH_SIZES = [1, 100, 10000]
+DEFAULT_FIGURE_ROWS = [10000, 1000000]
+QUICK_FIGURE_ROWS = [10000]
+
+DEFAULT_THRESHOLD = env_float('BENCH_REGRESSION_THRESHOLD', 0.20)
+
+# Durée minimale de mesure par taille de lot (secondes)
+MIN_MEASURE_TIME = 0.5
+
+SEED = 42
+
+
+def synthetic_patients(n_rows, source=SOURCE_FILE, seed=SEED):
+    """
+    `n_rows` patients tirés colonne par colonne des distributions de `source`
+
+    Variables catégorielles et cible : fréquences observées ; mesures :
+    loi normale de même moyenne et écart-type, bornée aux domaines du
+    formulaire et arrondie comme dans le fichier source.
+    """
+    data = pd.read_csv(source)
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for col in data.columns:
+        values = data[col].dropna()
+        if col in CATEGORICAL_MAPPINGS or col == 'target':
+            frequencies = values.value_counts(normalize=True)
+            columns[col] = rng.choice(frequencies.index.to_numpy(), n_rows, p=frequencies.to_numpy())
+            continue
+        sampled = rng.normal(values.mean(), values.std() or 1.0, n_rows)
+        low, high = MEASUREMENT_RANGES.get(col, (values.min(), values.max()))
+        sampled = np.clip(sampled, low, high)
+        if pd.api.types.is_integer_dtype(values):
+            columns[col] = np.rint(sampled).astype(values.dtype)
+        else:
+            columns[col] = np.round(sampled, 1)
+    return pd.DataFrame(columns)
+
+
+def _repeat(func, min_time=MIN_MEASURE_TIME, min_runs=3):
+    """Durées (secondes) de `func` répétée au moins `min_runs` fois et `min_time` secondes"""
+    durations = []
+    while len(durations) < min_runs or sum(durations) < min_time:
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def bench_single(models, patients, requests=500):
+    """Latence d'un diagnostic individuel (p50 / p95 / p99 en ms)"""
+    from src.models.ensemble import DEFAULT_MODEL_TIMEOUT, EnsemblePredictor, shared_executor
+
+    encoder = FeatureEncoder()
+    predictor = EnsemblePredictor(models, executor=shared_executor(), timeout=DEFAULT_MODEL_TIMEOUT)
+    records = patients[FEATURE_COLUMNS].head(requests).itertuples(index=False)
+
+    latencies = []
+    for i, record in enumerate(records):
+        start = time.perf_counter()
+        predictor.predict(encoder.encode_record(tuple(record)))
+        if i >= 10:  # les premiers appels servent de préchauffage
+            latencies.append(time.perf_counter() - start)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+
+
+def bench_batch(models, patients, sizes):
+    """Débit de predict_batch pour chaque taille de lot"""
+    from src.models.prediction import predict_batch
+
+    features = encode_batch(patients)
+    results = {}
+    for size in sizes:
+        batch = np.resize(features, (size, features.shape[1]))
+        # Les très grands lots ne sont mesurés qu'une fois (plusieurs secondes chacun)
+        durations = _repeat(lambda: predict_batch(models, batch), min_runs=3 if size < 100000 else 1)
+        median = statistics.median(durations)
+        results[f'{size}_rows_ms'] = median * 1000
+        results[f'{size}_rows_per_s'] = size / median
+    return results
+
+
+def bench_what_if(models, patients, points=100):
+    """Durée d'un balayage de sensibilité à une puis deux variables"""
+    from src.models import sensitivity
+    from src.models.ensemble import EnsemblePredictor, shared_executor
+
+    predictor = EnsemblePredictor(models, executor=shared_executor())
+    base = encode_batch(patients.head(1))
+    x_values = sensitivity.sweep_values('chol', points)
+    y_values = sensitivity.sweep_values('thalach', points)
+    return {
+        f'{len(x_values)}_points_ms': statistics.median(_repeat(
+            lambda: sensitivity.run_sweep(predictor, base, 'chol', x_values))) * 1000,
+        f'{len(x_values)}x{len(y_values)}_grid_ms': statistics.median(_repeat(
+            lambda: sensitivity.run_sweep(predictor, base, 'chol', x_values, 'thalach', y_values))) * 1000
+    }
+
+
+def _proc_status_mb(field):
+    """Valeur (Mo) d'un champ de /proc/self/status (Linux), None sinon"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _measure_load():
+    """Exécuté dans un processus neuf : durée et mémoire de load_models()"""
+    from src.models.prediction import load_models
+
+    rss_before = _proc_status_mb('VmRSS')
+    try:
+        # Remet à zéro le pic de RSS (VmHWM) : seul le chargement est mesuré
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+    start = time.perf_counter()
+    models = load_models()
+    elapsed = time.perf_counter() - start
+    return len(models), elapsed, rss_before, _proc_status_mb('VmHWM')
+
+
+def bench_load(runs=3):
+    """Durée et pic de RSS de load_models() (modèles compilés préférés), médiane de `runs` processus neufs"""
+    measures = []
+    for _ in range(runs):
+        with ProcessPoolExecutor(1, mp_context=mp.get_context('spawn')) as pool:
+            measures.append(pool.submit(_measure_load).result())
+    n_models = measures[0][0]
+    results = {'models': n_models, 'load_ms': statistics.median(m[1] for m in measures) * 1000}
+    if measures[0][3] is not None:
+        results['peak_rss_mb'] = statistics.median(m[3] for m in measures)
+        results['load_rss_mb'] = statistics.median(max(m[3] - m[2], 0.0) for m in measures)
+    return results
+
+
+def _import_views():
+    """Module des graphiques de l'application Streamlit (app/views/visualizations.py)"""
+    import contextlib
+    import importlib
+    import io
+
+    # Avertissements « bare mode » de Streamlit ignorés : l'application n'est pas servie
+    with warnings.catch_warnings(), contextlib.redirect_stderr(io.StringIO()):
+        warnings.simplefilter('ignore')
+        return importlib.import_module('app.views.visualizations')
+
+
+def bench_figures(row_counts):
+    """
+    Statistiques du jeu de données et construction des figures des pages
+
+    Même chemin que load_data_summary (app/views/datasets.py) : calcul
+    complet des statistiques incrémentales d'un CSV neuf (build), puis
+    relecture de l'état enregistré et DatasetSummary, avec les colonnes
+    brutes sous le seuil d'agrégation (summary).
+    """
+    import tempfile
+
+    from src.data.incremental import refresh_stats
+    from src.data.summaries import AGGREGATION_THRESHOLD, plotted_columns
+
+    views = _import_views()
+    results = {}
+    for n_rows in row_counts:
+        data = synthetic_patients(n_rows)
+        summary = None
+
+        def summarize():
+            nonlocal summary
+            stats = refresh_stats(path)
+            raw = None
+            if stats.n_rows <= AGGREGATION_THRESHOLD:
+                raw = data[plotted_columns(stats.columns, stats.numeric)]
+            summary = stats.summary(raw=raw)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'patients.csv'
+            data.to_csv(path, index=False)
+            results[f'{n_rows}_rows_build_ms'] = statistics.median(
+                _repeat(lambda: refresh_stats(path, rebuild=True), min_runs=1)) * 1000
+            results[f'{n_rows}_rows_summary_ms'] = statistics.median(_repeat(summarize)) * 1000
+        results[f'{n_rows}_rows_distributions_ms'] = statistics.median(
+            _repeat(lambda: views.plot_distributions(summary))) * 1000
+        results[f'{n_rows}_rows_bivariate_ms'] = statistics.median(
+            _repeat(lambda: views.plot_bivariate_analysis(summary))) * 1000
+    return results
+
+
+def run_suite(benchmarks=BENCHMARKS, batch_sizes=DEFAULT_BATCH_SIZES, figure_rows=DEFAULT_FIGURE_ROWS,
+              requests=500, log=print):
+    """Exécute les benchmarks demandés ; retourne {'meta': ..., 'results': {benchmark: {mesure: valeur}}}"""
+    results = {}
+    models = None
+    if {'single', 'batch', 'what_if'} & set(benchmarks):
+        from src.models.prediction import load_models
+
+        models = load_models()
+        patients = synthetic_patients(max(requests, 1000))
+
+    for name in benchmarks:
+        log(f"⏱️  {name}...")
+        if name == 'single':
+            results[name] = bench_single(models, patients, requests)
+        elif name == 'batch':
+            results[name] = bench_batch(models, patients, batch_sizes)
+        elif name == 'what_if':
+            results[name] = bench_what_if(models, patients)
+        elif name == 'load':
+            results[name] = bench_load()
+        elif name == 'figures':
+            results[name] = bench_figures(figure_rows)
+
+    meta = {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': SEED,
+        'models': list(models) if models else None
+    }
+    return {'meta': meta, 'results': results}
+
+
+def lower_is_better(metric):
+    return not metric.endswith('_per_s')
+
+
+# Écarts absolus en dessous desquels une variation est du bruit de mesure
+NOISE_FLOOR = {'_ms': 0.25, '_mb': 5.0}
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Écart relatif de chaque mesure commune avec la référence
+
+    Retourne une liste de dicts (benchmark, mesure, référence, actuel,
+    écart, régression) ; un écart positif est une dégradation. Une durée
+    ou une mémoire n'est une régression que si l'écart absolu dépasse
+    aussi NOISE_FLOOR.
+    """
+    rows = []
+    for name, metrics in current['results'].items():
+        reference = baseline['results'].get(name, {})
+        for metric, value in metrics.items():
+            base = reference.get(metric)
+            if not base or metric == 'models':
+                continue
+            change = (value - base) / base
+            if not lower_is_better(metric):
+                change = -change
+            floor = next((floor for suffix, floor in NOISE_FLOOR.items() if metric.endswith(suffix)), 0.0)
+            rows.append({
+                'benchmark': name,
+                'mesure': metric,
+                'reference': base,
+                'actuel': value,
+                'ecart': change,
+                'regression': change > threshold and abs(value - base) > floor
+            })
+    return rows
+
+
+def print_results(results):
+    for name, metrics in results['results'].items():
+        print(f"\n📊 {name}")
+        for metric, value in metrics.items():
+            print(f"  {metric:<32} {value:>14,.2f}")
+
+
+def write_json(content, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(content, indent=2, ensure_ascii=False), encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de l'inférence et seuils de non-régression")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Benchmarks à exécuter (défaut: tous)")
+    parser.add_argument("--quick", action="store_true",
+                        help="Lots jusqu'à 10 000 lignes et figures sur 10 000 lignes (CI)")
+    parser.add_argument("--sizes", nargs="+", type=int, help="Tailles de lot du benchmark batch")
+    parser.add_argument("--requests", type=int, default=500, help="Diagnostics individuels mesurés")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Fichier JSON des résultats")
+    parser.add_argument("--baseline", help="Référence JSON à laquelle comparer les résultats")
+    parser.add_argument("--update-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help=f"Enregistrer les résultats comme référence (défaut: {DEFAULT_BASELINE})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Dégradation relative tolérée avant échec (0.2 = 20 %%)")
+    args = parser.parse_args()
+
+    batch_sizes = args.sizes or (QUICK_BATCH_SIZES if args.quick else DEFAULT_BATCH_SIZES)
+    figure_rows = QUICK_FIGURE_ROWS if args.quick else DEFAULT_FIGURE_ROWS
+    try:
+        results = run_suite(args.only or BENCHMARKS, batch_sizes, figure_rows, args.requests)
+    except FileNotFoundError as e:
+        sys.exit(f"❌ {e}")
+
+    print_results(results)
+    write_json(results, args.output)
+    print(f"\n📄 Résultats écrits dans {args.output}")
+    if args.update_baseline:
+        write_json(results, args.update_baseline)
+        print(f"📌 Référence mise à jour: {args.update_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        if baseline['meta'].get('cpu_count') != results['meta']['cpu_count']:
+            print("⚠️  Référence mesurée sur une autre machine (nombre de cœurs différent)")
+        rows = compare(results, baseline, args.threshold)
+        print(f"\n🔍 Comparaison avec {args.baseline} (seuil {args.threshold:.0%}, écart positif = dégradation)")
+        for row in rows:
+            status = "❌" if row['regression'] else "✅"
+            print(f"  {status} {row['benchmark']}.{row['mesure']:<32} {row['reference']:>12,.2f} → "
+                  f"{row['actuel']:>12,.2f} ({row['ecart']:+.1%})")
+        regressions = [row for row in rows if row['regression']]
+        if regressions:
+            sys.exit(f"\n❌ {len(regressions)} régression(s) au-delà de {args.threshold:.0%}")
+        print("\n✅ Aucune régression")
+
+
+if __name__ == "__main__":
+    main()
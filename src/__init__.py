@@ -0,0 +1,6 @@
+"""
+Bibliothèque du projet de diagnostic cardiaque
+
+Regroupe le code partagé entre l'application Streamlit, le script start.py
+et les futurs services (prétraitement, modèles, utilitaires).
+"""
@@ -0,0 +1,3 @@
+"""
+API REST de prédiction (FastAPI)
+"""
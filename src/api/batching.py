@@ -0,0 +1,159 @@
+"""
+Regroupement des requêtes concurrentes en micro-lots
+
+Les requêtes qui arrivent pendant une courte fenêtre (quelques
+millisecondes) ou jusqu'à un nombre maximal de lignes sont concaténées et
+évaluées par un seul appel predict_proba par modèle. Sous forte charge, le
+coût des modèles est ainsi payé une fois par lot plutôt qu'une fois par
+requête. Jusqu'à `max_concurrency` lots sont évalués en même temps (un
+thread du pool par lot) ; quand tous sont occupés, les requêtes suivantes
+s'accumulent et partent dans un lot plus grand.
+"""
+
+import asyncio
+
+import numpy as np
+
+
+class _Pending:
+    __slots__ = ('features', 'future')
+
+    def __init__(self, features, future):
+        self.features = features
+        self.future = future
+
+
+class MicroBatcher:
+    """
+    File d'attente asynchrone qui regroupe les matrices soumises
+
+    `predict_fn(features)` doit retourner un EnsembleResult ; il est exécuté
+    dans `executor` (pool de threads) pour ne pas bloquer la boucle
+    asyncio. Un lot part dès que `max_rows` lignes sont en attente ou
+    `max_wait_ms` après l'arrivée de sa première requête ; au plus
+    `max_concurrency` lots sont en cours d'évaluation.
+    """
+
+    def __init__(self, predict_fn, max_wait_ms=5.0, max_rows=256, executor=None, max_concurrency=1):
+        self.predict_fn = predict_fn
+        self.max_wait = max_wait_ms / 1000
+        self.max_rows = max_rows
+        self.executor = executor
+        self.max_concurrency = max(1, max_concurrency)
+        self.batches = 0
+        self.rows = 0
+        self.requests = 0
+        self._queue = None
+        self._task = None
+        self._slots = None
+        self._gathering = []
+        self._in_flight = set()
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Arrête le regroupement : les lots en cours d'évaluation se terminent,
+        les requêtes encore en file échouent (RuntimeError, 503 dans l'API)
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        error = RuntimeError("Service en cours d'arrêt")
+        pending, self._gathering = self._gathering, []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for item in pending:
+            if not item.future.done():
+                item.future.set_exception(error)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def submit(self, features):
+        """
+        Ajoute une matrice (n_lignes, n_variables) au prochain lot
+
+        Retourne l'EnsembleResult restreint aux lignes soumises ; lève
+        RuntimeError si le micro-batcher est arrêté.
+        """
+        if self._task is None:
+            raise RuntimeError("Service en cours d'arrêt")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_Pending(features, future))
+        return await future
+
+    def stats(self):
+        return {
+            'requetes': self.requests,
+            'lots': self.batches,
+            'lignes': self.rows,
+            'lignes_par_lot': self.rows / self.batches if self.batches else 0.0,
+            'lots_en_cours': len(self._in_flight)
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Une place libre d'abord : sous charge, la file grossit le lot suivant
+            await self._slots.acquire()
+            try:
+                await self._gather(loop)
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.create_task(self._flush(loop, self._gathering))
+            self._gathering = []
+            self._in_flight.add(task)
+            task.add_done_callback(self._flushed)
+
+    def _flushed(self, task):
+        self._in_flight.discard(task)
+        self._slots.release()
+
+    async def _gather(self, loop):
+        """Remplit self._gathering jusqu'à max_rows lignes ou max_wait secondes"""
+        pending = self._gathering
+        pending.append(await self._queue.get())
+        n_rows = len(pending[0].features)
+        deadline = loop.time() + self.max_wait
+
+        while n_rows < self.max_rows:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            pending.append(item)
+            n_rows += len(item.features)
+
+    async def _flush(self, loop, pending):
+        features = np.concatenate([item.features for item in pending])
+        try:
+            result = await loop.run_in_executor(self.executor, self.predict_fn, features)
+        except Exception as e:
+            for item in pending:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.rows += len(features)
+        self.requests += len(pending)
+
+        start = 0
+        for item in pending:
+            stop = start + len(item.features)
+            if not item.future.done():
+                item.future.set_result(result.rows(start, stop))
+            start = stop
@@ -0,0 +1,208 @@
+"""
+Service REST de prédiction
+
+Lancement :
+    uvicorn src.api.main:app --host 0.0.0.0 --port 8000
+    python start.py --api
+
+Endpoints :
+    GET  /health          vivacité : état des modèles et statistiques du micro-batching
+    GET  /ready           disponibilité : 200 une fois les modèles préchauffés, 503 avant
+    GET  /metrics         durées et compteurs au format texte Prometheus
+    GET  /drift           dérive des variables d'entrée par rapport à l'entraînement
+    POST /predict         un patient
+    POST /predict/batch   plusieurs patients
+
+Le service réutilise l'encodeur et les modèles de l'application
+(FeatureEncoder, ModelRegistry, EnsemblePredictor, PredictionCache). Les requêtes
+concurrentes sont regroupées par MicroBatcher ; la fenêtre et la taille
+des lots se règlent avec API_BATCH_MAX_WAIT_MS et API_BATCH_MAX_ROWS, le
+nombre de lots évalués en même temps avec API_BATCH_MAX_CONCURRENCY.
+Avec CASCADE_ENABLED=true, les patients passent d'abord par le premier
+étage de la cascade (src/models/cascade.py).
+Au démarrage, les modèles sont préchauffés en arrière-plan (WARMUP_ROWS
+patients synthétiques) : /health répond aussitôt, /ready seulement après.
+Chaque diagnostic est consigné dans le journal d'audit (src/models/audit.py),
+écrit par lots en arrière-plan.
+"""
+
+import json
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from src.api.batching import MicroBatcher
+from src.api.schemas import BatchRequest, BatchResponse, PatientInput, PredictionOutput
+from src.data.preprocessing import FEATURE_COLUMNS, FeatureEncoder
+from src.models import drift
+from src.models.audit import audit_records, start_audit_log
+from src.models.cache import CachedPredictor, PredictionCache, create_backend
+from src.models.cascade import CASCADE_ENABLED, CascadePredictor, cascade_available, escalation_models
+from src.models.ensemble import EnsemblePredictor, shared_executor
+from src.models.prediction import risk_levels
+from src.models.registry import ModelRegistry
+from src.models.warmup import WARMUP_ROWS, warm_up
+from src.utils.config import env_float, env_int
+from src.utils.metrics import metrics
+from src.utils.readiness import Readiness
+
+# Fenêtre de regroupement des requêtes (millisecondes)
+BATCH_MAX_WAIT_MS = env_float('API_BATCH_MAX_WAIT_MS', 5.0)
+
+# Nombre de lignes à partir duquel un lot part sans attendre
+BATCH_MAX_ROWS = env_int('API_BATCH_MAX_ROWS', 256)
+
+# Lots évalués en même temps (un thread du pool partagé chacun)
+BATCH_MAX_CONCURRENCY = env_int('API_BATCH_MAX_CONCURRENCY', 4)
+
+
+class PredictionService:
+    """
+    Encodeur, modèles et micro-batcher partagés par les endpoints
+
+    Avec un AuditLog `audit`, chaque diagnostic y est soumis (sans attente).
+    """
+
+    def __init__(self, registry=None, max_wait_ms=BATCH_MAX_WAIT_MS, max_rows=BATCH_MAX_ROWS,
+                 cascade=CASCADE_ENABLED, audit=None, max_concurrency=BATCH_MAX_CONCURRENCY):
+        self.registry = registry or ModelRegistry()
+        self.encoder = FeatureEncoder()
+        self.models = self.registry.load_available()
+        self.audit = audit
+        self.model_versions = self.registry.versions()
+        # Les modèles d'un lot sont évalués les uns après les autres dans le
+        # thread du lot ; jusqu'à max_concurrency lots occupent le pool partagé
+        self.cascade = None
+        if cascade and cascade_available(self.models):
+            self.cache = PredictionCache(create_backend(), escalation_models(self.models),
+                                         self.registry.version())
+            self.predictor = self.cascade = CascadePredictor(self.models, cache=self.cache)
+        else:
+            self.cache = PredictionCache(create_backend(), self.models, self.registry.version())
+            self.predictor = CachedPredictor(EnsemblePredictor(self.models), self.cache)
+        self.batcher = MicroBatcher(self.predictor.predict, max_wait_ms, max_rows,
+                                    executor=shared_executor(), max_concurrency=max_concurrency)
+
+    def encode(self, patients):
+        columns = {col: [getattr(patient, col) for patient in patients] for col in FEATURE_COLUMNS}
+        return self.encoder.encode_batch(columns)
+
+    async def predict(self, patients):
+        metrics.increment('requests', len(patients), source='api')
+        if not self.models:
+            metrics.increment('errors', source='api', status=503)
+            raise HTTPException(status_code=503, detail="Aucun modèle disponible")
+        try:
+            with metrics.span('encode', source='api'):
+                features = self.encode(patients)
+        except ValueError as e:
+            metrics.increment('errors', source='api', status=422)
+            raise HTTPException(status_code=422, detail=str(e))
+        try:
+            result = await self.batcher.submit(features)
+        except RuntimeError as e:
+            metrics.increment('errors', source='api', status=503)
+            raise HTTPException(status_code=503, detail=str(e))
+        drift.observe(features)
+        if self.audit is not None:
+            self.audit.submit(audit_records(features, result, 'api', self.model_versions))
+        return result
+
+
+def build_outputs(result):
+    """Liste de PredictionOutput, un par ligne de l'EnsembleResult"""
+    main_probability = result.main_probability
+    predictions = result.main_prediction
+    confidence = result.confidence
+    levels = risk_levels(main_probability)
+    escalated = result.escalated
+
+    return [
+        PredictionOutput(
+            prediction=int(predictions[i]),
+            probabilite=float(main_probability[i]),
+            confiance=float(confidence[i]),
+            niveau_risque=str(levels[i]),
+            probabilites=result.probabilities_by_model(i),
+            escalade=None if escalated is None else bool(escalated[i])
+        )
+        for i in range(len(main_probability))
+    ]
+
+
+@asynccontextmanager
+async def lifespan(app):
+    service = PredictionService(audit=start_audit_log())
+    await service.batcher.start()
+    app.state.service = service
+    # Sonde HTTP /ready : pas de fichier témoin pour l'API
+    app.state.readiness = Readiness(ready_file=None)
+    app.state.readiness.start(warm_up, service.registry, WARMUP_ROWS)
+    yield
+    await service.batcher.stop()
+    if service.audit is not None:
+        service.audit.close()
+
+
+app = FastAPI(
+    title="🫀 Diagnostic Cardiaque - API",
+    description="Prédiction du risque de maladie cardiaque",
+    lifespan=lifespan
+)
+
+
+@app.get("/health")
+async def health():
+    service = app.state.service
+    return {
+        'status': 'ok' if service.models else 'degraded',
+        'modeles': service.registry.status(),
+        'micro_batching': service.batcher.stats(),
+        'cache': service.cache.stats(),
+        'cascade': service.cascade.stats() if service.cascade is not None else None,
+        'audit': service.audit.stats() if service.audit is not None else None
+    }
+
+
+@app.get("/ready")
+async def ready():
+    readiness = app.state.readiness
+    return JSONResponse(readiness.status(), status_code=200 if readiness.ready else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.to_prometheus(), media_type='text/plain; version=0.0.4')
+
+
+@app.get("/drift")
+async def drift_report():
+    monitor = drift.get_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Référence de dérive absente (python start.py --export)")
+    report = monitor.report().reset_index()
+    return {
+        'patients': monitor.rows,
+        'effectif_pondere': monitor.effective_rows(),
+        'reference': {'patients': monitor.reference.n_rows, 'creee_le': monitor.reference.created_at},
+        'variables': json.loads(report.to_json(orient='records'))
+    }
+
+
+@app.post("/predict", response_model=PredictionOutput)
+async def predict(patient: PatientInput):
+    with metrics.span('api_request', endpoint='/predict'):
+        result = await app.state.service.predict([patient])
+        return build_outputs(result)[0]
+
+
+@app.post("/predict/batch", response_model=BatchResponse)
+async def predict_batch(request: BatchRequest):
+    with metrics.span('api_request', endpoint='/predict/batch'):
+        result = await app.state.service.predict(request.patients)
+    return BatchResponse(
+        predictions=build_outputs(result),
+        modele_principal=result.main_model,
+        erreurs=result.errors
+    )
@@ -0,0 +1,71 @@
+"""
+Schémas d'entrée et de sortie de l'API
+
+Les bornes reprennent celles du formulaire de diagnostic de l'application.
+Les variables catégorielles acceptent le code d'entraînement (format de
+data/sample_data.csv) ou le libellé du formulaire ('Masculin', 'Plat'...) ;
+un code hors de ALLOWED_CODES (cp=9, thal=5...) ou un libellé inconnu est
+refusé (422), comme dans les listes du formulaire.
+"""
+
+from typing import Dict, List, Optional, Union
+
+from pydantic import BaseModel, Field, field_validator
+
+from src.data.preprocessing import CATEGORICAL_MAPPINGS
+from src.data.validation import ALLOWED_CODES
+
+# Nombre maximal de patients par requête /predict/batch
+MAX_BATCH_SIZE = 10000
+
+Categorical = Union[int, str]
+
+
+class PatientInput(BaseModel):
+    age: float = Field(..., ge=1, le=120, description="Âge")
+    sex: Categorical = Field(..., description="Sexe (1 = masculin, 0 = féminin)")
+    cp: Categorical = Field(..., description="Type de douleur thoracique (0-3)")
+    trestbps: float = Field(..., ge=80, le=250, description="Pression artérielle au repos (mmHg)")
+    chol: float = Field(..., ge=100, le=600, description="Cholestérol sérique (mg/dl)")
+    fbs: Categorical = Field(..., description="Glycémie à jeun > 120 mg/dl (0/1)")
+    restecg: Categorical = Field(..., description="Résultats ECG au repos (0-2)")
+    thalach: float = Field(..., ge=60, le=250, description="Fréquence cardiaque maximale")
+    exang: Categorical = Field(..., description="Angine induite par l'exercice (0/1)")
+    oldpeak: float = Field(..., ge=0, le=10, description="Dépression ST induite par l'exercice")
+    slope: Categorical = Field(..., description="Pente du segment ST (0-2)")
+    ca: int = Field(..., ge=0, le=4, description="Nombre de vaisseaux principaux")
+    thal: Categorical = Field(..., description="Thalassémie (3, 6, 7 ou libellé)")
+
+    @field_validator(*CATEGORICAL_MAPPINGS)
+    @classmethod
+    def check_code(cls, value, info):
+        col = info.field_name
+        if isinstance(value, str) and value in CATEGORICAL_MAPPINGS[col]:
+            return value
+        try:
+            code = int(value)
+        except ValueError:
+            code = None
+        if code not in ALLOWED_CODES[col]:
+            labels = ', '.join(map(str, [*ALLOWED_CODES[col], *CATEGORICAL_MAPPINGS[col]]))
+            raise ValueError(f"{col}: valeur {value!r} non admise ({labels})")
+        return code
+
+
+class BatchRequest(BaseModel):
+    patients: List[PatientInput] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class PredictionOutput(BaseModel):
+    prediction: int = Field(..., description="1 = maladie cardiaque (modèle principal)")
+    probabilite: float = Field(..., description="Probabilité du modèle principal")
+    confiance: float = Field(..., description="1 - écart-type des probabilités entre modèles")
+    niveau_risque: str = Field(..., description="faible, modéré ou élevé")
+    probabilites: Dict[str, float] = Field(..., description="Probabilité de chaque modèle évalué")
+    escalade: Optional[bool] = Field(None, description="Mode cascade : patient évalué par tout l'ensemble")
+
+
+class BatchResponse(BaseModel):
+    predictions: List[PredictionOutput]
+    modele_principal: str
+    erreurs: Dict[str, str] = Field(default_factory=dict, description="Modèles en échec")
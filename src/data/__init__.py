@@ -0,0 +1,3 @@
+"""
+Préparation et validation des données patients
+"""
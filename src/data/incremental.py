@@ -0,0 +1,583 @@
+"""
+Statistiques incrémentales du jeu de données
+
+Le jeu de données des pages Visualisations et Analyse grossit par ajout de
+lignes. Plutôt que de relire toute la table à chaque nouvelle version,
+IncrementalStats tient à jour, bloc par bloc :
+- les effectifs, moyennes et sommes des carrés des écarts (Welford, avec
+  la fusion de Chan) pour chaque paire de colonnes, d'où les variances et
+  la matrice de corrélation (observations complètes par paire, comme
+  DataFrame.corr) ;
+- une esquisse de quantiles par colonne et par (colonne, classe de la
+  cible), d'où les quartiles, histogrammes et boîtes à moustaches ;
+- les effectifs par classe de la cible et les valeurs hors domaine.
+
+Un bloc de n lignes coûte O(n) ; l'état est enregistré à côté de la table
+(<table>.stats.json), ou dans STATS_DIR si le dossier des données est en
+lecture seule. Pour un CSV, refresh_stats ne lit que les octets
+ajoutés depuis la dernière mise à jour ; si le début du fichier a changé
+(réécriture, table Parquet ou Arrow reconvertie), les statistiques sont
+recalculées en une passe.
+
+    python -m src.data.incremental                     # mettre à jour les statistiques
+    python -m src.data.incremental --append new.csv    # ajouter des lignes à la table
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.storage import apply_schema, find_table, memory_usage, read_table, table_format
+from src.data.summaries import (
+    BIVARIATE_COLUMNS, HISTOGRAM_BINS, MAX_DISCRETE_VALUES, MAX_HISTOGRAMS, MAX_OUTLIERS,
+    PREVIEW_ROWS, DatasetSummary
+)
+from src.data.validation import validate_ranges
+from src.utils.config import env_int, env_str
+from src.utils.helpers import file_fingerprint
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DATA_FILE = 'data/processed/heart_disease_uci.csv'
+
+# Dossier des états enregistrés (défaut : celui de la table)
+STATS_DIR = env_str('STATS_DIR')
+
+# Nombre maximal de centroïdes par esquisse de quantiles (exacte en dessous)
+SKETCH_SIZE = env_int('STATS_SKETCH_SIZE', 500)
+
+# Taille des blocs lus dans un CSV (octets)
+CSV_CHUNK_BYTES = 16 * 2**20
+
+# Octets de fin de la partie déjà lue comparés pour détecter une réécriture
+TAIL_CHECK_BYTES = 4096
+
+STATS_FORMAT = 1
+
+
+class QuantileSketch:
+    """
+    Distribution résumée par au plus `size` centroïdes (valeur, effectif)
+
+    Tant que la colonne compte moins de `size` valeurs distinctes,
+    l'esquisse est exacte (une valeur par centroïde) ; au-delà, les
+    centroïdes voisins sont regroupés en `size` tranches d'effectif égal, ce
+    qui borne l'erreur de rang des quantiles à 1 / size. Le minimum, le
+    maximum et la somme des valeurs restent exacts.
+    """
+
+    def __init__(self, size=SKETCH_SIZE, values=None, counts=None, low=np.inf, high=-np.inf):
+        self.size = size
+        self.values = np.asarray([] if values is None else values, dtype=np.float64)
+        self.counts = np.asarray([] if counts is None else counts, dtype=np.float64)
+        self.low = low
+        self.high = high
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        unique, counts = np.unique(values, return_counts=True)
+        self.low = min(self.low, unique[0])
+        self.high = max(self.high, unique[-1])
+        self._add(unique, counts)
+
+    def merge(self, other):
+        if other.count:
+            self.low = min(self.low, other.low)
+            self.high = max(self.high, other.high)
+            self._add(other.values, other.counts)
+
+    def _add(self, values, counts):
+        values = np.concatenate([self.values, values])
+        counts = np.concatenate([self.counts, counts])
+        values, inverse = np.unique(values, return_inverse=True)
+        counts = np.bincount(inverse, counts)
+        if len(values) > self.size:
+            # Tranches d'effectif égal : un centroïde plus lourd qu'une tranche reste seul
+            before = np.cumsum(counts) - counts
+            buckets = (before * self.size / counts.sum()).astype(np.int64)
+            weights = np.bincount(buckets, counts)
+            sums = np.bincount(buckets, values * counts)
+            kept = weights > 0
+            values, counts = sums[kept] / weights[kept], weights[kept]
+        self.values, self.counts = values, counts
+
+    def _at(self, positions):
+        """Valeurs de rang `positions` (0 à count - 1) dans les données triées"""
+        return self.values[np.searchsorted(np.cumsum(self.counts), positions, side='right')
+                           .clip(0, len(self.values) - 1)]
+
+    def quantile(self, q):
+        """Quantiles `q` (interpolation linéaire, comme np.percentile)"""
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if not self.count:
+            return np.full(len(q), np.nan)
+        positions = q * (self.count - 1)
+        below = np.floor(positions)
+        low, high = self._at(below), self._at(np.ceil(positions))
+        return low + (positions - below) * (high - low)
+
+    def mean(self):
+        return (self.values * self.counts).sum() / self.counts.sum() if self.count else np.nan
+
+    def histogram(self, discrete=False):
+        """
+        Barres {'x', 'width', 'count'} (centre, largeur, effectif) de
+        DatasetSummary.histograms, une par valeur pour les codes entiers
+        """
+        if not self.count:
+            return {'x': np.array([]), 'width': np.array([]), 'count': np.array([], dtype=np.int64)}
+        if discrete and self.high - self.low < MAX_DISCRETE_VALUES:
+            counts = np.bincount(np.rint(self.values - self.low).astype(np.int64), self.counts)
+            return {'x': np.arange(self.low, self.high + 1), 'width': np.ones(len(counts)),
+                    'count': np.rint(counts).astype(np.int64)}
+        counts, edges = np.histogram(self.values, bins=HISTOGRAM_BINS, range=(self.low, self.high),
+                                     weights=self.counts)
+        return {'x': (edges[:-1] + edges[1:]) / 2, 'width': np.diff(edges),
+                'count': np.rint(counts).astype(np.int64)}
+
+    def box(self, max_outliers=MAX_OUTLIERS, seed=0):
+        """
+        Quartiles, moyenne, moustaches de Tukey et échantillon d'au plus
+        `max_outliers` valeurs aberrantes (None sans valeur)
+        """
+        if not self.count:
+            return None
+        q1, median, q3 = self.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        inside = (self.values >= q1 - 1.5 * iqr) & (self.values <= q3 + 1.5 * iqr)
+        values, counts = self.values[~inside], self.counts[~inside]
+        n_outliers = int(round(counts.sum()))
+        if n_outliers > max_outliers:
+            outliers = np.random.default_rng(seed).choice(values, max_outliers, p=counts / counts.sum())
+        else:
+            outliers = np.repeat(values, np.rint(counts).astype(np.int64))
+        return {
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'mean': self.mean(),
+            'lowerfence': self.values[inside].min(),
+            'upperfence': self.values[inside].max(),
+            'count': self.count,
+            'n_outliers': n_outliers,
+            'outliers': outliers
+        }
+
+    def to_dict(self):
+        return {'size': self.size, 'values': self.values.tolist(), 'counts': self.counts.tolist(),
+                'low': self.low if self.count else None, 'high': self.high if self.count else None}
+
+    @classmethod
+    def from_dict(cls, state):
+        low = np.inf if state['low'] is None else state['low']
+        high = -np.inf if state['high'] is None else state['high']
+        return cls(state['size'], state['values'], state['counts'], low, high)
+
+
+def batch_moments(values):
+    """
+    Moments d'un bloc (n lignes, k colonnes) pour chaque paire de colonnes
+
+    Retourne (N, MU, V, C), matrices k × k calculées sur les lignes où les
+    colonnes i et j sont toutes deux renseignées : effectif, moyenne de la
+    colonne i, somme des carrés des écarts de i et co-moment de (i, j). La
+    diagonale donne les moments de chaque colonne.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    present = np.isfinite(values)
+    mask = present.astype(np.float64)
+    # Centrage sur les moyennes du bloc pour limiter les erreurs d'arrondi
+    with np.errstate(invalid='ignore'):
+        shift = np.nan_to_num(np.nanmean(np.where(present, values, np.nan), axis=0))
+    centered = np.where(present, values - shift, 0.0)
+
+    n = mask.T @ mask
+    sums = centered.T @ mask
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mu = np.where(n > 0, sums / n, 0.0) + shift[:, None]
+        v = np.where(n > 0, (centered ** 2).T @ mask - sums ** 2 / n, 0.0)
+        c = np.where(n > 0, centered.T @ centered - sums * sums.T / n, 0.0)
+    return n, mu, v, c
+
+
+def merge_moments(a, b):
+    """Fusion de deux jeux de moments par paire (formule de Chan)"""
+    n_a, mu_a, v_a, c_a = a
+    n_b, mu_b, v_b, c_b = b
+    n = n_a + n_b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        share = np.where(n > 0, n_b / n, 0.0)
+        weight = np.where(n > 0, n_a * n_b / n, 0.0)
+    delta = mu_b - mu_a
+    return (n, mu_a + delta * share, v_a + v_b + delta ** 2 * weight,
+            c_a + c_b + delta * delta.T * weight)
+
+
+class IncrementalStats:
+    """
+    Statistiques d'une table, complétées bloc par bloc (voir update)
+
+    Les colonnes numériques sont fixées par le premier bloc ; `summary`
+    produit le DatasetSummary des pages de visualisation sans relire les
+    données. `source` décrit la partie du fichier déjà lue (voir
+    refresh_stats).
+    """
+
+    def __init__(self, columns, numeric, sketch_size=SKETCH_SIZE):
+        k = len(numeric)
+        self.columns = list(columns)
+        self.numeric = list(numeric)
+        self.sketch_size = sketch_size
+        self.n_rows = 0
+        self.memory_bytes = 0
+        self.discrete = {col: True for col in self.numeric}
+        self.moments = tuple(np.zeros((k, k)) for _ in range(4))
+        self.sketches = {col: QuantileSketch(sketch_size) for col in self.numeric}
+        self.class_sketches = {}
+        self.target_counts = {}
+        self.invalid_values = {}
+        self.preview = None
+        self.source = {}
+
+    @classmethod
+    def from_frame(cls, data, sketch_size=SKETCH_SIZE):
+        data = apply_schema(data)
+        stats = cls(data.columns, data.select_dtypes(include=[np.number]).columns, sketch_size)
+        stats.update(data)
+        return stats
+
+    @property
+    def has_target(self):
+        return 'target' in self.numeric
+
+    def update(self, data):
+        """Ajoute un bloc de lignes (mêmes colonnes que le premier bloc)"""
+        if list(data.columns) != self.columns:
+            raise ValueError(f"Colonnes différentes de celles des statistiques: {list(data.columns)}")
+        if not len(data):
+            return
+        with metrics.span('stats_update'):
+            data = apply_schema(data)
+            if self.preview is None or len(self.preview) < PREVIEW_ROWS:
+                head = data.head(PREVIEW_ROWS)
+                self.preview = head if self.preview is None else \
+                    pd.concat([self.preview, head]).head(PREVIEW_ROWS)
+            self.n_rows += len(data)
+            self.memory_bytes += memory_usage(data)
+            for col, count in validate_ranges(data).items():
+                self.invalid_values[col] = self.invalid_values.get(col, 0) + count
+
+            values = data[self.numeric].to_numpy(dtype=np.float64)
+            self.moments = merge_moments(self.moments, batch_moments(values))
+            for j, col in enumerate(self.numeric):
+                self.discrete[col] &= data[col].dtype.kind in 'iub'
+                self.sketches[col].update(values[:, j])
+
+            if self.has_target:
+                target = data['target'].dropna()
+                for value, count in target.value_counts().items():
+                    self.target_counts[value] = self.target_counts.get(value, 0) + int(count)
+                groups = data.groupby('target').indices
+                for col in BIVARIATE_COLUMNS:
+                    if col not in self.numeric:
+                        continue
+                    column = values[:, self.numeric.index(col)]
+                    for group, positions in groups.items():
+                        sketch = self.class_sketches.setdefault((col, group), QuantileSketch(self.sketch_size))
+                        sketch.update(column[positions])
+
+    def merge(self, other):
+        """Ajoute les statistiques d'un autre ensemble de lignes des mêmes colonnes"""
+        if other.columns != self.columns:
+            raise ValueError("Colonnes différentes")
+        if self.preview is None or len(self.preview) < PREVIEW_ROWS:
+            self.preview = other.preview if self.preview is None else \
+                pd.concat([self.preview, other.preview]).head(PREVIEW_ROWS)
+        self.n_rows += other.n_rows
+        self.memory_bytes += other.memory_bytes
+        for col, count in other.invalid_values.items():
+            self.invalid_values[col] = self.invalid_values.get(col, 0) + count
+        self.moments = merge_moments(self.moments, other.moments)
+        for col in self.numeric:
+            self.discrete[col] &= other.discrete[col]
+            self.sketches[col].merge(other.sketches[col])
+        for value, count in other.target_counts.items():
+            self.target_counts[value] = self.target_counts.get(value, 0) + count
+        for key, sketch in other.class_sketches.items():
+            self.class_sketches.setdefault(key, QuantileSketch(self.sketch_size)).merge(sketch)
+
+    def description(self):
+        """Équivalent de DataFrame.describe() pour les colonnes numériques"""
+        n, mu, v, _ = self.moments
+        count, mean, m2 = np.diag(n), np.diag(mu), np.diag(v)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(np.where(count > 1, m2 / (count - 1), np.nan))
+        rows = {'count': count, 'mean': np.where(count > 0, mean, np.nan), 'std': std}
+        quartiles = np.array([self.sketches[col].quantile([0.25, 0.5, 0.75]) for col in self.numeric])
+        rows['min'] = [self.sketches[col].low if count[j] else np.nan for j, col in enumerate(self.numeric)]
+        for i, name in enumerate(['25%', '50%', '75%']):
+            rows[name] = quartiles[:, i] if len(self.numeric) else []
+        rows['max'] = [self.sketches[col].high if count[j] else np.nan for j, col in enumerate(self.numeric)]
+        return pd.DataFrame(rows, index=self.numeric).T
+
+    def correlation(self):
+        """Matrice de corrélation de Pearson (observations complètes par paire)"""
+        _, _, v, c = self.moments
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = np.clip(c / np.sqrt(v * v.T), -1, 1)
+        return pd.DataFrame(corr, index=self.numeric, columns=self.numeric)
+
+    def summary(self, raw=None):
+        """
+        DatasetSummary des pages de visualisation, sans relire les données
+
+        Les histogrammes et boîtes sont tirés des esquisses ; `raw` (colonnes
+        de plotted_columns) permet des graphiques exacts pour les petites tables.
+        """
+        boxes = None
+        if self.has_target:
+            stats = {}
+            for col in BIVARIATE_COLUMNS:
+                for group in sorted(self.target_counts):
+                    sketch = self.class_sketches.get((col, group))
+                    box = sketch.box() if sketch is not None else None
+                    if box is not None:
+                        stats[(col, group)] = box
+            boxes = pd.DataFrame.from_dict(stats, orient='index')
+        return DatasetSummary(
+            n_rows=self.n_rows,
+            columns=self.columns,
+            histograms={col: self.sketches[col].histogram(self.discrete[col])
+                        for col in self.numeric[:MAX_HISTOGRAMS]},
+            boxes=boxes,
+            correlation=self.correlation(),
+            description=self.description(),
+            target_counts=pd.Series(self.target_counts, name='count').sort_index() if self.has_target else None,
+            preview=self.preview,
+            raw=raw,
+            memory_bytes=self.memory_bytes,
+            invalid_values=dict(self.invalid_values)
+        )
+
+    def to_dict(self):
+        return {
+            'format': STATS_FORMAT,
+            'columns': self.columns,
+            'numeric': self.numeric,
+            'sketch_size': self.sketch_size,
+            'n_rows': self.n_rows,
+            'memory_bytes': self.memory_bytes,
+            'discrete': self.discrete,
+            'moments': [m.tolist() for m in self.moments],
+            'sketches': {col: sketch.to_dict() for col, sketch in self.sketches.items()},
+            'class_sketches': [[col, int(group), sketch.to_dict()]
+                               for (col, group), sketch in self.class_sketches.items()],
+            'target_counts': [[int(value), count] for value, count in self.target_counts.items()],
+            'invalid_values': self.invalid_values,
+            'preview': None if self.preview is None else self.preview.to_dict(orient='split'),
+            'source': self.source
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls(state['columns'], state['numeric'], state['sketch_size'])
+        stats.n_rows = state['n_rows']
+        stats.memory_bytes = state['memory_bytes']
+        stats.discrete = state['discrete']
+        stats.moments = tuple(np.array(m, dtype=np.float64).reshape(len(stats.numeric), -1)
+                              for m in state['moments'])
+        stats.sketches = {col: QuantileSketch.from_dict(s) for col, s in state['sketches'].items()}
+        stats.class_sketches = {(col, group): QuantileSketch.from_dict(s)
+                                for col, group, s in state['class_sketches']}
+        stats.target_counts = {value: count for value, count in state['target_counts']}
+        stats.invalid_values = state['invalid_values']
+        if state['preview'] is not None:
+            preview = state['preview']
+            stats.preview = apply_schema(pd.DataFrame(preview['data'], columns=preview['columns']))
+        stats.source = state['source']
+        return stats
+
+    def save(self, path):
+        """Écrit l'état en JSON (remplacement atomique)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'.{path.name}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """État enregistré par save, ou None s'il est absent, illisible ou d'un autre format"""
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if state.get('format') != STATS_FORMAT:
+            return None
+        return cls.from_dict(state)
+
+
+def stats_path(path):
+    path = Path(path)
+    return (Path(STATS_DIR) if STATS_DIR else path.parent) / f'{path.name}.stats.json'
+
+
+def _tail_hash(path, offset):
+    with open(path, 'rb') as f:
+        f.seek(max(0, offset - TAIL_CHECK_BYTES))
+        return hashlib.sha1(f.read(offset - f.tell())).hexdigest()
+
+
+def _csv_blocks(path, offset, columns, chunk_bytes=CSV_CHUNK_BYTES):
+    """
+    Blocs de lignes complètes d'un CSV à partir de l'octet `offset`
+
+    Produit (DataFrame, offset après le bloc). Une dernière ligne sans fin
+    de ligne est lue comme une ligne complète.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        pending = b''
+        while True:
+            block = f.read(chunk_bytes)
+            data = pending + block
+            cut = data.rfind(b'\n') + 1 if block else len(data)
+            pending = data[cut:]
+            if data[:cut].strip():
+                offset += cut
+                yield pd.read_csv(io.BytesIO(data[:cut]), header=None, names=columns), offset
+            if not block:
+                return
+
+
+def _csv_header(path):
+    with open(path, 'rb') as f:
+        line = f.readline()
+    return line, pd.read_csv(io.BytesIO(line)).columns.tolist()
+
+
+def _update_from_csv(stats, path, columns, offset):
+    """Lit le CSV à partir de `offset` ; retourne (stats, offset de fin)"""
+    for block, offset in _csv_blocks(path, offset, columns):
+        if stats is None:
+            stats = IncrementalStats.from_frame(block)
+        else:
+            stats.update(block)
+    return stats, offset
+
+
+def build_stats(path):
+    """Statistiques de toute la table `path` (CSV lu par blocs, autres formats en une fois)"""
+    path = Path(path)
+    if table_format(path) != 'csv':
+        stats = IncrementalStats.from_frame(read_table(path))
+        stats.source = {'path': str(path), 'fingerprint': file_fingerprint(path)}
+        return stats
+
+    header, columns = _csv_header(path)
+    stats, offset = _update_from_csv(None, path, columns, len(header))
+    if stats is None:
+        stats = IncrementalStats.from_frame(pd.read_csv(path))
+    stats.source = {'path': str(path), 'header': header.decode(), 'offset': offset,
+                    'tail': _tail_hash(path, offset), 'fingerprint': file_fingerprint(path)}
+    return stats
+
+
+def _can_resume(stats, path):
+    """Vrai si le CSV ne diffère de la partie déjà lue que par des lignes ajoutées"""
+    source = stats.source
+    if source.get('path') != str(path) or 'offset' not in source:
+        return False
+    if path.stat().st_size < source['offset']:
+        return False
+    header, _ = _csv_header(path)
+    return header.decode() == source['header'] and _tail_hash(path, source['offset']) == source['tail']
+
+
+def refresh_stats(path=DATA_FILE, rebuild=False):
+    """
+    Statistiques à jour de la table `path` (fichier choisi par find_table)
+
+    Relit l'état enregistré ; pour un CSV auquel des lignes ont été
+    ajoutées, seules ces lignes sont lues. Tout autre changement (ou
+    `rebuild`) provoque un recalcul complet. L'état mis à jour est
+    enregistré ; lève FileNotFoundError si la table n'existe pas.
+    """
+    return _refresh(find_table(path), rebuild)
+
+
+def _refresh(source, rebuild=False):
+    state_file = stats_path(source)
+    stats = None if rebuild else IncrementalStats.load(state_file)
+    fingerprint = file_fingerprint(source)
+    if stats is not None and stats.source.get('fingerprint') == fingerprint:
+        return stats
+
+    if stats is not None and table_format(source) == 'csv' and _can_resume(stats, source):
+        stats, offset = _update_from_csv(stats, source, stats.columns, stats.source['offset'])
+        stats.source.update(offset=offset, tail=_tail_hash(source, offset), fingerprint=fingerprint)
+    else:
+        stats = build_stats(source)
+    try:
+        stats.save(state_file)
+    except OSError as e:
+        logger.warning("Statistiques non enregistrées (%s), recalcul complet au prochain changement", e)
+    return stats
+
+
+def append_rows(data, path=DATA_FILE):
+    """
+    Ajoute des lignes à la fin du CSV `path` et met à jour ses statistiques
+
+    Les colonnes sont réordonnées comme dans le fichier ; seules les
+    nouvelles lignes sont lues pour la mise à jour. Retourne les statistiques.
+    """
+    path = Path(path)
+    _, columns = _csv_header(path)
+    missing = set(columns) - set(data.columns)
+    if missing:
+        raise ValueError(f"Colonnes manquantes: {', '.join(sorted(missing))}")
+    _refresh(path)
+    data[columns].to_csv(path, mode='a', header=False, index=False)
+    return _refresh(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistiques incrémentales du jeu de données")
+    parser.add_argument("--path", default=DATA_FILE, help="Table suivie (défaut: %(default)s)")
+    parser.add_argument("--append", metavar="CSV", help="Lignes à ajouter à la fin de la table (CSV)")
+    parser.add_argument("--rebuild", action="store_true", help="Recalculer sur toute la table")
+    args = parser.parse_args()
+
+    try:
+        if args.append:
+            stats = append_rows(pd.read_csv(args.append), args.path)
+        else:
+            stats = refresh_stats(args.path, rebuild=args.rebuild)
+    except (FileNotFoundError, ValueError) as e:
+        sys.exit(f"❌ {e}")
+    print(f"📊 {stats.n_rows:,} lignes · {stats.source['path']}")
+    print(stats.description().T.to_string(float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Encodage des données patients pour les modèles
+
+Les modèles ont été entraînés sur les 13 colonnes de FEATURE_COLUMNS, dans
+cet ordre, avec les variables catégorielles encodées en entiers (voir le
+notebook d'analyse). Les fichiers de lot suivent le format de
+data/sample_data.csv : colonnes déjà numériques, mais les libellés du
+formulaire de diagnostic sont aussi acceptés. Un code catégoriel absent
+de CATEGORICAL_MAPPINGS (cp=9, thal=5...) est refusé comme une valeur
+manquante.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Ordre des colonnes utilisé à l'entraînement
+FEATURE_COLUMNS = [
+    'age', 'sex', 'cp', 'trestbps', 'chol', 'fbs', 'restecg',
+    'thalach', 'exang', 'oldpeak', 'slope', 'ca', 'thal'
+]
+
+# Libellés du formulaire -> codes d'entraînement
+CATEGORICAL_MAPPINGS = {
+    'sex': {'Masculin': 1, 'Féminin': 0},
+    'cp': {
+        'Angine typique': 0,
+        'Angine atypique': 1,
+        'Douleur non-angineuse': 2,
+        'Asymptomatique': 3
+    },
+    'fbs': {'Oui': 1, 'Non': 0},
+    'restecg': {
+        'Normal': 0,
+        'Anomalie ST-T': 1,
+        'Hypertrophie VG': 2
+    },
+    'exang': {'Oui': 1, 'Non': 0},
+    'slope': {
+        'Montant': 0,
+        'Plat': 1,
+        'Descendant': 2
+    },
+    'thal': {
+        'Normal': 3,
+        'Défaut fixe': 6,
+        'Défaut réversible': 7
+    }
+}
+
+
+# Code utilisé quand un libellé du formulaire est inconnu (cf. prepare_input_data)
+DEFAULT_CODES = {'thal': 3}
+
+
+class FeatureEncoder:
+    """
+    Encodeur réutilisable des données patients
+
+    Les correspondances libellé -> code sont précalculées une fois à la
+    construction (index de libellés et tableaux de codes). L'encodage écrit
+    directement dans une matrice float32 (n_lignes, 13) dans l'ordre de
+    FEATURE_COLUMNS, sans construire de DataFrame.
+    """
+
+    def __init__(self, columns=FEATURE_COLUMNS, mappings=CATEGORICAL_MAPPINGS):
+        self.columns = list(columns)
+        self.n_features = len(self.columns)
+
+        # Recherche vectorisée : position du libellé dans l'index -> code
+        self._label_index = {}
+        self._label_codes = {}
+        # Recherche scalaire pour l'encodage d'un seul patient
+        self._record_lookup = []
+        for col in self.columns:
+            mapping = mappings.get(col)
+            if mapping is None:
+                self._record_lookup.append(None)
+                continue
+            self._label_index[col] = pd.Index(list(mapping.keys()))
+            self._label_codes[col] = np.fromiter(mapping.values(), dtype=np.float32, count=len(mapping))
+            self._record_lookup.append(
+                ({label: float(code) for label, code in mapping.items()}, float(DEFAULT_CODES.get(col, 0)))
+            )
+
+    def encode_record(self, record, out=None):
+        """
+        Encode un patient (dict par colonne ou valeurs dans l'ordre de FEATURE_COLUMNS)
+
+        Les libellés inconnus prennent le code par défaut, comme dans le
+        formulaire de diagnostic. Retourne une matrice (1, 13) ; `out` permet
+        de fournir une matrice préallouée.
+        """
+        if out is None:
+            out = np.empty((1, self.n_features), dtype=np.float32)
+        row = out[0]
+
+        if isinstance(record, dict):
+            record = [record[col] for col in self.columns]
+
+        for j, (value, lookup) in enumerate(zip(record, self._record_lookup)):
+            if lookup is not None and isinstance(value, str):
+                labels, default = lookup
+                value = labels.get(value, default)
+            row[j] = value
+        return out
+
+    def encode_batch(self, data, out=None):
+        """
+        Encode un lot de patients colonne par colonne
+
+        `data` est un DataFrame ou un dict de colonnes ; les colonnes
+        supplémentaires (identifiant, target...) sont ignorées. Les colonnes
+        catégorielles peuvent contenir des codes ou des libellés du
+        formulaire. Lève ValueError si une colonne manque, si des valeurs
+        ne peuvent pas être encodées ou si un code catégoriel n'est pas admis.
+        """
+        missing = [col for col in self.columns if col not in data]
+        if missing:
+            raise ValueError(f"Colonnes manquantes: {', '.join(missing)}")
+
+        n_rows = len(data[self.columns[0]])
+        if out is None:
+            out = np.empty((n_rows, self.n_features), dtype=np.float32)
+
+        invalid = []
+        for j, col in enumerate(self.columns):
+            values = np.asarray(data[col])
+            if values.dtype.kind in 'biuf':
+                out[:, j] = self._check_codes(col, values)
+            else:
+                out[:, j] = self._encode_labels(col, values)
+            if np.isnan(out[:, j]).any():
+                invalid.append(col)
+
+        if invalid:
+            raise ValueError(f"Valeurs invalides, non admises ou manquantes dans: {', '.join(invalid)}")
+
+        return out
+
+    def _encode_labels(self, col, values):
+        """
+        Encode une colonne non numérique (libellés et/ou codes en texte)
+        """
+        if col not in self._label_index:
+            return pd.to_numeric(values, errors='coerce').astype(np.float32)
+
+        positions = self._label_index[col].get_indexer(values)
+        encoded = self._label_codes[col][positions]
+        unmatched = positions < 0
+        if unmatched.any():
+            # Codes numériques écrits en texte ; le reste devient NaN
+            encoded[unmatched] = self._check_codes(col, pd.to_numeric(values[unmatched], errors='coerce'))
+        return encoded
+
+    def _check_codes(self, col, values):
+        """
+        Codes d'une colonne numérique, NaN pour ceux que la variable n'admet pas
+        """
+        if col not in self._label_codes:
+            return values
+        values = np.asarray(values, dtype=np.float32)
+        return np.where(np.isin(values, self._label_codes[col]), values, np.float32(np.nan))
+
+
+def encode_batch(data):
+    """
+    Encode un lot de patients avec l'encodeur par défaut
+
+    Raccourci vers FeatureEncoder.encode_batch, retourne une matrice float32
+    dans l'ordre de FEATURE_COLUMNS.
+    """
+    return _DEFAULT_ENCODER.encode_batch(data)
+
+
+_DEFAULT_ENCODER = FeatureEncoder()
@@ -0,0 +1,192 @@
+"""
+Stockage colonnaire des jeux de données (Parquet, Arrow IPC)
+
+Les tables sont écrites avec des types compacts (int8 pour les codes
+catégoriels et la cible, float32 pour les mesures) et relues en ne
+chargeant que les colonnes demandées. Les fichiers CSV restent lisibles :
+load_table utilise la copie colonnaire voisine (même nom, extension
+.parquet ou .arrow) si elle est à jour, et convert_csv la produit
+(python start.py --convert-data).
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Codes catégoriels et cible (quelques valeurs entières)
+CATEGORICAL_COLUMNS = ['sex', 'cp', 'fbs', 'restecg', 'exang', 'slope', 'ca', 'thal', 'target']
+
+# Mesures cliniques
+MEASUREMENT_COLUMNS = ['age', 'trestbps', 'chol', 'thalach', 'oldpeak']
+
+COLUMN_DTYPES = {
+    **{col: np.int8 for col in CATEGORICAL_COLUMNS},
+    **{col: np.float32 for col in MEASUREMENT_COLUMNS}
+}
+
+# Formats reconnus, par ordre de préférence à la lecture
+FORMATS = {'.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow', '.csv': 'csv'}
+
+
+def apply_schema(data):
+    """
+    Convertit les colonnes vers leurs types compacts
+
+    Codes connus en int8 et mesures en float32 ; un code avec des valeurs
+    manquantes ou hors de l'intervalle int8 passe en float32. Les colonnes
+    de libellés (texte peu varié) deviennent des 'category'.
+    """
+    dtypes = {}
+    for col in data.columns:
+        dtype = COLUMN_DTYPES.get(col)
+        if not pd.api.types.is_numeric_dtype(data[col]):
+            if is_label_column(data[col]):
+                dtypes[col] = 'category'
+            continue
+        if dtype is None:
+            continue
+        if dtype is np.int8:
+            values = data[col]
+            info = np.iinfo(np.int8)
+            fits = not values.isna().any() and info.min <= values.min() and values.max() <= info.max
+            if fits and values.dtype.kind == 'f':
+                fits = bool((values == np.floor(values)).all())
+            if not fits:
+                dtype = np.float32
+        if data[col].dtype != dtype:
+            dtypes[col] = dtype
+    return data.astype(dtypes) if dtypes else data
+
+
+def is_label_column(values):
+    """Colonne de texte dont au plus la moitié des valeurs sont distinctes"""
+    if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        return False
+    return values.nunique() <= max(1, len(values) // 2)
+
+
+def read_only(data):
+    """
+    Copie de `data` dont les colonnes numériques ne sont pas modifiables
+
+    Pour les tables partagées entre sessions (st.cache_resource) : une
+    écriture accidentelle lève une erreur au lieu de modifier les données
+    des autres utilisateurs.
+    """
+    columns = {}
+    for col in data.columns:
+        if pd.api.types.is_numeric_dtype(data[col]) and not isinstance(data[col].dtype, pd.CategoricalDtype):
+            values = np.array(data[col].to_numpy(), copy=True)
+            values.flags.writeable = False
+            columns[col] = values
+        else:
+            columns[col] = data[col]
+    return pd.DataFrame(columns, index=data.index, copy=False)
+
+
+def memory_usage(data):
+    """Mémoire occupée par `data` en octets (texte et catégories compris)"""
+    return int(data.memory_usage(deep=True).sum())
+
+
+def table_format(path):
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Format non supporté: {suffix} (attendu: {', '.join(FORMATS)})")
+    return FORMATS[suffix]
+
+
+def write_table(data, path):
+    """
+    Écrit `data` (types compacts) au format donné par l'extension de `path`
+
+    Le fichier est remplacé atomiquement. Arrow IPC est écrit sans
+    compression pour pouvoir être relu en mémoire mappée.
+    """
+    path = Path(path)
+    fmt = table_format(path)
+    data = apply_schema(data.to_frame() if isinstance(data, pd.Series) else data)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    if fmt == 'parquet':
+        data.to_parquet(tmp_path, index=False)
+    elif fmt == 'arrow':
+        data.reset_index(drop=True).to_feather(tmp_path, compression='uncompressed')
+    else:
+        data.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_table(path, columns=None):
+    """
+    Lit une table Parquet, Arrow IPC ou CSV, limitée à `columns` si fourni
+    """
+    fmt = table_format(path)
+    if fmt == 'parquet':
+        data = pd.read_parquet(path, columns=columns)
+    elif fmt == 'arrow':
+        import pyarrow.feather as feather
+
+        data = feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+    else:
+        data = pd.read_csv(path, usecols=columns)
+        if columns is not None:
+            data = data[list(columns)]
+    return apply_schema(data)
+
+
+def find_table(path):
+    """
+    Fichier à lire pour `path`
+
+    Pour un CSV (ou un chemin sans extension), la copie colonnaire voisine
+    est préférée si elle n'est pas plus ancienne ; un fichier Parquet ou
+    Arrow demandé explicitement est lu tel quel. Lève FileNotFoundError si
+    aucun fichier ne correspond.
+    """
+    path = Path(path)
+    requested = path if path.suffix.lower() in FORMATS else None
+    if requested is not None and FORMATS[path.suffix.lower()] != 'csv':
+        if not path.exists():
+            raise FileNotFoundError(f"Table introuvable: {path}")
+        return path
+    base = path.with_suffix('') if requested is not None else path
+    requested_mtime = requested.stat().st_mtime_ns if requested is not None and requested.exists() else None
+
+    for suffix in FORMATS:
+        candidate = base.with_suffix(suffix)
+        if candidate == requested or not candidate.exists():
+            continue
+        if requested_mtime is None or candidate.stat().st_mtime_ns >= requested_mtime:
+            return candidate
+    if requested_mtime is not None:
+        return requested
+    raise FileNotFoundError(f"Table introuvable: {path}")
+
+
+def load_table(path, columns=None):
+    """read_table sur le fichier choisi par find_table"""
+    return read_table(find_table(path), columns=columns)
+
+
+def convert_csv(csv_path, output_path=None):
+    """
+    Convertit un CSV en Parquet (par défaut à côté du fichier d'origine)
+    """
+    csv_path = Path(csv_path)
+    output_path = Path(output_path) if output_path else csv_path.with_suffix('.parquet')
+    return write_table(read_table(csv_path), output_path)
+
+
+def convert_directory(directory, output_suffix='.parquet'):
+    """
+    Convertit tous les CSV de `directory` ; retourne la liste des fichiers écrits
+    """
+    written = []
+    for csv_path in sorted(Path(directory).glob('*.csv')):
+        written.append(convert_csv(csv_path, csv_path.with_suffix(output_suffix)))
+    return written
@@ -0,0 +1,77 @@
+"""
+Statistiques précalculées du jeu de données pour les pages de visualisation
+
+Les histogrammes, boîtes à moustaches par classe, corrélations et
+statistiques descriptives sont tenus à jour par IncrementalStats (voir
+src/data/incremental.py) et remis aux pages sous forme de DatasetSummary.
+Au-delà de AGGREGATION_THRESHOLD lignes, les figures Plotly sont
+construites à partir de ces agrégats (effectifs, quartiles, moustaches et
+échantillon des valeurs aberrantes) : leur taille ne dépend plus du nombre
+de lignes. En dessous, les colonnes brutes sont conservées pour des
+graphiques exacts.
+"""
+
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.utils.config import env_int
+
+# Variables continues comparées entre les classes de la cible
+BIVARIATE_COLUMNS = ['age', 'trestbps', 'chol', 'thalach', 'oldpeak']
+
+# Nombre maximal d'histogrammes de la page Visualisations
+MAX_HISTOGRAMS = 12
+
+# Nombre de classes des histogrammes de variables continues
+HISTOGRAM_BINS = 30
+
+# En dessous de cette étendue, une variable entière a une barre par valeur
+MAX_DISCRETE_VALUES = 30
+
+# Nombre de lignes conservées pour l'aperçu des données brutes
+PREVIEW_ROWS = 20
+
+# Au-delà de ce nombre de lignes, les graphiques reçoivent des agrégats
+AGGREGATION_THRESHOLD = env_int('VIZ_AGGREGATION_THRESHOLD', 50000)
+
+# Nombre maximal de valeurs aberrantes affichées par boîte
+MAX_OUTLIERS = 200
+
+
+@dataclass
+class DatasetSummary:
+    """
+    Agrégats d'un jeu de données, indépendants de son nombre de lignes
+
+    `histograms` : {colonne: {'x', 'width', 'count'}} (centre, largeur et
+    effectif de chaque barre) ; `boxes` : statistiques par classe de la
+    cible (index (colonne, classe)) ou None sans colonne 'target' ; `raw` :
+    colonnes tracées, seulement si le jeu ne dépasse pas le seuil
+    d'agrégation ; `memory_bytes` : mémoire du DataFrame résumé ;
+    `invalid_values` : valeurs hors domaine par colonne (voir validate_ranges).
+    """
+    n_rows: int
+    columns: list
+    histograms: dict
+    boxes: pd.DataFrame
+    correlation: pd.DataFrame
+    description: pd.DataFrame
+    target_counts: pd.Series
+    preview: pd.DataFrame
+    raw: pd.DataFrame = None
+    memory_bytes: int = 0
+    invalid_values: dict = None
+
+    @property
+    def aggregated(self):
+        return self.raw is None
+
+
+def plotted_columns(columns, numeric_columns):
+    """Colonnes brutes conservées pour des graphiques exacts (histogrammes, boîtes, cible)"""
+    histogram_cols = list(numeric_columns[:MAX_HISTOGRAMS])
+    return [
+        col for col in dict.fromkeys(histogram_cols + BIVARIATE_COLUMNS + ['target'])
+        if col in columns
+    ]
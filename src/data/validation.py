@@ -0,0 +1,60 @@
+"""
+Domaines de valeurs des variables patients
+
+Les bornes des mesures sont celles du formulaire de diagnostic (et des
+schémas de l'API) ; les codes catégoriels admis sont ceux de
+CATEGORICAL_MAPPINGS. Un jeu de données chargé est contrôlé contre ces
+domaines : les valeurs hors domaine sont comptées et signalées, pas
+supprimées.
+"""
+
+import numpy as np
+
+from src.data.preprocessing import CATEGORICAL_MAPPINGS
+
+# Bornes (incluses) des mesures du formulaire de diagnostic
+MEASUREMENT_RANGES = {
+    'age': (1, 120),
+    'trestbps': (80, 250),
+    'chol': (100, 600),
+    'thalach': (60, 250),
+    'oldpeak': (0, 10),
+    'ca': (0, 4)
+}
+
+# Codes admis des variables catégorielles et de la cible
+ALLOWED_CODES = {
+    **{col: sorted(set(mapping.values())) for col, mapping in CATEGORICAL_MAPPINGS.items()},
+    'target': [0, 1]
+}
+
+
+def invalid_mask(values, col):
+    """
+    Masque des valeurs de `col` hors de leur domaine (None si la colonne n'en a pas)
+
+    Les valeurs manquantes ne sont pas comptées comme hors domaine.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind not in 'iufb':
+        return None
+    if col in MEASUREMENT_RANGES:
+        low, high = MEASUREMENT_RANGES[col]
+        return (values < low) | (values > high)
+    if col in ALLOWED_CODES:
+        present = ~np.isnan(values) if values.dtype.kind == 'f' else True
+        return ~np.isin(values, ALLOWED_CODES[col]) & present
+    return None
+
+
+def validate_ranges(data):
+    """
+    Nombre de valeurs hors domaine par colonne ({colonne: nombre}, colonnes
+    conformes omises)
+    """
+    invalid = {}
+    for col in data.columns:
+        mask = invalid_mask(data[col].to_numpy(), col)
+        if mask is not None and mask.any():
+            invalid[col] = int(mask.sum())
+    return invalid
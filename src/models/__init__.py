@@ -0,0 +1,3 @@
+"""
+Chargement des modèles et inférence
+"""
@@ -0,0 +1,423 @@
+"""
+Journal d'audit des diagnostics
+
+Chaque diagnostic (API, page Diagnostic) produit un enregistrement :
+variables encodées du patient, probabilité de chaque modèle, diagnostic
+principal, confiance, niveau de risque et version de chaque modèle.
+AuditLog les place dans une file en mémoire bornée ; un thread d'écriture
+les regroupe par lots (AUDIT_BATCH_SIZE enregistrements ou
+AUDIT_FLUSH_INTERVAL secondes) et les insère en une transaction : le
+chemin de la requête ne touche jamais la base.
+
+Deux backends :
+- SQLiteBackend : fichier local (logs/audit.db par défaut), sans service ;
+- PostgresBackend : service postgres de docker-compose, utilisé si
+  AUDIT_DATABASE_URL (ou DATABASE_URL) est une URL postgresql://.
+
+Chaque lot est d'abord ajouté au fichier de reprise AUDIT_SPOOL (JSON, une
+ligne par enregistrement), vidé une fois le lot inséré. Après un arrêt
+brutal ou une base injoignable, les enregistrements restés dans ce
+fichier sont réinsérés au démarrage suivant ou à la tentative suivante ;
+l'identifiant de chaque enregistrement évite les doublons. File pleine
+(contre-pression) ou fichier de reprise trop gros : l'enregistrement est
+rejeté et compté (audit_dropped), jamais la requête.
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from src.data.preprocessing import FEATURE_COLUMNS
+from src.models.prediction import risk_levels
+from src.utils.config import env_bool, env_float, env_int, env_str
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+AUDIT_ENABLED = env_bool('MEDICAL_AUDIT_ENABLED', True)
+
+LOG_DIR = Path(env_str('LOG_DIR', 'logs'))
+
+# Base d'audit : postgresql://... ou sqlite:///chemin (défaut : LOG_DIR/audit.db)
+AUDIT_DATABASE_URL = env_str('AUDIT_DATABASE_URL') or env_str('DATABASE_URL') or f'sqlite:///{LOG_DIR / "audit.db"}'
+
+# Fichier de reprise des lots non insérés
+AUDIT_SPOOL = env_str('AUDIT_SPOOL', str(LOG_DIR / 'audit.spool.jsonl'))
+
+# Taille maximale du fichier de reprise (base injoignable)
+AUDIT_SPOOL_MAX_MB = env_float('AUDIT_SPOOL_MAX_MB', 100.0)
+
+# Enregistrements en attente au plus ; au-delà, contre-pression puis rejet
+AUDIT_QUEUE_SIZE = env_int('AUDIT_QUEUE_SIZE', 10000)
+
+# Attente maximale d'une place dans la file (secondes, 0 : rejet immédiat)
+AUDIT_PUT_TIMEOUT = env_float('AUDIT_PUT_TIMEOUT', 0.0)
+
+# Un lot est écrit dès AUDIT_BATCH_SIZE enregistrements ou après AUDIT_FLUSH_INTERVAL secondes
+AUDIT_BATCH_SIZE = env_int('AUDIT_BATCH_SIZE', 500)
+AUDIT_FLUSH_INTERVAL = env_float('AUDIT_FLUSH_INTERVAL', 1.0)
+
+# Délai maximal entre deux tentatives quand la base est injoignable (secondes)
+MAX_RETRY_INTERVAL = 60.0
+
+TABLE = 'prediction_audit'
+
+COLUMNS = ['id', 'created_at', 'source', 'features', 'probabilities', 'main_model', 'probability',
+           'prediction', 'confidence', 'risk_level', 'escalated', 'model_versions']
+
+# Colonnes JSON (texte en SQLite, jsonb en PostgreSQL)
+JSON_COLUMNS = {'features', 'probabilities', 'model_versions'}
+
+
+def _finite(value):
+    return float(value) if np.isfinite(value) else None
+
+
+def audit_records(features, result, source, model_versions=None):
+    """
+    Enregistrements d'audit d'un EnsembleResult, un par ligne de `features`
+
+    `features` est la matrice encodée (ordre de FEATURE_COLUMNS) ;
+    `model_versions` ({modèle: version}, voir ModelRegistry.versions) est
+    restreint aux modèles du résultat. Les probabilités des modèles non
+    évalués (cascade) sont omises.
+    """
+    features = np.asarray(features, dtype=np.float64)
+    main_probability = result.main_probability
+    predictions = result.main_prediction
+    confidence = result.confidence
+    levels = risk_levels(main_probability)
+    escalated = result.escalated
+    versions = {name: (model_versions or {}).get(name) for name in result.model_names}
+    created_at = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+
+    return [
+        {
+            'id': uuid.uuid4().hex,
+            'created_at': created_at,
+            'source': source,
+            'features': {col: _finite(value) for col, value in zip(FEATURE_COLUMNS, features[i])},
+            'probabilities': result.probabilities_by_model(i),
+            'main_model': result.main_model,
+            'probability': _finite(main_probability[i]),
+            'prediction': int(predictions[i]),
+            'confidence': _finite(confidence[i]),
+            'risk_level': str(levels[i]),
+            'escalated': None if escalated is None else bool(escalated[i]),
+            'model_versions': versions
+        }
+        for i in range(len(main_probability))
+    ]
+
+
+class SQLiteBackend:
+    """
+    Table d'audit dans un fichier SQLite (insertion groupée par executemany)
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Utilisée par le thread d'écriture et, pour count, par les pages
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(f'''
+                CREATE TABLE IF NOT EXISTS {TABLE} (
+                    id TEXT PRIMARY KEY, created_at TEXT NOT NULL, source TEXT,
+                    features TEXT, probabilities TEXT, main_model TEXT, probability REAL,
+                    prediction INTEGER, confidence REAL, risk_level TEXT, escalated INTEGER,
+                    model_versions TEXT
+                )''')
+
+    def insert_many(self, records):
+        rows = [
+            tuple(json.dumps(record[col]) if col in JSON_COLUMNS else record[col] for col in COLUMNS)
+            for record in records
+        ]
+        placeholders = ', '.join('?' for _ in COLUMNS)
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f'INSERT OR IGNORE INTO {TABLE} ({", ".join(COLUMNS)}) VALUES ({placeholders})', rows)
+
+    def count(self):
+        with self._lock:
+            return self._connection.execute(f'SELECT COUNT(*) FROM {TABLE}').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class PostgresBackend:
+    """
+    Table d'audit PostgreSQL (psycopg2, insertion groupée par execute_values)
+    """
+
+    name = 'postgresql'
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._lock = threading.Lock()
+        with self._lock, self._connection, self._connection.cursor() as cursor:
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {TABLE} (
+                    id TEXT PRIMARY KEY, created_at TIMESTAMPTZ NOT NULL, source TEXT,
+                    features JSONB, probabilities JSONB, main_model TEXT, probability DOUBLE PRECISION,
+                    prediction SMALLINT, confidence DOUBLE PRECISION, risk_level TEXT, escalated BOOLEAN,
+                    model_versions JSONB
+                )''')
+
+    @classmethod
+    def from_url(cls, url):
+        import psycopg2
+
+        return cls(psycopg2.connect(url, connect_timeout=5))
+
+    def insert_many(self, records):
+        from psycopg2.extras import Json, execute_values
+
+        rows = [
+            tuple(Json(record[col]) if col in JSON_COLUMNS else record[col] for col in COLUMNS)
+            for record in records
+        ]
+        with self._lock, self._connection, self._connection.cursor() as cursor:
+            execute_values(cursor, f'INSERT INTO {TABLE} ({", ".join(COLUMNS)}) VALUES %s '
+                                   'ON CONFLICT (id) DO NOTHING', rows, page_size=len(rows))
+
+    def count(self):
+        with self._lock, self._connection, self._connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {TABLE}')
+            return cursor.fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def create_audit_backend(url=AUDIT_DATABASE_URL):
+    """
+    PostgresBackend pour une URL postgresql://, SQLiteBackend pour sqlite:///chemin
+
+    Si PostgreSQL est injoignable, repli sur SQLite (LOG_DIR/audit.db).
+    """
+    if url.startswith(('postgresql://', 'postgres://')):
+        try:
+            return PostgresBackend.from_url(url)
+        except Exception as e:
+            logger.warning("PostgreSQL indisponible (%s), audit dans SQLite", e)
+            url = f'sqlite:///{LOG_DIR / "audit.db"}'
+    if not url.startswith('sqlite:///'):
+        raise ValueError(f"URL d'audit non supportée: {url}")
+    return SQLiteBackend(url[len('sqlite:///'):])
+
+
+class AuditLog:
+    """
+    File d'enregistrements d'audit écrite par lots dans un thread dédié
+
+    `submit` ne bloque au plus que AUDIT_PUT_TIMEOUT secondes (file
+    pleine) et ne lève jamais ; `flush` attend l'écriture de tout ce qui a
+    été soumis, `close` vide la file puis arrête le thread. `stats` donne
+    les effectifs soumis, écrits, rejetés et en attente.
+    """
+
+    def __init__(self, backend, spool_path=AUDIT_SPOOL, queue_size=AUDIT_QUEUE_SIZE,
+                 batch_size=AUDIT_BATCH_SIZE, flush_interval=AUDIT_FLUSH_INTERVAL,
+                 put_timeout=AUDIT_PUT_TIMEOUT, spool_max_mb=AUDIT_SPOOL_MAX_MB):
+        self.backend = backend
+        self.spool_path = Path(spool_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.spool_max_bytes = int(spool_max_mb * 2**20)
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.replayed = 0
+        self.batches = 0
+        self.failures = 0
+        self.last_error = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closing = threading.Event()
+        self._idle = threading.Condition()
+        self._in_flight = 0
+        self._retry_at = 0.0
+        self._retry_interval = flush_interval
+        self._pending = []
+        self._thread = None
+
+    def start(self):
+        """Démarre le thread d'écriture (réinsère d'abord le fichier de reprise)"""
+        if self._thread is None:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, records):
+        """Met `records` en file ; retourne le nombre accepté (le reste est rejeté et compté)"""
+        accepted = 0
+        for record in records:
+            try:
+                if self.put_timeout > 0:
+                    self._queue.put(record, timeout=self.put_timeout)
+                else:
+                    self._queue.put_nowait(record)
+            except queue.Full:
+                break
+            accepted += 1
+        self.submitted += accepted
+        self._count_dropped(len(records) - accepted, 'queue_full')
+        return accepted
+
+    def flush(self, timeout=None):
+        """Attend l'écriture (ou la mise en reprise) de tous les enregistrements soumis"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining if remaining is not None else 0.1)
+        return True
+
+    def close(self, timeout=10.0):
+        self._closing.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.backend.close()
+
+    def stats(self):
+        return {
+            'backend': self.backend.name,
+            'soumis': self.submitted,
+            'ecrits': self.written,
+            'rejetes': self.dropped,
+            'en_attente': self._queue.qsize(),
+            'en_reprise': len(self._pending),
+            'reprises_au_demarrage': self.replayed,
+            'lots': self.batches,
+            'echecs': self.failures,
+            'derniere_erreur': self.last_error
+        }
+
+    def _count_dropped(self, count, reason):
+        if count:
+            self.dropped += count
+            metrics.increment('audit_dropped', count, reason=reason)
+
+    def _spool_size(self):
+        try:
+            return self.spool_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _next_batch(self):
+        """Jusqu'à batch_size enregistrements, en attendant au plus flush_interval"""
+        deadline = time.monotonic() + self.flush_interval
+        batch = []
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=max(remaining, 0)) if remaining > 0
+                             else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _append_spool(self, batch):
+        """Ajoute le lot au fichier de reprise ; False s'il dépasse la taille maximale"""
+        if self._spool_size() > self.spool_max_bytes:
+            return False
+        with open(self.spool_path, 'a') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in batch))
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending.extend(batch)
+        return True
+
+    def _read_spool(self):
+        records = []
+        try:
+            with open(self.spool_path) as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # Ligne tronquée par un arrêt brutal pendant l'écriture
+                        continue
+        except FileNotFoundError:
+            pass
+        return records
+
+    def _write_pending(self):
+        """Insère les enregistrements du fichier de reprise par lots puis le vide ; nombre écrit"""
+        try:
+            with metrics.span('audit_flush', backend=self.backend.name):
+                for start in range(0, len(self._pending), self.batch_size):
+                    self.backend.insert_many(self._pending[start:start + self.batch_size])
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            metrics.increment('errors', component='audit')
+            logger.warning("Audit : écriture en échec (%s), nouvel essai dans %.1f s", e, self._retry_interval)
+            self._retry_at = time.monotonic() + self._retry_interval
+            self._retry_interval = min(self._retry_interval * 2, MAX_RETRY_INTERVAL)
+            return 0
+        written = len(self._pending)
+        self._pending = []
+        self.spool_path.unlink(missing_ok=True)
+        self._retry_interval = self.flush_interval
+        self.batches += 1
+        self.written += written
+        metrics.increment('audit_written', written)
+        return written
+
+    def _run(self):
+        self._pending = self._read_spool()
+        if self._pending:
+            self.replayed = len(self._pending)
+            logger.info("Audit : reprise de %d enregistrements non écrits", self.replayed)
+
+        while not (self._closing.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch and not self._append_spool(batch):
+                self._count_dropped(len(batch), 'spool_full')
+            if self._pending and time.monotonic() >= self._retry_at:
+                self._write_pending()
+            for _ in batch:
+                self._queue.task_done()
+            with self._idle:
+                self._idle.notify_all()
+
+        # Dernière tentative à l'arrêt (reprise pas encore écrite, délai de nouvel
+        # essai en cours) ; en cas d'échec, le fichier de reprise reste pour le démarrage suivant
+        if self._pending:
+            self._write_pending()
+
+
+def start_audit_log(enabled=AUDIT_ENABLED):
+    """
+    AuditLog démarré sur create_audit_backend(), ou None si l'audit est
+    désactivé (MEDICAL_AUDIT_ENABLED=false) ou sa base inutilisable
+    """
+    if not enabled:
+        return None
+    try:
+        return AuditLog(create_audit_backend()).start()
+    except Exception as e:
+        logger.warning("Journal d'audit indisponible (%s)", e)
+        return None
@@ -0,0 +1,234 @@
+"""
+Cache des prédictions
+
+La clé d'une prédiction est l'empreinte du vecteur de variables encodé
+(float32, ordre de FEATURE_COLUMNS) et de la version des modèles (voir
+ModelRegistry.version) : un même patient re-soumis, ou un doublon dans un
+lot, ne repasse pas par les modèles. La valeur est la ligne de
+probabilités de tous les modèles.
+
+Deux backends :
+- MemoryBackend : LRU borné avec expiration (TTL), local au processus ;
+- RedisBackend : partagé entre réplicas (service redis de docker-compose),
+  utilisé si REDIS_URL est défini et joignable, sinon repli sur la mémoire.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from src.models.ensemble import EnsembleResult
+from src.utils.config import env_int, env_str
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal d'entrées du cache local
+DEFAULT_MAX_ENTRIES = env_int('PREDICTION_CACHE_SIZE', 10000)
+
+# Durée de vie des entrées (secondes)
+DEFAULT_TTL = env_int('CACHE_TTL', 3600)
+
+# Préfixe des clés Redis
+DEFAULT_PREFIX = env_str('CACHE_PREFIX', 'heart_disease:')
+
+
+class MemoryBackend:
+    """
+    LRU borné avec expiration, protégé par un verrou
+    """
+
+    name = 'mémoire'
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None or entry[0] < now:
+                    if entry is not None:
+                        del self._entries[key]
+                    values.append(None)
+                    continue
+                self._entries.move_to_end(key)
+                values.append(entry[1])
+        return values
+
+    def set_many(self, items):
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = (expires, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Backend Redis (MGET / SET EX en pipeline), partagé entre réplicas
+    """
+
+    name = 'redis'
+
+    def __init__(self, client, ttl=DEFAULT_TTL, prefix=DEFAULT_PREFIX):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = f'{prefix}prediction:'
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        import redis
+
+        client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        client.ping()
+        return cls(client, **kwargs)
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        return self.client.mget([self.prefix + key for key in keys])
+
+    def set_many(self, items):
+        pipeline = self.client.pipeline(transaction=False)
+        for key, value in items:
+            pipeline.set(self.prefix + key, value, ex=self.ttl)
+        pipeline.execute()
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(match=self.prefix + '*', count=1000))
+
+
+def create_backend(redis_url=None):
+    """
+    Backend Redis si `redis_url` (ou REDIS_URL) est joignable, sinon mémoire
+    """
+    redis_url = redis_url or env_str('REDIS_URL')
+    if redis_url:
+        try:
+            return RedisBackend.from_url(redis_url)
+        except Exception as e:
+            logger.warning("Redis indisponible (%s), cache des prédictions en mémoire", e)
+    return MemoryBackend()
+
+
+class PredictionCache:
+    """
+    Probabilités par modèle, indexées par vecteur encodé, version et liste des modèles
+
+    `model_names` fixe l'ordre des colonnes stockées (un sous-ensemble des
+    modèles, comme l'étage d'escalade d'une cascade, a ses propres clés) ; les compteurs
+    `hits` et `misses` portent sur les patients distincts consultés.
+    """
+
+    def __init__(self, backend, model_names, version=''):
+        self.backend = backend
+        self.model_names = list(model_names)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def keys(self, rows):
+        """Clé de chaque ligne d'une matrice float32 canonique"""
+        prefix = f"{self.version}:{','.join(self.model_names)}:".encode()
+        return [hashlib.blake2b(prefix + row.tobytes(), digest_size=16).hexdigest() for row in rows]
+
+    def get_many(self, keys):
+        values = self.backend.get_many(keys)
+        probabilities = [
+            None if value is None else np.frombuffer(value, dtype=np.float64)
+            for value in values
+        ]
+        found = sum(p is not None for p in probabilities)
+        with self._lock:
+            self.hits += found
+            self.misses += len(keys) - found
+        metrics.increment('cache_hits', found, backend=self.backend.name)
+        metrics.increment('cache_misses', len(keys) - found, backend=self.backend.name)
+        return probabilities
+
+    def set_many(self, keys, probabilities):
+        self.backend.set_many(
+            (key, np.ascontiguousarray(row, dtype=np.float64).tobytes())
+            for key, row in zip(keys, probabilities)
+        )
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.backend.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'taux': self.hits / lookups if lookups else 0.0
+        }
+
+
+def canonicalize(features):
+    """Matrice float32 contiguë, -0.0 remplacé par 0.0"""
+    return np.ascontiguousarray(features, dtype=np.float32) + np.float32(0.0)
+
+
+class CachedPredictor:
+    """
+    EnsemblePredictor précédé du cache et d'un dédoublonnage des lignes
+
+    Les lignes identiques d'un lot ne sont évaluées qu'une fois ; seules les
+    lignes absentes du cache sont envoyées aux modèles, en un seul appel. Un
+    résultat partiel (modèle en échec) n'est pas mis en cache ; il est
+    complété par les lignes déjà en cache, réduites aux modèles qui ont
+    répondu, sans second passage par les modèles.
+    """
+
+    def __init__(self, predictor, cache):
+        self.predictor = predictor
+        self.cache = cache
+        self.models = predictor.models
+
+    def predict(self, features, strict=False):
+        features = canonicalize(features)
+        if not len(features):
+            return self.predictor.predict(features, strict=strict)
+
+        rows = features.view(np.dtype((np.void, features.strides[0]))).ravel()
+        _, first_index, inverse = np.unique(rows, return_index=True, return_inverse=True)
+        unique_features = features[first_index]
+
+        keys = self.cache.keys(unique_features)
+        cached = self.cache.get_many(keys)
+        missing = [i for i, value in enumerate(cached) if value is None]
+
+        names = self.cache.model_names
+        main_model = self.predictor.main_model if self.predictor.main_model in names else names[0]
+        errors = {}
+        timings = {}
+        if missing:
+            computed = self.predictor.predict(unique_features[missing], strict=strict)
+            errors, timings = computed.errors, computed.timings
+            if computed.errors or computed.model_names != names:
+                # Ensemble incomplet : rien n'est mis en cache ; les lignes déjà en
+                # cache sont restreintes aux modèles qui ont répondu
+                columns = [names.index(name) for name in computed.model_names]
+                cached = [None if row is None else row[columns] for row in cached]
+                names, main_model = computed.model_names, computed.main_model
+            else:
+                self.cache.set_many([keys[i] for i in missing], computed.probabilities)
+            for i, row in zip(missing, computed.probabilities):
+                cached[i] = row
+
+        probabilities = np.vstack(cached)[inverse.ravel()]
+        return EnsembleResult(names, probabilities, main_model, errors, timings)
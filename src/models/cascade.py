@@ -0,0 +1,246 @@
+"""
+Inférence en cascade : un modèle léger d'abord, l'ensemble complet si besoin
+
+Le premier étage (régression logistique par défaut) évalue chaque patient.
+Seuls ceux dont la probabilité tombe à moins de CASCADE_BAND d'un seuil
+de risque (modéré 0.3, élevé 0.7) passent par les modèles lourds
+(CatBoost, XGBoost, Random Forest) ; pour les autres, le diagnostic est
+celui du premier étage. Avec CASCADE_DECISION_THRESHOLD, le seuil de
+classe 0.5 s'y ajoute : avec la bande par défaut, les deux bandes se
+rejoignent alors sur (0.2, 0.8). Une ligne escaladée reçoit exactement le
+résultat de l'ensemble complet.
+
+Le taux d'escalade est compté dans les métriques (cascade_rows,
+cascade_escalated). L'évaluation hors ligne compare la cascade à
+l'ensemble complet pour plusieurs largeurs de bande :
+
+    python -m src.models.cascade
+    python -m src.models.cascade --data data/processed/X_test --labels data/processed/y_test
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data.preprocessing import FEATURE_COLUMNS, encode_batch
+from src.data.storage import load_table
+from src.models.cache import CachedPredictor
+from src.models.ensemble import (
+    DECISION_THRESHOLD, MAIN_MODEL, EnsemblePredictor, EnsembleResult, _timed_predict_proba
+)
+from src.models.prediction import HIGH_RISK_THRESHOLD, MODERATE_RISK_THRESHOLD, load_models, risk_levels
+from src.utils.config import env_bool, env_float, env_str
+from src.utils.metrics import metrics
+
+CASCADE_ENABLED = env_bool('CASCADE_ENABLED', False)
+
+# Modèle du premier étage, évalué pour chaque patient
+CASCADE_FIRST_STAGE = env_str('CASCADE_FIRST_STAGE', 'logistic_regression')
+
+# Demi-largeur de la bande d'incertitude autour de chaque seuil
+CASCADE_BAND = env_float('CASCADE_BAND', 0.1)
+
+# Escalade aussi les patients proches du seuil de classe (0.5), pas seulement des seuils de risque
+CASCADE_DECISION_THRESHOLD = env_bool('CASCADE_DECISION_THRESHOLD', False)
+
+# Seuils au voisinage desquels le diagnostic du premier étage n'est pas retenu
+CASCADE_THRESHOLDS = (
+    (MODERATE_RISK_THRESHOLD, DECISION_THRESHOLD, HIGH_RISK_THRESHOLD) if CASCADE_DECISION_THRESHOLD
+    else (MODERATE_RISK_THRESHOLD, HIGH_RISK_THRESHOLD)
+)
+
+EVALUATION_BANDS = (0.0, 0.05, 0.1, 0.15, 0.2)
+
+
+def escalation_models(models, first_stage=CASCADE_FIRST_STAGE):
+    """Modèles de l'étage d'escalade : tous sauf le premier étage"""
+    return {name: model for name, model in models.items() if name != first_stage}
+
+
+def cascade_available(models, first_stage=CASCADE_FIRST_STAGE):
+    """Vrai si le premier étage et au moins un modèle d'escalade sont chargés"""
+    return first_stage in models and len(models) > 1
+
+
+def uncertain(probabilities, band=CASCADE_BAND, thresholds=CASCADE_THRESHOLDS):
+    """Masque des probabilités à moins de `band` d'un des seuils"""
+    probabilities = np.asarray(probabilities)
+    mask = np.zeros(len(probabilities), dtype=bool)
+    for threshold in thresholds:
+        mask |= np.abs(probabilities - threshold) < band
+    return mask
+
+
+class CascadePredictor:
+    """
+    Premier étage sur tout le lot, ensemble complet sur les lignes incertaines
+
+    Même interface qu'EnsemblePredictor : `predict` retourne un
+    EnsembleResult avec toutes les colonnes de `models` (NaN pour les
+    modèles non évalués) et le masque `escalated`. `escalation` remplace
+    l'EnsemblePredictor des modèles lourds (ParallelPredictor...) ; avec
+    un PredictionCache `cache` (construit sur escalation_models), seules
+    les lignes escaladées sont mises en cache. `stats` donne le taux
+    d'escalade depuis la création.
+    """
+
+    def __init__(self, models, first_stage=CASCADE_FIRST_STAGE, band=CASCADE_BAND,
+                 thresholds=CASCADE_THRESHOLDS, escalation=None, cache=None, main_model=MAIN_MODEL,
+                 executor=None, timeout=None):
+        if not cascade_available(models, first_stage):
+            raise ValueError(f"Cascade impossible : modèle {first_stage} ou modèles d'escalade manquants")
+        self.models = models
+        self.model_names = list(models)
+        self.first_stage = first_stage
+        self.band = band
+        self.thresholds = tuple(thresholds)
+        self.main_model = main_model
+        if escalation is None:
+            escalation = EnsemblePredictor(escalation_models(models, first_stage), main_model,
+                                           executor=executor, timeout=timeout)
+        if cache is not None:
+            escalation = CachedPredictor(escalation, cache)
+        self.escalation = escalation
+        self.rows = 0
+        self.escalated = 0
+        self._lock = threading.Lock()
+
+    def settings(self):
+        """Paramètres qui déterminent les résultats (clé de reprise du diagnostic par lot)"""
+        return {'first_stage': self.first_stage, 'band': self.band, 'thresholds': list(self.thresholds)}
+
+    def predict(self, features, strict=False):
+        n_rows = len(features)
+        probabilities = np.full((n_rows, len(self.model_names)), np.nan)
+        errors = {}
+        timings = {}
+        try:
+            first, timings[self.first_stage] = _timed_predict_proba(
+                self.first_stage, self.models[self.first_stage], features)
+            probabilities[:, self.model_names.index(self.first_stage)] = first
+            escalated = uncertain(first, self.band, self.thresholds)
+        except Exception as e:
+            # Premier étage en échec : tout le lot passe par l'escalade
+            metrics.increment('errors', model=self.first_stage)
+            if strict:
+                raise
+            errors[self.first_stage] = str(e)
+            escalated = np.ones(n_rows, dtype=bool)
+
+        main_model = self.main_model if self.main_model in self.models else self.first_stage
+        n_escalated = int(escalated.sum())
+        if n_escalated:
+            heavy = self.escalation.predict(features[escalated], strict=strict)
+            for j, name in enumerate(heavy.model_names):
+                probabilities[escalated, self.model_names.index(name)] = heavy.probabilities[:, j]
+            errors.update(heavy.errors)
+            timings.update(heavy.timings)
+            main_model = heavy.main_model
+        if self.first_stage in errors:
+            # Sans premier étage, le résultat est celui de l'escalade seule
+            names = [name for name in self.model_names if name != self.first_stage]
+            columns = [self.model_names.index(name) for name in names]
+            return EnsembleResult(names, probabilities[:, columns], main_model, errors, timings)
+
+        with self._lock:
+            self.rows += n_rows
+            self.escalated += n_escalated
+        metrics.increment('cascade_rows', n_rows)
+        metrics.increment('cascade_escalated', n_escalated)
+        return EnsembleResult(self.model_names, probabilities, main_model, errors, timings,
+                              escalated=escalated, first_stage=self.first_stage)
+
+    def stats(self):
+        with self._lock:
+            rows, escalated = self.rows, self.escalated
+        return {
+            'premier_etage': self.first_stage,
+            'bande': self.band,
+            'lignes': rows,
+            'escaladees': escalated,
+            'taux_escalade': escalated / rows if rows else 0.0
+        }
+
+
+def _median_time(func, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - start)
+    return result, statistics.median(durations)
+
+
+def evaluate_cascade(models, features, bands=EVALUATION_BANDS, first_stage=CASCADE_FIRST_STAGE,
+                     labels=None, repeat=3):
+    """
+    Compare la cascade à l'ensemble complet sur une matrice encodée
+
+    Pour chaque largeur de bande : taux d'escalade, accord avec l'ensemble
+    complet (niveau de risque et classe du diagnostic principal), écart
+    maximal de probabilité, durée médiane et gain de temps ; avec
+    `labels`, exactitude de la cascade et de l'ensemble. Les modèles sont
+    évalués l'un après l'autre, pour comparer des coûts de calcul.
+    Retourne un DataFrame indexé par la bande.
+    """
+    full, full_time = _median_time(lambda: EnsemblePredictor(models).predict(features, strict=True), repeat)
+    full_probability = full.main_probability
+    full_levels = risk_levels(full_probability)
+    full_predictions = full_probability > DECISION_THRESHOLD
+
+    rows = []
+    for band in bands:
+        predictor = CascadePredictor(models, first_stage, band)
+        result, cascade_time = _median_time(lambda: predictor.predict(features, strict=True), repeat)
+        probability = result.main_probability
+        row = {
+            'bande': band,
+            'taux_escalade': result.escalated.mean(),
+            'accord_risque': (risk_levels(probability) == full_levels).mean(),
+            'accord_diagnostic': ((probability > DECISION_THRESHOLD) == full_predictions).mean(),
+            'ecart_max': np.abs(probability - full_probability).max(),
+            'duree_ms': cascade_time * 1000,
+            'gain': full_time / cascade_time
+        }
+        if labels is not None:
+            row['exactitude'] = ((probability > DECISION_THRESHOLD) == labels).mean()
+            row['exactitude_ensemble'] = (full_predictions == labels).mean()
+        rows.append(row)
+    return pd.DataFrame(rows).set_index('bande'), full_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Évaluation hors ligne de l'inférence en cascade")
+    parser.add_argument("--data", default="data/processed/X_test", help="Patients (CSV, Parquet ou Arrow)")
+    parser.add_argument("--labels", help="Diagnostics réels (colonne target ou première colonne)")
+    parser.add_argument("--bands", type=float, nargs='+', default=list(EVALUATION_BANDS))
+    parser.add_argument("--rows", type=int, help="Répéter les patients jusqu'à ce nombre de lignes (mesure du coût)")
+    parser.add_argument("--first-stage", default=CASCADE_FIRST_STAGE)
+    args = parser.parse_args()
+
+    try:
+        features = encode_batch(load_table(args.data, columns=FEATURE_COLUMNS))
+        labels = load_table(args.labels).iloc[:, -1].to_numpy() if args.labels else None
+        models = load_models()
+    except (FileNotFoundError, ValueError) as e:
+        sys.exit(f"❌ {e}")
+    if args.rows:
+        features = np.resize(features, (args.rows, features.shape[1]))
+        labels = np.resize(labels, args.rows) if labels is not None else None
+
+    try:
+        report, full_time = evaluate_cascade(models, features, args.bands, args.first_stage, labels)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    print(f"🔬 {len(features):,} patients · ensemble complet {full_time * 1000:.1f} ms · "
+          f"premier étage {args.first_stage}")
+    print(report.to_string(float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""
+Modèles compilés en tableaux NumPy
+
+Après l'entraînement, chaque modèle est converti en une représentation
+plate : index de variable, seuil, enfants et valeurs des feuilles dans des
+tableaux contigus. L'évaluation est vectorisée en NumPy, par lot, et n'a
+plus besoin de catboost, xgboost ni scikit-learn.
+
+Chaque modèle compilé est un dossier models/compiled/<nom>/ contenant un
+meta.json (type, paramètres scalaires et empreinte du pickle d'origine) et
+un fichier .npy par tableau. L'empreinte permet au registre d'écarter une
+version compilée qui ne correspond plus au pickle (modèle réentraîné).
+Les .npy sont ouverts en mémoire mappée (mmap_mode='r') : le chargement est
+quasi instantané et plusieurs processus (workers Streamlit, pool de scoring)
+partagent les mêmes pages via le cache du système.
+
+Formats pris en charge :
+- forêts scikit-learn (RandomForest, ExtraTrees) et XGBoost (gbtree)
+  -> CompiledTreeEnsemble
+- CatBoost (arbres symétriques) -> CompiledObliviousEnsemble
+- modèles linéaires scikit-learn (LogisticRegression) -> CompiledLinearModel
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from src.utils.helpers import file_digest
+
+# Dossier des modèles compilés
+COMPILED_DIR = 'models/compiled'
+
+# Écart maximal toléré entre le modèle d'origine et sa version compilée
+DEFAULT_TOLERANCE = 1e-5
+
+# Nombre de lignes évaluées à la fois (borne la mémoire de travail)
+EVAL_BLOCK_SIZE = 4096
+
+
+def _sigmoid(margin):
+    return 1.0 / (1.0 + np.exp(-margin))
+
+
+def _as_proba_matrix(positive):
+    """Matrice (n, 2) au format predict_proba à partir de P(classe 1)"""
+    return np.column_stack([1.0 - positive, positive])
+
+
+class CompiledTreeEnsemble:
+    """
+    Ensemble d'arbres binaires stockés à plat
+
+    Les nœuds de tous les arbres sont concaténés ; `roots` donne l'indice de
+    la racine de chaque arbre. Une feuille pointe vers elle-même
+    (`left[i] == right[i] == i`), ce qui évite tout tableau dérivé au
+    chargement et garde les tableaux partageables en mémoire mappée.
+    - aggregation='mean' : moyenne des probabilités des feuilles (forêt)
+    - aggregation='logit' : somme des marges + `base_margin`, puis sigmoïde
+      (boosting). La comparaison est `x < seuil` si `strict`, sinon `x <= seuil`.
+    """
+
+    kind = 'tree_ensemble'
+
+    def __init__(self, feature, threshold, left, right, value, default_left, roots,
+                 max_depth, aggregation, base_margin=0.0, strict=False):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float32)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.default_left = np.ascontiguousarray(default_left, dtype=bool)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.aggregation = str(aggregation)
+        self.base_margin = float(base_margin)
+        self.strict = bool(strict)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def arrays(self):
+        """Tableaux et paramètres à sauvegarder"""
+        return {
+            'feature': self.feature, 'threshold': self.threshold,
+            'left': self.left, 'right': self.right, 'value': self.value,
+            'default_left': self.default_left, 'roots': self.roots,
+            'max_depth': self.max_depth, 'aggregation': self.aggregation,
+            'base_margin': self.base_margin, 'strict': self.strict
+        }
+
+    def _leaf_values(self, X):
+        # Un nœud courant par couple (ligne, arbre) ; seuls les couples qui
+        # ne sont pas encore arrivés à une feuille sont descendus d'un niveau
+        n_rows, n_features = X.shape
+        nodes = np.tile(self.roots, n_rows)
+        offsets = np.repeat(np.arange(n_rows, dtype=np.int64) * n_features, self.n_trees)
+        flat_X = X.ravel()
+
+        active = np.flatnonzero(self.left[nodes] != nodes)
+        for _ in range(self.max_depth):
+            if not len(active):
+                break
+            current = nodes[active]
+            x = flat_X[offsets[active] + self.feature[current]]
+            threshold = self.threshold[current]
+            go_left = x < threshold if self.strict else x <= threshold
+            missing = np.isnan(x)
+            if missing.any():
+                go_left[missing] = self.default_left[current[missing]]
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+            active = active[self.left[current] != current]
+        return self.value[nodes].reshape(n_rows, self.n_trees)
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        positive = np.empty(len(X))
+        for start in range(0, len(X), EVAL_BLOCK_SIZE):
+            leaves = self._leaf_values(X[start:start + EVAL_BLOCK_SIZE])
+            if self.aggregation == 'mean':
+                positive[start:start + len(leaves)] = leaves.mean(axis=1)
+            else:
+                positive[start:start + len(leaves)] = _sigmoid(leaves.sum(axis=1) + self.base_margin)
+        return _as_proba_matrix(positive)
+
+
+class CompiledObliviousEnsemble:
+    """
+    Arbres symétriques (CatBoost) : une même condition par niveau
+
+    `split_feature` et `split_border` ont la forme (n_arbres, profondeur) ;
+    la feuille est l'entier dont le bit i vaut (x[split_feature[i]] > split_border[i]).
+    Les arbres moins profonds sont complétés par des seuils +inf (bit toujours 0).
+    """
+
+    kind = 'oblivious_ensemble'
+
+    def __init__(self, split_feature, split_border, leaf_values, scale=1.0, bias=0.0):
+        self.split_feature = np.ascontiguousarray(split_feature, dtype=np.int32)
+        self.split_border = np.ascontiguousarray(split_border, dtype=np.float32)
+        self.leaf_values = np.ascontiguousarray(leaf_values, dtype=np.float64)
+        self.scale = float(scale)
+        self.bias = float(bias)
+
+    def arrays(self):
+        return {
+            'split_feature': self.split_feature, 'split_border': self.split_border,
+            'leaf_values': self.leaf_values, 'scale': self.scale, 'bias': self.bias
+        }
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        n_trees, depth = self.split_feature.shape
+        flat_leaf_values = self.leaf_values.ravel()
+        tree_offsets = np.arange(n_trees, dtype=np.int64) * self.leaf_values.shape[1]
+
+        positive = np.empty(len(X))
+        for start in range(0, len(X), EVAL_BLOCK_SIZE):
+            block = X[start:start + EVAL_BLOCK_SIZE]
+            # Indice de feuille construit niveau par niveau, pour tous les arbres à la fois
+            leaves = np.zeros((len(block), n_trees), dtype=np.int64)
+            for level in range(depth):
+                bit = block[:, self.split_feature[:, level]] > self.split_border[:, level]
+                leaves |= bit.astype(np.int64) << level
+            margin = np.take(flat_leaf_values, leaves + tree_offsets).sum(axis=1)
+            positive[start:start + len(block)] = _sigmoid(self.scale * margin + self.bias)
+        return _as_proba_matrix(positive)
+
+
+class CompiledLinearModel:
+    """
+    Modèle linéaire : sigmoïde(X @ coef + intercept)
+    """
+
+    kind = 'linear'
+
+    def __init__(self, coef, intercept):
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+
+    def arrays(self):
+        return {'coef': self.coef, 'intercept': self.intercept}
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        return _as_proba_matrix(_sigmoid(X @ self.coef + self.intercept))
+
+
+COMPILED_TYPES = {
+    cls.kind: cls for cls in (CompiledTreeEnsemble, CompiledObliviousEnsemble, CompiledLinearModel)
+}
+
+
+def _compile_sklearn_forest(model):
+    positive_class = list(model.classes_).index(1)
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        counts = tree.value[:, 0, :]
+        # Probabilité de la classe positive dans chaque feuille
+        proba = counts[:, positive_class] / counts.sum(axis=1)
+        is_leaf = tree.children_left < 0
+        nodes = np.arange(tree.node_count) + offset
+
+        roots.append(offset)
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, 0, tree.threshold))
+        lefts.append(np.where(is_leaf, nodes, tree.children_left + offset))
+        rights.append(np.where(is_leaf, nodes, tree.children_right + offset))
+        values.append(proba)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    thresholds = np.concatenate(thresholds)
+    return CompiledTreeEnsemble(
+        np.concatenate(features),
+        # scikit-learn compare x (float32) <= seuil (float64) : arrondi vers le bas en float32
+        _floor_float32(thresholds),
+        np.concatenate(lefts), np.concatenate(rights), np.concatenate(values),
+        np.zeros(offset, dtype=bool), roots, max_depth, aggregation='mean'
+    )
+
+
+def _floor_float32(values):
+    """Plus grand float32 <= chaque valeur (préserve x <= seuil pour x float32)"""
+    rounded = values.astype(np.float32)
+    too_high = rounded.astype(np.float64) > values
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+
+def _compile_xgboost(model):
+    booster = model.get_booster()
+    learner = json.loads(booster.save_raw('json'))['learner']
+
+    objective = learner['objective']['name']
+    if objective != 'binary:logistic':
+        raise ValueError(f"Objectif XGBoost non supporté: {objective}")
+    gradient_booster = learner['gradient_booster']
+    if gradient_booster['name'] != 'gbtree':
+        raise ValueError(f"Booster XGBoost non supporté: {gradient_booster['name']}")
+
+    base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+    trees = gradient_booster['model']['trees']
+    try:
+        trees = trees[:model.best_iteration + 1]
+    except AttributeError:
+        pass
+
+    features, thresholds, lefts, rights, values, default_left, roots = [], [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for tree in trees:
+        left = np.asarray(tree['left_children'])
+        right = np.asarray(tree['right_children'])
+        is_leaf = left < 0
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        nodes = np.arange(len(left)) + offset
+
+        roots.append(offset)
+        features.append(np.where(is_leaf, 0, tree['split_indices']))
+        thresholds.append(np.where(is_leaf, 0, conditions))
+        lefts.append(np.where(is_leaf, nodes, left + offset))
+        rights.append(np.where(is_leaf, nodes, right + offset))
+        # Pour une feuille, split_conditions contient la valeur de sortie
+        values.append(np.where(is_leaf, conditions, 0))
+        default_left.append(np.asarray(tree['default_left'], dtype=bool))
+        offset += len(left)
+        max_depth = max(max_depth, _tree_depth(left, right))
+
+    return CompiledTreeEnsemble(
+        np.concatenate(features), np.concatenate(thresholds),
+        np.concatenate(lefts), np.concatenate(rights), np.concatenate(values),
+        np.concatenate(default_left), roots, max_depth, aggregation='logit',
+        base_margin=np.log(base_score / (1 - base_score)), strict=True
+    )
+
+
+def _tree_depth(left, right):
+    depth = 0
+    level = [0]
+    while level:
+        level = [child for node in level for child in (left[node], right[node]) if child >= 0]
+        depth += bool(level)
+    return depth
+
+
+def _compile_catboost(model):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'model.json')
+        model.save_model(path, format='json')
+        with open(path) as f:
+            dump = json.load(f)
+
+    trees = dump['oblivious_trees']
+    depth = max(len(tree['splits']) for tree in trees)
+    split_feature = np.zeros((len(trees), depth), dtype=np.int32)
+    split_border = np.full((len(trees), depth), np.inf, dtype=np.float32)
+    leaf_values = np.zeros((len(trees), 2 ** depth))
+
+    for t, tree in enumerate(trees):
+        for i, split in enumerate(tree['splits']):
+            if split['split_type'] != 'FloatFeature':
+                raise ValueError(f"Type de split CatBoost non supporté: {split['split_type']}")
+            split_feature[t, i] = split['float_feature_index']
+            split_border[t, i] = split['border']
+        leaf_values[t, :len(tree['leaf_values'])] = tree['leaf_values']
+
+    scale, bias = dump.get('scale_and_bias', [1, [0]])
+    bias = bias[0] if isinstance(bias, list) else bias
+    return CompiledObliviousEnsemble(split_feature, split_border, leaf_values, scale, bias)
+
+
+def _compile_linear(model):
+    if model.coef_.shape[0] != 1:
+        raise ValueError("Seuls les modèles linéaires binaires sont supportés")
+    return CompiledLinearModel(model.coef_[0], model.intercept_[0])
+
+
+def _compile_scaled_linear(pipeline):
+    """Pipeline StandardScaler + LogisticRegression, standardisation intégrée aux coefficients"""
+    steps = [step for _, step in pipeline.steps]
+    if len(steps) != 2 or type(steps[0]).__name__ != 'StandardScaler' \
+            or type(steps[1]).__name__ != 'LogisticRegression':
+        raise ValueError("Seuls les pipelines StandardScaler + LogisticRegression sont supportés")
+    scaler, linear = steps
+    compiled = _compile_linear(linear)
+    scale = scaler.scale_ if scaler.scale_ is not None else 1.0
+    mean = scaler.mean_ if scaler.mean_ is not None else 0.0
+    coef = compiled.coef / scale
+    return CompiledLinearModel(coef, compiled.intercept - float(np.sum(coef * mean)))
+
+
+def compile_model(model):
+    """
+    Convertit un modèle entraîné en modèle compilé
+
+    Le type est reconnu par son nom de classe pour ne pas importer catboost
+    ni xgboost. Lève ValueError pour un modèle non supporté.
+    """
+    class_name = type(model).__name__
+    if class_name in ('RandomForestClassifier', 'ExtraTreesClassifier'):
+        return _compile_sklearn_forest(model)
+    if class_name == 'XGBClassifier':
+        return _compile_xgboost(model)
+    if class_name == 'CatBoostClassifier':
+        return _compile_catboost(model)
+    if class_name == 'LogisticRegression':
+        return _compile_linear(model)
+    if class_name == 'Pipeline':
+        return _compile_scaled_linear(model)
+    raise ValueError(f"Type de modèle non supporté pour la compilation: {class_name}")
+
+
+def check_compiled(model, compiled, features, tolerance=DEFAULT_TOLERANCE):
+    """
+    Vérifie que le modèle compilé reproduit les probabilités d'origine
+
+    Retourne l'écart maximal ; lève ValueError s'il dépasse `tolerance`.
+    """
+    features = np.asarray(features, dtype=np.float32)
+    with warnings.catch_warnings():
+        # Modèles scikit-learn entraînés sur un DataFrame, évalués ici sur une matrice
+        warnings.simplefilter('ignore', UserWarning)
+        expected = model.predict_proba(features)[:, 1]
+    actual = compiled.predict_proba(features)[:, 1]
+    max_error = float(np.max(np.abs(expected - actual))) if len(features) else 0.0
+    if max_error > tolerance:
+        raise ValueError(
+            f"Modèle compilé ({type(model).__name__}) différent de l'original: "
+            f"écart max {max_error:.2e} > {tolerance:.0e}"
+        )
+    return max_error
+
+
+def save_compiled(compiled, path, source=None):
+    """
+    Sauvegarde un modèle compilé dans le dossier `path`
+
+    Les tableaux sont écrits en .npy (un fichier chacun) et les paramètres
+    scalaires dans meta.json, avec l'empreinte du pickle `source` dont le
+    modèle est issu. Le dossier est remplacé de façon atomique.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+
+    params = {}
+    for key, value in compiled.arrays().items():
+        if isinstance(value, np.ndarray):
+            np.save(tmp_path / f'{key}.npy', value)
+        else:
+            params[key] = value
+    meta = {'kind': compiled.kind, 'params': params}
+    if source is not None:
+        meta['source'] = {'file': str(source), 'digest': file_digest(source)}
+    with open(tmp_path / 'meta.json', 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+
+
+def load_compiled(path, mmap=True):
+    """
+    Charge un modèle compilé sauvegardé par save_compiled
+
+    Avec mmap=True, les tableaux sont mappés en lecture seule au lieu d'être
+    copiés en mémoire.
+    """
+    path = Path(path)
+    with open(path / 'meta.json') as f:
+        meta = json.load(f)
+
+    params = dict(meta['params'])
+    for array_path in path.glob('*.npy'):
+        params[array_path.stem] = np.load(array_path, mmap_mode='r' if mmap else None, allow_pickle=False)
+    return COMPILED_TYPES[meta['kind']](**params)
+
+
+def compiled_source_digest(path):
+    """Empreinte du pickle d'origine enregistrée dans meta.json (None si absente)"""
+    with open(Path(path) / 'meta.json') as f:
+        meta = json.load(f)
+    return meta.get('source', {}).get('digest')
+
+
+def export_compiled_models(models, output_dir=COMPILED_DIR, reference_features=None,
+                           tolerance=DEFAULT_TOLERANCE, sources=None):
+    """
+    Compile, vérifie et sauvegarde un dict {nom: modèle}
+
+    Si `reference_features` est fourni (par exemple X_test), chaque modèle
+    compilé est comparé à l'original avant d'être écrit. `sources`
+    ({nom: chemin du pickle}) fournit l'empreinte enregistrée avec chaque
+    modèle. Retourne un dict {nom: écart maximal} (None sans données de
+    référence).
+    """
+    sources = sources or {}
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    errors = {}
+    for name, model in models.items():
+        compiled = compile_model(model)
+        errors[name] = None
+        if reference_features is not None:
+            errors[name] = check_compiled(model, compiled, reference_features, tolerance)
+        save_compiled(compiled, output_dir / name, sources.get(name))
+    return errors
@@ -0,0 +1,360 @@
+"""
+Surveillance de la dérive des variables d'entrée
+
+La référence est la distribution des données d'entraînement
+(data/processed/X_train), résumée variable par variable : table des
+fréquences des codes admis pour les variables catégorielles, histogramme
+à intervalles fixes (déciles de l'entraînement, extrémités ouvertes) pour
+les mesures. Elle est construite à l'export des modèles
+(python start.py --export) dans DRIFT_REFERENCE_FILE.
+
+Chaque lot évalué (page Diagnostic, API, diagnostic par lot) met à jour
+les mêmes effectifs côté production, en mémoire constante : aucune ligne
+n'est conservée. Les effectifs décroissent avec une demi-vie de
+DRIFT_HALF_LIFE lignes, pour que la dérive reflète les patients récents.
+Pour chaque variable : PSI (indice de stabilité de population) et, pour
+les mesures, statistique de Kolmogorov-Smirnov sur les intervalles.
+
+    python -m src.models.drift --build              # construire la référence
+    python -m src.models.drift --data input.csv     # dérive d'un fichier
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.preprocessing import CATEGORICAL_MAPPINGS, FEATURE_COLUMNS, encode_batch
+from src.data.storage import load_table
+from src.utils.config import env_bool, env_int, env_str
+from src.utils.metrics import metrics
+
+DRIFT_ENABLED = env_bool('DRIFT_ENABLED', True)
+
+DRIFT_REFERENCE_FILE = env_str('DRIFT_REFERENCE_FILE', 'models/drift_reference.json')
+
+# Données d'entraînement sauvegardées par le notebook
+TRAIN_FILE = 'data/processed/X_train'
+
+# Nombre d'intervalles (quantiles de l'entraînement) par mesure
+DRIFT_BINS = 10
+
+# Demi-vie des effectifs de production (lignes) ; 0 : cumul depuis le démarrage
+DRIFT_HALF_LIFE = env_int('DRIFT_HALF_LIFE', 10000)
+
+# En dessous de ce nombre de patients (effectif pondéré), la dérive n'est pas évaluée
+DRIFT_MIN_ROWS = env_int('DRIFT_MIN_ROWS', 100)
+
+# Seuils usuels du PSI : < 0.1 stable, 0.1 à 0.25 modérée, au-delà forte
+PSI_MODERATE = 0.1
+PSI_HIGH = 0.25
+
+# Proportion plancher des intervalles vides (le PSI d'un intervalle vide est infini)
+PSI_EPSILON = 1e-4
+
+# Coefficient de la valeur critique du test KS à deux échantillons (alpha = 5 %)
+KS_COEFFICIENT = 1.358
+
+FORMAT = 1
+
+
+class FeatureSketch:
+    """
+    Effectifs d'une variable par intervalle
+
+    Variable catégorielle : un intervalle par code admis, puis un pour
+    tout autre code. Mesure : intervalles délimités par `edges` (bornes
+    intérieures croissantes), le premier et le dernier étant ouverts.
+    """
+
+    def __init__(self, feature, edges=None, codes=None, counts=None):
+        self.feature = feature
+        self.edges = None if edges is None else np.asarray(edges, dtype=np.float64)
+        self.codes = None if codes is None else np.asarray(codes, dtype=np.float64)
+        n_bins = len(self.codes) + 1 if self.categorical else len(self.edges) + 1
+        self.counts = np.zeros(n_bins) if counts is None else np.asarray(counts, dtype=np.float64)
+
+    @property
+    def categorical(self):
+        return self.codes is not None
+
+    @property
+    def total(self):
+        return float(self.counts.sum())
+
+    @classmethod
+    def for_values(cls, feature, values, bins=DRIFT_BINS):
+        """Intervalles adaptés aux valeurs d'entraînement de `feature`, effectifs compris"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if feature in CATEGORICAL_MAPPINGS:
+            sketch = cls(feature, codes=sorted(set(CATEGORICAL_MAPPINGS[feature].values())))
+        else:
+            # Déciles intérieurs, sans doublon (variables entières peu variées)
+            edges = np.unique(np.quantile(values, np.arange(1, bins) / bins)) if len(values) else []
+            sketch = cls(feature, edges=edges)
+        sketch.update(values)
+        return sketch
+
+    def empty(self):
+        return FeatureSketch(self.feature, self.edges, self.codes)
+
+    def bin_indices(self, values):
+        if not self.categorical:
+            return np.searchsorted(self.edges, values, side='right')
+        positions = np.searchsorted(self.codes, values).clip(0, len(self.codes) - 1)
+        return np.where(self.codes[positions] == values, positions, len(self.codes))
+
+    def update(self, values, decay=1.0):
+        values = np.asarray(values)
+        values = values[np.isfinite(values)]
+        if decay != 1.0:
+            self.counts *= decay
+        if len(values):
+            self.counts += np.bincount(self.bin_indices(values), minlength=len(self.counts))
+
+    def proportions(self):
+        total = self.total
+        return self.counts / total if total else np.zeros(len(self.counts))
+
+    def labels(self):
+        """Libellés des intervalles (libellé du formulaire pour les codes)"""
+        if self.categorical:
+            names = {code: label for label, code in CATEGORICAL_MAPPINGS[self.feature].items()}
+            return [names.get(int(code), str(int(code))) for code in self.codes] + ["Autre"]
+        if not len(self.edges):
+            return ["Toutes valeurs"]
+        edges = [f"{edge:g}" for edge in self.edges]
+        return [f"< {edges[0]}"] + [f"[{low}, {high}[" for low, high in zip(edges, edges[1:])] + [f"≥ {edges[-1]}"]
+
+    def to_dict(self):
+        return {
+            'feature': self.feature,
+            'edges': None if self.edges is None else self.edges.tolist(),
+            'codes': None if self.codes is None else self.codes.tolist(),
+            'counts': self.counts.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['feature'], state['edges'], state['codes'], state['counts'])
+
+
+def psi(expected, actual, epsilon=PSI_EPSILON):
+    """Population Stability Index entre deux vecteurs de proportions"""
+    expected = np.maximum(np.asarray(expected, dtype=np.float64), epsilon)
+    actual = np.maximum(np.asarray(actual, dtype=np.float64), epsilon)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks_statistic(expected, actual):
+    """Écart maximal entre les fonctions de répartition, évaluées aux bornes des intervalles"""
+    return float(np.max(np.abs(np.cumsum(expected) - np.cumsum(actual))))
+
+
+def ks_critical(n_expected, n_actual, coefficient=KS_COEFFICIENT):
+    """Valeur critique du test KS à deux échantillons (approximation asymptotique)"""
+    if not n_expected or not n_actual:
+        return float('nan')
+    return coefficient * np.sqrt((n_expected + n_actual) / (n_expected * n_actual))
+
+
+def drift_level(value):
+    if not np.isfinite(value):
+        return 'insuffisant'
+    if value >= PSI_HIGH:
+        return 'forte'
+    if value >= PSI_MODERATE:
+        return 'modérée'
+    return 'stable'
+
+
+class DriftReference:
+    """Esquisses des données d'entraînement, une par variable de FEATURE_COLUMNS"""
+
+    def __init__(self, sketches, n_rows, source=None, created_at=None):
+        self.sketches = sketches
+        self.n_rows = n_rows
+        self.source = source
+        self.created_at = created_at
+
+    @classmethod
+    def build(cls, features, source=None, bins=DRIFT_BINS):
+        """Référence d'une matrice encodée (colonnes dans l'ordre de FEATURE_COLUMNS)"""
+        features = np.asarray(features, dtype=np.float64)
+        sketches = {
+            col: FeatureSketch.for_values(col, features[:, j], bins)
+            for j, col in enumerate(FEATURE_COLUMNS)
+        }
+        return cls(sketches, len(features), source, datetime.now().isoformat(timespec='seconds'))
+
+    def save(self, path=DRIFT_REFERENCE_FILE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            'format': FORMAT,
+            'n_rows': self.n_rows,
+            'source': self.source,
+            'created_at': self.created_at,
+            'sketches': [sketch.to_dict() for sketch in self.sketches.values()]
+        }
+        tmp_path = path.with_name(f'.{path.name}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=DRIFT_REFERENCE_FILE):
+        """Lève FileNotFoundError si la référence n'existe pas, ValueError si elle est illisible"""
+        with open(path) as f:
+            state = json.load(f)
+        if state.get('format') != FORMAT:
+            raise ValueError(f"Référence de dérive d'un autre format: {path}")
+        sketches = {s['feature']: FeatureSketch.from_dict(s) for s in state['sketches']}
+        if list(sketches) != FEATURE_COLUMNS:
+            raise ValueError(f"Variables de la référence différentes de FEATURE_COLUMNS: {path}")
+        return cls(sketches, state['n_rows'], state['source'], state['created_at'])
+
+
+def build_reference(train_path=TRAIN_FILE, output_path=DRIFT_REFERENCE_FILE):
+    """Construit et enregistre la référence à partir des données d'entraînement"""
+    features = encode_batch(load_table(train_path, columns=FEATURE_COLUMNS))
+    reference = DriftReference.build(features, source=str(train_path))
+    reference.save(output_path)
+    return reference
+
+
+class DriftMonitor:
+    """
+    Effectifs de production comparés à la référence
+
+    `observe` ajoute un lot encodé en O(lignes) et en mémoire constante (un
+    vecteur d'effectifs par variable) ; `report` calcule PSI et KS à partir
+    des seuls effectifs. Thread-safe : partagé par les sessions et les
+    requêtes d'un processus.
+    """
+
+    def __init__(self, reference, half_life=DRIFT_HALF_LIFE, min_rows=DRIFT_MIN_ROWS):
+        self.reference = reference
+        self.half_life = half_life
+        self.min_rows = min_rows
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.live = {col: sketch.empty() for col, sketch in self.reference.sketches.items()}
+            self.rows = 0
+
+    def observe(self, features):
+        features = np.asarray(features)
+        if not len(features):
+            return
+        decay = 0.5 ** (len(features) / self.half_life) if self.half_life else 1.0
+        with metrics.span('drift_update'), self._lock:
+            for j, col in enumerate(FEATURE_COLUMNS):
+                self.live[col].update(features[:, j], decay)
+            self.rows += len(features)
+
+    def effective_rows(self):
+        """Effectif pondéré par la décroissance (patients récents)"""
+        with self._lock:
+            return self.live[FEATURE_COLUMNS[0]].total
+
+    def report(self):
+        """
+        Un rang par variable : PSI, niveau de dérive, KS et sa valeur critique
+        (mesures seulement), effectif pondéré ; niveau « insuffisant » sous
+        min_rows patients
+        """
+        rows = []
+        with self._lock:
+            for col, reference in self.reference.sketches.items():
+                live = self.live[col]
+                n_live = live.total
+                enough = n_live >= self.min_rows
+                expected, actual = reference.proportions(), live.proportions()
+                value = psi(expected, actual) if enough else float('nan')
+                rows.append({
+                    'variable': col,
+                    'type': 'catégorielle' if reference.categorical else 'mesure',
+                    'psi': value,
+                    'niveau': drift_level(value),
+                    'ks': ks_statistic(expected, actual) if enough and not reference.categorical else float('nan'),
+                    'ks_critique': ks_critical(reference.total, n_live) if not reference.categorical else float('nan'),
+                    'effectif': n_live
+                })
+        return pd.DataFrame(rows).set_index('variable')
+
+    def distributions(self, feature):
+        """Proportions de référence et de production de `feature`, par intervalle"""
+        with self._lock:
+            reference, live = self.reference.sketches[feature], self.live[feature]
+            return pd.DataFrame({
+                'intervalle': reference.labels(),
+                'reference': reference.proportions(),
+                'production': live.proportions()
+            })
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor(path=DRIFT_REFERENCE_FILE):
+    """
+    DriftMonitor du processus, créé à la première utilisation ; None si la
+    surveillance est désactivée ou la référence absente (recherchée à
+    nouveau au prochain appel)
+    """
+    global _monitor
+    if _monitor is not None or not DRIFT_ENABLED:
+        return _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            try:
+                _monitor = DriftMonitor(DriftReference.load(path))
+            except (FileNotFoundError, ValueError):
+                return None
+    return _monitor
+
+
+def observe(features):
+    """Ajoute un lot encodé au DriftMonitor du processus, s'il existe"""
+    monitor = get_monitor()
+    if monitor is not None:
+        monitor.observe(features)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dérive des variables d'entrée par rapport à l'entraînement")
+    parser.add_argument("--build", action="store_true", help="Construire la référence depuis --train")
+    parser.add_argument("--train", default=TRAIN_FILE, help="Données d'entraînement (défaut: %(default)s)")
+    parser.add_argument("--reference", default=DRIFT_REFERENCE_FILE, help="Fichier de référence")
+    parser.add_argument("--data", help="Patients à comparer à la référence (format data/sample_data.csv)")
+    args = parser.parse_args()
+
+    try:
+        if args.build:
+            reference = build_reference(args.train, args.reference)
+            print(f"✅ Référence de dérive écrite dans {args.reference} ({reference.n_rows:,} patients)")
+        if args.data:
+            monitor = DriftMonitor(DriftReference.load(args.reference), half_life=0, min_rows=1)
+            monitor.observe(encode_batch(load_table(args.data, columns=FEATURE_COLUMNS)))
+            print(f"📉 {monitor.rows:,} patients comparés à la référence")
+            print(monitor.report().to_string(float_format=lambda value: f"{value:.3f}"))
+    except (FileNotFoundError, ValueError) as e:
+        sys.exit(f"❌ {e}")
+    if not (args.build or args.data):
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
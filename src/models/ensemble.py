@@ -0,0 +1,253 @@
+"""
+Inférence d'ensemble en une seule passe
+
+Chaque modèle n'est évalué qu'une fois, avec predict_proba : la classe
+prédite est dérivée de la probabilité (seuil de décision 0.5, comme
+predict pour un classifieur binaire). Les probabilités de tous les modèles
+sont regroupées dans une seule matrice (n_patients, n_modèles).
+
+Avec un pool de threads, les modèles sont évalués en même temps : CatBoost
+et XGBoost libèrent le GIL pendant la prédiction, la latence totale est donc
+celle du modèle le plus lent plutôt que la somme des quatre. Un appel hors
+délai ne peut pas être interrompu et garde son thread jusqu'à la fin : tant
+qu'il tourne, le modèle est écarté des inférences suivantes, ce qui borne à
+un thread par modèle le pool occupé par des calculs abandonnés.
+"""
+
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from src.utils.metrics import metrics
+
+# Modèle principal utilisé pour le diagnostic
+MAIN_MODEL = 'catboost'
+
+# Seuil de décision appliqué aux probabilités de la classe positive
+DECISION_THRESHOLD = 0.5
+
+# Confiance affichée quand un seul modèle a répondu
+SINGLE_MODEL_CONFIDENCE = 0.95
+
+# Délai maximal par modèle pour le diagnostic interactif (secondes)
+DEFAULT_MODEL_TIMEOUT = 5.0
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Appels hors délai encore en cours ({id(modèle): future}), retirés à leur fin
+_overdue = {}
+_overdue_lock = threading.Lock()
+
+
+def shared_executor():
+    """
+    Pool de threads partagé par toutes les inférences du processus
+
+    Créé au premier appel, avec au moins un thread par modèle.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(4, os.cpu_count() or 1),
+                thread_name_prefix='ensemble'
+            )
+    return _executor
+
+
+def _predict_proba(model, features):
+    """predict_proba sans l'avertissement scikit-learn sur les noms de variables"""
+    with warnings.catch_warnings():
+        # Les modèles reçoivent des matrices NumPy dans l'ordre de FEATURE_COLUMNS
+        warnings.filterwarnings('ignore', message='X does not have valid feature names',
+                                category=UserWarning)
+        return model.predict_proba(features)
+
+
+def _timed_predict_proba(name, model, features):
+    """Probabilité de la classe positive et durée de l'appel (secondes)"""
+    start = time.perf_counter()
+    probabilities = _predict_proba(model, features)[:, 1]
+    elapsed = time.perf_counter() - start
+    metrics.observe('predict_proba', elapsed, model=name)
+    return probabilities, elapsed
+
+
+def _mark_overdue(model, future):
+    """Écarte `model` des inférences concurrentes jusqu'à la fin de `future`"""
+    key = id(model)
+    with _overdue_lock:
+        _overdue[key] = future
+
+    def release(_):
+        with _overdue_lock:
+            if _overdue.get(key) is future:
+                del _overdue[key]
+
+    future.add_done_callback(release)
+
+
+@dataclass
+class EnsembleResult:
+    """
+    Résultat d'une inférence d'ensemble
+
+    `probabilities` a une colonne par modèle de `model_names` ; `errors`
+    contient les modèles en échec (ou hors délai) et leur message,
+    `timings` la durée de chaque modèle en secondes. En mode cascade
+    (voir src/models/cascade.py), `escalated` indique les lignes évaluées
+    par tout l'ensemble ; les autres n'ont que la probabilité du modèle
+    `first_stage`, les colonnes des modèles non évalués valant NaN.
+    """
+    model_names: list
+    probabilities: np.ndarray
+    main_model: str = None
+    errors: dict = field(default_factory=dict)
+    timings: dict = field(default_factory=dict)
+    escalated: np.ndarray = None
+    first_stage: str = None
+
+    @property
+    def predictions(self):
+        """Classes prédites (0/1) dérivées des probabilités, -1 pour un modèle non évalué"""
+        predictions = (self.probabilities > DECISION_THRESHOLD).astype(np.int8)
+        if self.escalated is not None:
+            predictions[np.isnan(self.probabilities)] = -1
+        return predictions
+
+    @property
+    def main_probability(self):
+        """Probabilité du modèle principal (du premier étage pour une ligne non escaladée)"""
+        main = self.probabilities[:, self.model_names.index(self.main_model)]
+        if self.escalated is None:
+            return main
+        first = self.probabilities[:, self.model_names.index(self.first_stage)]
+        return np.where(self.escalated, main, first)
+
+    @property
+    def main_prediction(self):
+        """Classe prédite (0/1) à partir de main_probability"""
+        return (self.main_probability > DECISION_THRESHOLD).astype(np.int8)
+
+    @property
+    def confidence(self):
+        """Confiance par patient : 1 - écart-type des probabilités entre modèles"""
+        if self.escalated is not None:
+            # Ligne non escaladée : un seul modèle a répondu
+            confidence = np.full(len(self.probabilities), SINGLE_MODEL_CONFIDENCE)
+            if len(self.model_names) > 1 and self.escalated.any():
+                confidence[self.escalated] = 1 - np.nanstd(self.probabilities[self.escalated], axis=1)
+            return confidence
+        if len(self.model_names) > 1:
+            return 1 - self.probabilities.std(axis=1)
+        return np.full(len(self.probabilities), SINGLE_MODEL_CONFIDENCE)
+
+    def probabilities_by_model(self, row=0):
+        """Probabilités d'un patient sous forme de dict {modèle: probabilité}, modèles évalués seulement"""
+        return {
+            name: probability
+            for name, probability in zip(self.model_names, self.probabilities[row].tolist())
+            if not np.isnan(probability)
+        }
+
+    def rows(self, start, stop):
+        """Résultat restreint aux lignes start:stop"""
+        return replace(
+            self,
+            probabilities=self.probabilities[start:stop],
+            escalated=None if self.escalated is None else self.escalated[start:stop]
+        )
+
+
+class EnsemblePredictor:
+    """
+    Évalue tous les modèles avec un seul appel predict_proba chacun
+
+    Sans `executor`, les modèles sont évalués l'un après l'autre. Avec un
+    pool de threads (voir shared_executor), ils sont soumis en même temps et
+    ceux qui n'ont pas répondu après `timeout` secondes sont écartés.
+    """
+
+    def __init__(self, models, main_model=MAIN_MODEL, executor=None, timeout=None):
+        self.models = models
+        self.main_model = main_model
+        self.executor = executor
+        self.timeout = timeout
+
+    def predict(self, features, strict=False):
+        """
+        Probabilités de tous les modèles pour la matrice `features`
+
+        Par défaut, un modèle en échec ou hors délai est écarté et son erreur
+        est reportée dans EnsembleResult.errors ; avec strict=True l'exception
+        est propagée. Lève RuntimeError si aucun modèle n'a répondu.
+        """
+        if self.executor is None:
+            outcomes, errors = self._predict_sequential(features, strict)
+        else:
+            outcomes, errors = self._predict_concurrent(features, strict)
+
+        names = [name for name in self.models if name in outcomes]
+        if not names:
+            raise RuntimeError("Aucun modèle n'a pu produire de prédiction")
+
+        main_model = self.main_model if self.main_model in names else names[0]
+        probabilities = np.column_stack([outcomes[name][0] for name in names]).astype(np.float64, copy=False)
+        timings = {name: outcomes[name][1] for name in names}
+        return EnsembleResult(names, probabilities, main_model, errors, timings)
+
+    def _predict_sequential(self, features, strict):
+        outcomes = {}
+        errors = {}
+        for name, model in self.models.items():
+            try:
+                outcomes[name] = _timed_predict_proba(name, model, features)
+            except Exception as e:
+                metrics.increment('errors', model=name)
+                if strict:
+                    raise
+                errors[name] = str(e)
+        return outcomes, errors
+
+    def _predict_concurrent(self, features, strict):
+        outcomes = {}
+        errors = {}
+        futures = {}
+        for name, model in self.models.items():
+            with _overdue_lock:
+                busy = id(model) in _overdue
+            if busy:
+                # Un appel précédent hors délai occupe encore un thread du pool
+                metrics.increment('errors', model=name)
+                if strict:
+                    raise TimeoutError(f"Modèle {name} occupé par un appel hors délai")
+                errors[name] = "Appel précédent hors délai toujours en cours"
+                continue
+            futures[name] = self.executor.submit(_timed_predict_proba, name, model, features)
+        done, _ = wait(futures.values(), timeout=self.timeout)
+
+        for name, future in futures.items():
+            if future not in done:
+                # Le calcul en cours ne peut pas être interrompu : son résultat est
+                # ignoré et le modèle écarté jusqu'à sa fin
+                if not future.cancel():
+                    _mark_overdue(self.models[name], future)
+                metrics.increment('errors', model=name)
+                if strict:
+                    raise TimeoutError(f"Délai dépassé pour le modèle {name} ({self.timeout}s)")
+                errors[name] = f"Délai dépassé ({self.timeout}s)"
+                continue
+            try:
+                outcomes[name] = future.result()
+            except Exception as e:
+                metrics.increment('errors', model=name)
+                if strict:
+                    raise
+                errors[name] = str(e)
+        return outcomes, errors
@@ -0,0 +1,157 @@
+"""
+Explication des diagnostics : contribution de chaque variable (TreeSHAP)
+
+Pour CatBoost et XGBoost, les valeurs SHAP exactes sont calculées par les
+bibliothèques elles-mêmes (ShapValues / pred_contribs, algorithme TreeSHAP
+en C++), sur tout un lot à la fois : le paquet shap n'est pas nécessaire.
+Les contributions sont en log-odds ; la valeur de base plus la somme des
+contributions d'un patient donne la marge (logit) du modèle.
+
+Les modèles compilés ne gardent pas la couverture des nœuds qu'utilise
+TreeSHAP : l'explicateur charge le modèle d'origine (pickle). Il est
+construit une fois par version du fichier du modèle, avec un fond de
+référence tiré de X_train sur lequel l'importance globale (contribution
+absolue moyenne) est précalculée.
+"""
+
+from dataclasses import dataclass
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.data.preprocessing import FEATURE_COLUMNS, encode_batch
+from src.data.storage import load_table
+from src.models.registry import MODEL_FILES
+
+# Modèles dont les diagnostics peuvent être expliqués, par ordre de préférence
+EXPLAINABLE_MODELS = ['catboost', 'xgboost']
+
+# Fond de référence : échantillon du jeu d'entraînement encodé
+BACKGROUND_FILE = 'data/processed/X_train'
+BACKGROUND_SIZE = 200
+
+# Nombre de facteurs retenus par patient dans les résultats par lot
+DEFAULT_TOP_FACTORS = 3
+
+# Libellés des variables (formulaire de diagnostic)
+FEATURE_LABELS = {
+    'age': 'Âge',
+    'sex': 'Sexe',
+    'cp': 'Douleur thoracique',
+    'trestbps': 'Pression artérielle',
+    'chol': 'Cholestérol',
+    'fbs': 'Glycémie à jeun',
+    'restecg': 'ECG au repos',
+    'thalach': 'Fréquence cardiaque max.',
+    'exang': "Angine d'effort",
+    'oldpeak': 'Dépression ST',
+    'slope': 'Pente ST',
+    'ca': 'Vaisseaux principaux',
+    'thal': 'Thalassémie'
+}
+
+
+@dataclass
+class Explanation:
+    """Contributions SHAP d'un lot (n, 13) et valeur de base, en log-odds"""
+    model_name: str
+    values: np.ndarray
+    base_value: float
+
+    def contributions(self, row=0):
+        """Contributions d'un patient, de la plus influente à la moins influente"""
+        series = pd.Series(self.values[row], index=FEATURE_COLUMNS)
+        return series.iloc[np.argsort(-np.abs(series.to_numpy()), kind='stable')]
+
+    def top_factors(self, k=DEFAULT_TOP_FACTORS):
+        """
+        Les `k` variables les plus influentes de chaque patient, en texte
+        ('ca +0.82, thal +0.55, cp -0.31'), calculées pour tout le lot
+        """
+        order = np.argsort(-np.abs(self.values), axis=1, kind='stable')[:, :k]
+        names = np.asarray(FEATURE_COLUMNS)[order]
+        values = np.char.mod('%+.2f', np.take_along_axis(self.values, order, axis=1))
+        factors = np.char.add(np.char.add(names, ' '), values)
+        text = factors[:, 0] if k else np.full(len(order), '')
+        for j in range(1, factors.shape[1]):
+            text = np.char.add(np.char.add(text, ', '), factors[:, j])
+        return text
+
+
+class TreeExplainer:
+    """
+    Explicateur TreeSHAP d'un modèle CatBoost ou XGBoost entraîné
+
+    Avec un fond de référence (matrice encodée), `importance` contient la
+    contribution absolue moyenne de chaque variable sur ce fond ; son
+    calcul sert aussi de préchauffage avant la première explication.
+    """
+
+    def __init__(self, name, model, background=None):
+        self.name = name
+        self.model = model
+        self.kind = type(model).__name__
+        if self.kind == 'XGBClassifier':
+            self._booster = model.get_booster()
+        elif self.kind != 'CatBoostClassifier':
+            raise ValueError(f"TreeSHAP non disponible pour {self.kind}")
+
+        self.base_value = float(self._contributions(np.zeros((1, len(FEATURE_COLUMNS)), np.float32))[0, -1])
+        self.importance = None
+        if background is not None and len(background):
+            values = self.explain(background).values
+            self.importance = pd.Series(np.abs(values).mean(axis=0), index=FEATURE_COLUMNS) \
+                .sort_values(ascending=False)
+
+    def explain(self, features):
+        """Explication d'une matrice encodée (ordre de FEATURE_COLUMNS), un seul appel au modèle"""
+        features = np.atleast_2d(np.asarray(features, dtype=np.float32))
+        if not len(features):
+            return Explanation(self.name, np.empty((0, len(FEATURE_COLUMNS))), self.base_value)
+        contributions = self._contributions(features)
+        return Explanation(self.name, contributions[:, :-1], self.base_value)
+
+    def _contributions(self, features):
+        """Matrice (n, 14) : contributions des 13 variables puis valeur de base"""
+        if self.kind == 'XGBClassifier':
+            import xgboost as xgb
+
+            matrix = xgb.DMatrix(features, feature_names=self._booster.feature_names)
+            return self._booster.predict(matrix, pred_contribs=True, validate_features=False)
+
+        from catboost import Pool
+
+        return self.model.get_feature_importance(Pool(features), type='ShapValues')
+
+
+def load_background(path=BACKGROUND_FILE, size=BACKGROUND_SIZE, random_state=42):
+    """
+    Échantillon encodé de `size` patients du jeu d'entraînement (None si absent)
+    """
+    try:
+        data = load_table(path, columns=FEATURE_COLUMNS)
+    except (FileNotFoundError, ValueError):
+        return None
+    features = encode_batch(data)
+    if len(features) > size:
+        rng = np.random.default_rng(random_state)
+        features = features[np.sort(rng.choice(len(features), size, replace=False))]
+    return features
+
+
+def load_explainer(name, model_files=MODEL_FILES, background=None):
+    """Explicateur du modèle `name`, chargé depuis son pickle (pas la version compilée)"""
+    if name not in EXPLAINABLE_MODELS:
+        raise ValueError(f"Pas d'explication TreeSHAP pour le modèle {name}")
+    return TreeExplainer(name, joblib.load(model_files[name]), background)
+
+
+def explanation_frame(explanation, index=None, k=DEFAULT_TOP_FACTORS):
+    """
+    Colonnes d'explication d'un lot : facteurs principaux de chaque patient
+    """
+    return pd.DataFrame(
+        {f'facteurs_{explanation.model_name}': explanation.top_factors(k)},
+        index=index if index is not None else pd.RangeIndex(len(explanation.values))
+    )
@@ -0,0 +1,149 @@
+"""
+Diagnostic par lot réparti sur plusieurs processus
+
+Chaque processus de calcul charge les modèles une seule fois, à son
+démarrage, via ModelRegistry : les modèles compilés sont ouverts en
+mémoire mappée et leurs pages sont partagées par tous les processus. Les
+lots ne sont pas sérialisés : la matrice encodée et les probabilités
+transitent par deux tampons de mémoire partagée, chaque processus lisant
+et écrivant sa propre tranche de lignes, ce qui garde l'ordre d'origine.
+"""
+
+import math
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from src.models.compiled import COMPILED_DIR
+from src.models.ensemble import MAIN_MODEL, EnsemblePredictor, EnsembleResult
+from src.models.registry import MODEL_FILES, ModelRegistry
+
+# Nombre minimal de lignes par tranche envoyée à un processus
+MIN_SHARD_ROWS = 1000
+
+# État d'un processus de calcul (modèles et tampons partagés ouverts)
+_worker = {}
+
+
+def _init_worker(model_names, model_files, compiled_dir, prefer_compiled):
+    from threadpoolctl import threadpool_limits
+
+    # Un seul thread de calcul par processus : le parallélisme vient des processus
+    threadpool_limits(limits=1)
+    registry = ModelRegistry(model_files, compiled_dir, prefer_compiled=prefer_compiled)
+    models = {name: registry.get(name) for name in model_names}
+    _worker['predictor'] = EnsemblePredictor(models)
+    _worker['buffers'] = {}
+
+
+def _attach(role, name, shape, dtype):
+    """Tableau NumPy sur le tampon partagé `name` (ouvert une fois par processus)"""
+    buffers = _worker['buffers']
+    if role not in buffers or buffers[role][0] != name:
+        if role in buffers:
+            buffers[role][1].close()
+        # Le tampon appartient au processus principal, qui le libère (unlink)
+        buffers[role] = (name, SharedMemory(name=name))
+    return np.ndarray(shape, dtype=dtype, buffer=buffers[role][1].buf)
+
+
+def _score_shard(input_name, output_name, capacity, n_features, n_models, start, stop):
+    features = _attach('input', input_name, (capacity, n_features), np.float32)
+    probabilities = _attach('output', output_name, (capacity, n_models), np.float64)
+    result = _worker['predictor'].predict(features[start:stop], strict=True)
+    probabilities[start:stop] = result.probabilities
+    return stop - start
+
+
+def _worker_ready():
+    return 'predictor' in _worker
+
+
+class ParallelPredictor:
+    """
+    Équivalent d'EnsemblePredictor réparti sur `workers` processus
+
+    `model_names` liste les modèles que chaque processus charge depuis
+    MODEL_FILES / COMPILED_DIR. `predict` découpe la matrice en tranches
+    contiguës (une par processus, au moins MIN_SHARD_ROWS lignes) et
+    retourne un EnsembleResult dans l'ordre des lignes. Une erreur d'un
+    modèle est toujours propagée (strict). À fermer avec close() ou
+    dans un bloc with.
+    """
+
+    def __init__(self, model_names, workers=None, main_model=MAIN_MODEL, model_files=MODEL_FILES,
+                 compiled_dir=COMPILED_DIR, prefer_compiled=True):
+        self.models = list(model_names)
+        self.main_model = main_model if main_model in self.models else self.models[0]
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(
+            self.workers,
+            mp_context=mp.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.models, dict(model_files), str(compiled_dir), prefer_compiled)
+        )
+        self._capacity = 0
+        self._input = None
+        self._output = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def warm_up(self):
+        """Démarre tous les processus (chargement des modèles) avant le premier lot"""
+        futures = [self._pool.submit(_worker_ready) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def predict(self, features, strict=True):
+        features = np.asarray(features, dtype=np.float32)
+        n_rows, n_features = features.shape
+        n_models = len(self.models)
+        if not n_rows:
+            return EnsembleResult(self.models, np.empty((0, n_models)), self.main_model)
+
+        with self._lock:
+            self._reserve(n_rows, n_features, n_models)
+            inputs = np.ndarray((self._capacity, n_features), dtype=np.float32, buffer=self._input.buf)
+            outputs = np.ndarray((self._capacity, n_models), dtype=np.float64, buffer=self._output.buf)
+            inputs[:n_rows] = features
+
+            shard_rows = max(MIN_SHARD_ROWS, math.ceil(n_rows / self.workers))
+            futures = [
+                self._pool.submit(_score_shard, self._input.name, self._output.name, self._capacity,
+                                  n_features, n_models, start, min(start + shard_rows, n_rows))
+                for start in range(0, n_rows, shard_rows)
+            ]
+            for future in futures:
+                future.result()
+            probabilities = outputs[:n_rows].copy()
+
+        return EnsembleResult(self.models, probabilities, self.main_model)
+
+    def close(self):
+        self._pool.shutdown()
+        self._release()
+
+    def _reserve(self, n_rows, n_features, n_models):
+        if n_rows <= self._capacity:
+            return
+        self._release()
+        self._input = SharedMemory(create=True, size=n_rows * n_features * np.dtype(np.float32).itemsize)
+        self._output = SharedMemory(create=True, size=n_rows * n_models * np.dtype(np.float64).itemsize)
+        self._capacity = n_rows
+
+    def _release(self):
+        for shm in (self._input, self._output):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._input = self._output = None
+        self._capacity = 0
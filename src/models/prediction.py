@@ -0,0 +1,137 @@
+"""
+Inférence des modèles de diagnostic cardiaque
+
+Fonctions partagées par la page Diagnostic (mode lot) et par la commande
+`python start.py --score`. Les modèles sont appelés une fois par bloc de
+lignes plutôt qu'une fois par patient.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.data.preprocessing import encode_batch
+from src.models import drift
+from src.models.cache import CachedPredictor
+from src.models.ensemble import MAIN_MODEL, EnsemblePredictor, EnsembleResult, shared_executor
+from src.models.explanation import explanation_frame
+from src.models.registry import ModelRegistry
+
+# Seuils d'interprétation du risque
+HIGH_RISK_THRESHOLD = 0.7
+MODERATE_RISK_THRESHOLD = 0.3
+
+# Taille par défaut des blocs envoyés aux modèles
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def load_models(prefer_compiled=True):
+    """
+    Charge les modèles disponibles (voir ModelRegistry)
+
+    Les versions compilées (models/compiled/<nom>/) sont préférées aux
+    pickles : chargement quasi instantané et pas d'import de catboost ni de
+    xgboost. Un modèle qui ne peut pas être chargé est simplement écarté ;
+    lève FileNotFoundError si aucun modèle n'est disponible.
+    """
+    registry = ModelRegistry(prefer_compiled=prefer_compiled)
+    models = registry.load_available()
+    if not models:
+        raise FileNotFoundError("Aucun modèle disponible: " + "; ".join(registry.errors.values()))
+    return models
+
+
+def risk_levels(probabilities):
+    """
+    Niveau de risque (élevé, modéré, faible) pour un vecteur de probabilités
+    """
+    probabilities = np.asarray(probabilities)
+    return np.select(
+        [probabilities >= HIGH_RISK_THRESHOLD, probabilities >= MODERATE_RISK_THRESHOLD],
+        ['élevé', 'modéré'],
+        default='faible'
+    )
+
+
+def predict_batch(models, features, chunk_size=DEFAULT_CHUNK_SIZE, index=None, cache=None,
+                  predictor=None, observe_drift=False):
+    """
+    Prédit un lot de patients déjà encodés avec tous les modèles
+
+    `features` est la matrice produite par FeatureEncoder (colonnes dans
+    l'ordre de FEATURE_COLUMNS). Chaque modèle est appelé une seule fois
+    (predict_proba) par bloc de `chunk_size` lignes, les modèles d'un même
+    bloc étant évalués en parallèle sur le pool partagé. Avec un
+    PredictionCache, les doublons et les patients déjà vus ne repassent pas
+    par les modèles. `predictor` remplace l'EnsemblePredictor par défaut
+    (par exemple un ParallelPredictor multi-processus, ou un
+    CascadePredictor, qui porte alors son propre cache). Retourne un
+    DataFrame avec, pour chaque modèle, la prédiction et la probabilité,
+    puis la probabilité principale, la confiance et le niveau de risque ;
+    en cascade, une colonne `escalade` indique les patients évalués par
+    tout l'ensemble (prédiction -1 et probabilité vide pour les modèles
+    non évalués). Avec `observe_drift`, le lot alimente la surveillance de
+    la dérive du processus (voir src/models/drift.py) : réservé aux
+    processus qui servent les diagnostics (application, API), un scoring
+    hors ligne (`start.py --score`) n'ayant personne pour la lire.
+    """
+    if predictor is None:
+        predictor = EnsemblePredictor(models, executor=shared_executor())
+    if cache is not None:
+        predictor = CachedPredictor(predictor, cache)
+    model_names = list(models)
+    n_rows = len(features)
+
+    probabilities = np.empty((n_rows, len(model_names)))
+    escalated = None
+    first_stage = None
+    for start in range(0, n_rows, chunk_size):
+        chunk = predictor.predict(features[start:start + chunk_size], strict=True)
+        stop = start + len(chunk.probabilities)
+        probabilities[start:stop] = chunk.probabilities
+        if chunk.escalated is not None:
+            if escalated is None:
+                escalated = np.ones(n_rows, dtype=bool)
+            escalated[start:stop] = chunk.escalated
+            first_stage = chunk.first_stage
+
+    main_model = MAIN_MODEL if MAIN_MODEL in models else model_names[0]
+    result = EnsembleResult(model_names, probabilities, main_model, escalated=escalated,
+                            first_stage=first_stage)
+    # Après le scoring : un lot en échec n'entre pas dans la surveillance
+    if observe_drift:
+        drift.observe(features)
+
+    results = pd.DataFrame(index=index if index is not None else pd.RangeIndex(n_rows))
+    predictions = result.predictions
+    for j, name in enumerate(model_names):
+        results[f'prediction_{name}'] = predictions[:, j]
+        results[f'probabilite_{name}'] = probabilities[:, j]
+
+    results['probabilite'] = result.main_probability
+    # Même définition que le diagnostic individuel : 1 - écart-type entre modèles
+    results['confiance'] = result.confidence
+    results['niveau_risque'] = risk_levels(results['probabilite'].to_numpy())
+    if escalated is not None:
+        results['escalade'] = escalated
+
+    return results
+
+
+def score_dataframe(models, data, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, predictor=None,
+                    explainer=None, observe_drift=False):
+    """
+    Encode et prédit un lot brut (format data/sample_data.csv)
+
+    Retourne les données d'origine suivies des colonnes de prédiction. Avec
+    un `explainer` (TreeExplainer), une colonne facteurs_<modèle> donne les
+    variables les plus influentes de chaque patient, calculées pour tout le
+    lot en un appel. `observe_drift` : voir predict_batch.
+    """
+    features = encode_batch(data)
+    results = predict_batch(models, features, chunk_size=chunk_size, index=data.index, cache=cache,
+                            predictor=predictor, observe_drift=observe_drift)
+    frames = [data, results]
+    if explainer is not None:
+        frames.append(explanation_frame(explainer.explain(features), index=data.index))
+    return pd.concat(frames, axis=1)
+
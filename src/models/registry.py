@@ -0,0 +1,146 @@
+"""
+Registre des modèles avec chargement paresseux
+
+Chaque modèle est chargé à sa première utilisation, indépendamment des
+autres : un fichier manquant ou corrompu n'écarte que ce modèle. Les
+modèles compilés (models/compiled/<nom>/) sont ouverts en mémoire mappée,
+les pickles joblib avec mmap_mode='r' quand c'est possible, pour que les
+processus d'un même serveur partagent les pages via le cache du système.
+Une version compilée dont l'empreinte ne correspond plus au pickle (modèle
+réentraîné sans recompilation) est ignorée au profit du pickle.
+"""
+
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+import joblib
+
+from src.models.compiled import COMPILED_DIR, compiled_source_digest, load_compiled
+from src.utils.helpers import file_digest, file_fingerprint
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Fichiers des modèles entraînés par le notebook
+MODEL_FILES = {
+    'catboost': 'models/catboost_model.pkl',
+    'xgboost': 'models/xgboost_model.pkl',
+    'random_forest': 'models/random_forest_model.pkl',
+    'logistic_regression': 'models/logistic_regression_model.pkl'
+}
+
+
+class ModelRegistry:
+    """
+    Accès paresseux et thread-safe aux modèles de MODEL_FILES
+
+    `get` charge un modèle au premier appel puis le garde en mémoire ;
+    `load_available` retourne tous les modèles chargeables et consigne les
+    échecs dans `errors` ({nom: message}).
+    """
+
+    def __init__(self, model_files=MODEL_FILES, compiled_dir=COMPILED_DIR,
+                 prefer_compiled=True, mmap=True):
+        self.model_files = dict(model_files)
+        self.compiled_dir = Path(compiled_dir)
+        self.prefer_compiled = prefer_compiled
+        self.mmap = mmap
+        self.errors = {}
+        self._models = {}
+        self._fingerprints = {}
+        self._locks = {name: threading.Lock() for name in self.model_files}
+
+    @property
+    def names(self):
+        return list(self.model_files)
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def get(self, name):
+        """
+        Retourne le modèle `name`, en le chargeant si nécessaire
+
+        Lève KeyError pour un nom inconnu et propage l'erreur de chargement
+        (FileNotFoundError...) après l'avoir consignée dans `errors`.
+        """
+        if name in self._models:
+            return self._models[name]
+
+        with self._locks[name]:
+            if name not in self._models:
+                try:
+                    with metrics.span('model_load', model=name):
+                        self._models[name] = self._load(name)
+                except Exception as e:
+                    self.errors[name] = str(e)
+                    raise
+                self.errors.pop(name, None)
+        return self._models[name]
+
+    def load_available(self):
+        """Dict {nom: modèle} des modèles chargeables, dans l'ordre de MODEL_FILES"""
+        models = {}
+        for name in self.model_files:
+            try:
+                models[name] = self.get(name)
+            except Exception:
+                continue
+        return models
+
+    def status(self):
+        """État de chaque modèle : 'chargé', 'non chargé' ou le message d'erreur"""
+        return {
+            name: 'chargé' if name in self._models else self.errors.get(name, 'non chargé')
+            for name in self.model_files
+        }
+
+    def version(self):
+        """
+        Empreinte des modèles chargés (nom, fichier, taille, date de modification)
+
+        Change dès qu'un modèle est réentraîné, recompilé ou devient
+        indisponible ; sert de clé de version au cache des prédictions.
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        for name in sorted(self._fingerprints):
+            digest.update(f'{name}:{self._fingerprints[name]};'.encode())
+        return digest.hexdigest()
+
+    def versions(self):
+        """Version de chaque modèle chargé ({nom: empreinte de son fichier}), pour l'audit"""
+        return {
+            name: hashlib.blake2b(fingerprint.encode(), digest_size=8).hexdigest()
+            for name, fingerprint in self._fingerprints.items()
+        }
+
+    def _compiled_is_current(self, name, compiled_path):
+        """
+        Vrai si la version compilée a été produite à partir du pickle actuel
+
+        Sans pickle à comparer (déploiement des seuls modèles compilés), la
+        version compilée est conservée.
+        """
+        source = Path(self.model_files[name])
+        if not source.exists():
+            return True
+        if compiled_source_digest(compiled_path) == file_digest(source):
+            return True
+        logger.warning("Modèle compilé %s périmé ou sans empreinte (pickle %s modifié), "
+                       "chargement du pickle ; relancez python start.py --export", name, source)
+        return False
+
+    def _load(self, name):
+        compiled_path = self.compiled_dir / name
+        if (self.prefer_compiled and (compiled_path / 'meta.json').exists()
+                and self._compiled_is_current(name, compiled_path)):
+            source = compiled_path / 'meta.json'
+            model = load_compiled(compiled_path, mmap=self.mmap)
+        else:
+            source = Path(self.model_files[name])
+            # mmap_mode n'a d'effet que sur les tableaux NumPy d'un pickle non compressé
+            model = joblib.load(source, mmap_mode='r' if self.mmap else None)
+        self._fingerprints[name] = file_fingerprint(source)
+        return model
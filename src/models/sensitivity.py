@@ -0,0 +1,124 @@
+"""
+Analyses « et si » : sensibilité du risque à une ou deux variables
+
+Les autres variables restent fixées aux valeurs du patient ; la ou les
+variables balayées parcourent leur plage du formulaire (ou leurs codes
+pour une variable catégorielle). Toute la grille est construite en une
+seule matrice encodée, évaluée par un appel predict_proba par modèle :
+un balayage de 100 × 100 points coûte autant qu'un lot de 10 000
+patients. Le balayage utilise l'ensemble complet, sans le cache des
+prédictions ni la cascade (dont les courbes seraient discontinues).
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.data.preprocessing import CATEGORICAL_MAPPINGS, FEATURE_COLUMNS
+from src.data.validation import ALLOWED_CODES, MEASUREMENT_RANGES
+from src.utils.metrics import metrics
+
+# Nombre de points par variable balayée
+SWEEP_POINTS = 100
+
+# Variables balayables : mesures du formulaire, puis variables catégorielles
+SWEEPABLE_FEATURES = [col for col in FEATURE_COLUMNS if col in MEASUREMENT_RANGES] + \
+    [col for col in FEATURE_COLUMNS if col in CATEGORICAL_MAPPINGS]
+
+# Décimales des champs du formulaire (entiers par défaut)
+FORM_DECIMALS = {'oldpeak': 1}
+
+
+@dataclass
+class Sweep:
+    """
+    Probabilités d'un balayage
+
+    Une variable : `probabilities` (n_x, n_modèles) et `main_probability`
+    (n_x,). Deux variables : (n_y, n_x, n_modèles) et (n_y, n_x), une
+    ligne par valeur de `y_feature`.
+    """
+    x_feature: str
+    x_values: np.ndarray
+    model_names: list
+    main_model: str
+    probabilities: np.ndarray
+    main_probability: np.ndarray
+    y_feature: str = None
+    y_values: np.ndarray = None
+    duration: float = 0.0
+
+    @property
+    def size(self):
+        return self.main_probability.size
+
+
+def is_categorical(col):
+    return col in CATEGORICAL_MAPPINGS
+
+
+def sweep_values(col, points=SWEEP_POINTS, low=None, high=None):
+    """
+    Valeurs balayées de `col` : codes admis d'une variable catégorielle, ou
+    `points` valeurs régulières de [low, high] (plage du formulaire par
+    défaut), arrondies à la précision du formulaire et sans doublon
+    """
+    if is_categorical(col):
+        return np.asarray(ALLOWED_CODES[col], dtype=np.float32)
+    range_low, range_high = MEASUREMENT_RANGES[col]
+    low = range_low if low is None else low
+    high = range_high if high is None else high
+    values = np.round(np.linspace(low, high, max(points, 2)), FORM_DECIMALS.get(col, 0))
+    return np.unique(values).astype(np.float32)
+
+
+def value_labels(col, values):
+    """Libellés du formulaire pour les codes d'une variable catégorielle, valeurs sinon"""
+    if not is_categorical(col):
+        return list(values)
+    names = {code: label for label, code in CATEGORICAL_MAPPINGS[col].items()}
+    return [names.get(int(value), str(value)) for value in values]
+
+
+def sweep_grid(base, x_feature, x_values, y_feature=None, y_values=None):
+    """
+    Matrice encodée de la grille : le patient `base` (1, 13) répété, avec
+    la colonne `x_feature` (et `y_feature`) remplacée par les valeurs
+    balayées. En deux dimensions, la ligne y_i * n_x + x_j correspond au
+    point (x_j, y_i).
+    """
+    base = np.asarray(base, dtype=np.float32).reshape(1, len(FEATURE_COLUMNS))
+    x_values = np.asarray(x_values, dtype=np.float32)
+    x_index = FEATURE_COLUMNS.index(x_feature)
+    if y_feature is None:
+        grid = np.repeat(base, len(x_values), axis=0)
+        grid[:, x_index] = x_values
+        return grid
+
+    if y_feature == x_feature:
+        raise ValueError("Les deux variables balayées doivent être différentes")
+    y_values = np.asarray(y_values, dtype=np.float32)
+    grid = np.repeat(base, len(x_values) * len(y_values), axis=0)
+    grid[:, x_index] = np.tile(x_values, len(y_values))
+    grid[:, FEATURE_COLUMNS.index(y_feature)] = np.repeat(y_values, len(x_values))
+    return grid
+
+
+def run_sweep(predictor, base, x_feature, x_values, y_feature=None, y_values=None):
+    """
+    Évalue la grille avec `predictor` (EnsemblePredictor), un appel par
+    modèle pour toute la grille ; retourne un Sweep
+    """
+    start = time.perf_counter()
+    with metrics.span('what_if', dims=1 if y_feature is None else 2):
+        grid = sweep_grid(base, x_feature, x_values, y_feature, y_values)
+        result = predictor.predict(grid, strict=True)
+    shape = (len(x_values),) if y_feature is None else (len(y_values), len(x_values))
+    return Sweep(
+        x_feature, np.asarray(x_values), result.model_names, result.main_model,
+        result.probabilities.reshape(*shape, len(result.model_names)),
+        result.main_probability.reshape(shape),
+        y_feature, None if y_values is None else np.asarray(y_values),
+        time.perf_counter() - start
+    )
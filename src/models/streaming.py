@@ -0,0 +1,215 @@
+"""
+Diagnostic en continu de fichiers plus grands que la mémoire
+
+Le fichier d'entrée (CSV, Parquet ou Arrow IPC) est lu par blocs de taille
+fixe ; chaque bloc est encodé, évalué par tous les modèles
+(score_dataframe) puis écrit aussitôt. La mémoire utilisée dépend de la
+taille des blocs, pas de celle du fichier.
+
+Après chaque bloc, un point de reprise (<sortie>.progress.json) enregistre
+le nombre de blocs terminés : une exécution interrompue reprend au bloc
+suivant, tant que le fichier d'entrée, les modèles, la taille des blocs
+et les réglages de la cascade n'ont pas changé.
+"""
+
+import itertools
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.data.storage import table_format
+from src.models.cascade import CascadePredictor
+from src.models.prediction import score_dataframe
+from src.utils.helpers import file_fingerprint
+
+# Nombre de lignes lues et écrites par bloc
+DEFAULT_STREAM_CHUNK_SIZE = 50000
+
+
+def count_rows(path):
+    """Nombre de lignes d'un fichier Parquet ou Arrow (None pour un CSV)"""
+    fmt = table_format(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(path).metadata.num_rows
+    if fmt == 'arrow':
+        import pyarrow as pa
+
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).read_all().num_rows
+    return None
+
+
+def iter_chunks(path, chunk_size, skip_chunks=0):
+    """
+    DataFrames successifs de `chunk_size` lignes, à partir du bloc `skip_chunks`
+    """
+    fmt = table_format(path)
+    if fmt == 'csv':
+        skip_rows = skip_chunks * chunk_size
+        skiprows = (lambda i: 0 < i <= skip_rows) if skip_rows else None
+        with pd.read_csv(path, chunksize=chunk_size, skiprows=skiprows) as reader:
+            yield from reader
+        return
+
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+        for batch in itertools.islice(batches, skip_chunks, None):
+            yield batch.to_pandas()
+        return
+
+    import pyarrow as pa
+
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+        for batch in table.slice(skip_chunks * chunk_size).to_batches(max_chunksize=chunk_size):
+            yield batch.to_pandas()
+
+
+class _CsvOutput:
+    """Sortie CSV unique, complétée bloc par bloc"""
+
+    def __init__(self, path, resume_bytes=None):
+        self.path = Path(path)
+        if resume_bytes is None:
+            self.file = open(self.path, 'w', newline='')
+        else:
+            # Un bloc écrit en partie avant l'interruption est tronqué
+            self.file = open(self.path, 'r+', newline='')
+            self.file.truncate(resume_bytes)
+            self.file.seek(resume_bytes)
+
+    def write(self, index, chunk):
+        chunk.to_csv(self.file, header=self.file.tell() == 0, index=False)
+        self.file.flush()
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetOutput:
+    """Sortie Parquet : un dossier contenant un fichier par bloc (lisible par pd.read_parquet)"""
+
+    def __init__(self, path, resume_chunks=None):
+        self.path = Path(path)
+        if resume_chunks is None:
+            if self.path.exists():
+                shutil.rmtree(self.path) if self.path.is_dir() else self.path.unlink()
+            self.path.mkdir(parents=True)
+        else:
+            for part in self.path.glob('part-*.parquet'):
+                if int(part.stem.split('-')[1]) >= resume_chunks:
+                    part.unlink()
+
+    def write(self, index, chunk):
+        part = self.path / f'part-{index:06d}.parquet'
+        tmp_part = part.with_name(f'.{part.name}.tmp')
+        chunk.to_parquet(tmp_part, index=False)
+        os.replace(tmp_part, part)
+        return None
+
+    def close(self):
+        pass
+
+
+def checkpoint_path(output_path):
+    output_path = Path(output_path)
+    return output_path.with_name(f'{output_path.name}.progress.json')
+
+
+def _load_checkpoint(path, expected):
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if any(state.get(key) != value for key, value in expected.items()):
+        return None
+    return state
+
+
+def _save_checkpoint(path, state):
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def stream_score(input_path, output_path, models, chunk_size=DEFAULT_STREAM_CHUNK_SIZE,
+                 cache=None, model_version='', resume=True, on_progress=None, predictor=None,
+                 explainer=None):
+    """
+    Score `input_path` bloc par bloc et écrit le résultat dans `output_path`
+
+    La sortie est un CSV si `output_path` se termine par .csv, sinon un
+    dossier Parquet (un fichier par bloc). `on_progress(progress)` est
+    appelé après chaque bloc avec un dict (blocs, lignes, lignes_totales,
+    secondes, lignes_par_s). Avec `resume`, une exécution précédente
+    interrompue sur les mêmes entrées reprend au dernier bloc terminé.
+
+    Retourne le même dict pour l'ensemble du fichier, avec le nombre de
+    lignes reprises d'une exécution précédente. `predictor` est transmis à
+    score_dataframe (ParallelPredictor pour répartir chaque bloc sur
+    plusieurs processus, CascadePredictor), comme `explainer` (facteurs principaux de chaque
+    patient).
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    csv_output = table_format(output_path) == 'csv'
+    progress_file = checkpoint_path(output_path)
+    expected = {
+        'input': file_fingerprint(input_path),
+        'models': model_version,
+        'chunk_size': chunk_size,
+        'output': str(output_path),
+        'explainer': explainer.name if explainer is not None else None,
+        'cascade': predictor.settings() if isinstance(predictor, CascadePredictor) else None
+    }
+
+    state = _load_checkpoint(progress_file, expected) if resume and output_path.exists() else None
+    if state is None:
+        state = {**expected, 'chunks': 0, 'rows': 0, 'output_bytes': 0}
+        output = _CsvOutput(output_path) if csv_output else _ParquetOutput(output_path)
+    elif csv_output:
+        output = _CsvOutput(output_path, resume_bytes=state['output_bytes'])
+    else:
+        output = _ParquetOutput(output_path, resume_chunks=state['chunks'])
+
+    total_rows = count_rows(input_path)
+    resumed_rows = state['rows']
+    start_time = time.perf_counter()
+
+    def progress():
+        elapsed = time.perf_counter() - start_time
+        return {
+            'blocs': state['chunks'],
+            'lignes': state['rows'],
+            'lignes_totales': total_rows,
+            'lignes_reprises': resumed_rows,
+            'secondes': elapsed,
+            'lignes_par_s': (state['rows'] - resumed_rows) / elapsed if elapsed > 0 else 0.0
+        }
+
+    try:
+        for chunk in iter_chunks(input_path, chunk_size, skip_chunks=state['chunks']):
+            scored = score_dataframe(models, chunk, chunk_size=chunk_size, cache=cache,
+                                     predictor=predictor, explainer=explainer)
+            output_bytes = output.write(state['chunks'], scored)
+            state['chunks'] += 1
+            state['rows'] += len(chunk)
+            state['output_bytes'] = output_bytes
+            _save_checkpoint(progress_file, state)
+            if on_progress is not None:
+                on_progress(progress())
+    finally:
+        output.close()
+
+    progress_file.unlink(missing_ok=True)
+    return progress()
@@ -0,0 +1,385 @@
+"""
+Pipeline d'entraînement des modèles
+
+Remplace l'exécution du notebook par `python start.py --train` :
+- prétraitement (encodage, séparation train/test) mis en cache dans
+  data/processed tant que les données et sa configuration ne changent pas ;
+- familles de modèles entraînées en parallèle, un processus chacune, la
+  recherche d'hyperparamètres utilisant les cœurs restants (successive
+  halving par défaut, sur le nombre d'arbres pour XGBoost et CatBoost) ;
+- modèle ignoré si l'empreinte des données et de sa configuration est
+  celle de son dernier entraînement (models/training_manifest.json).
+
+Usage:
+    python -m src.models.training --config config/training_config.yaml
+    python -m src.models.training --models xgboost catboost --force
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing as mp
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import pandas as pd
+import yaml
+
+from src.data.preprocessing import FEATURE_COLUMNS
+from src.data.storage import read_table, write_table
+from src.models.ensemble import DECISION_THRESHOLD
+from src.models.registry import MODEL_FILES
+
+DEFAULT_CONFIG_PATH = 'config/training_config.yaml'
+
+MANIFEST_FILE = 'training_manifest.json'
+PREPROCESSING_FILE = 'preprocessing.json'
+
+# Libellés du jeu de données brut -> codes d'entraînement (cf. notebook d'analyse)
+RAW_LABEL_MAPPINGS = {
+    'sex': {'M': 1, 'F': 0},
+    'cp': {'typical angina': 0, 'atypical angina': 1, 'non-anginal pain': 2, 'asymptomatic': 3},
+    'fbs': {True: 1, False: 0, 'True': 1, 'False': 0, 'TRUE': 1, 'FALSE': 0},
+    'restecg': {'normal': 0, 'st-t abnormality': 1, 'lv hypertrophy': 2},
+    'exang': {True: 1, False: 0, 'True': 1, 'False': 0, 'TRUE': 1, 'FALSE': 0},
+    'slope': {'upsloping': 0, 'flat': 1, 'downsloping': 2},
+    'thal': {'normal': 3, 'fixed defect': 6, 'reversable defect': 7}
+}
+
+# Métriques de test, dans l'ordre du tableau du notebook
+METRICS = ['Accuracy', 'Precision', 'Recall', 'F1-Score', 'AUC']
+
+# Successive halving sur les échantillons : lignes de la classe la plus rare
+# attendues dans chaque pli de test dès le premier tour
+MIN_SAMPLES_PER_CLASS = 10
+
+
+def load_config(path=DEFAULT_CONFIG_PATH):
+    with open(path, encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def file_digest(path):
+    """Empreinte du contenu d'un fichier"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def config_digest(*parts):
+    """Empreinte stable d'objets JSON (dicts triés par clé)"""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_json(path, content):
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(content, f, indent=2, ensure_ascii=False, default=str)
+    os.replace(tmp_path, path)
+
+
+def encode_raw_labels(data):
+    """Remplace les libellés du jeu brut par les codes ; les colonnes numériques sont gardées"""
+    data = data.copy()
+    for col, mapping in RAW_LABEL_MAPPINGS.items():
+        if col in data.columns and not pd.api.types.is_numeric_dtype(data[col]):
+            data[col] = data[col].map(mapping)
+        elif col in data.columns and pd.api.types.is_bool_dtype(data[col]):
+            data[col] = data[col].astype(int)
+    return data
+
+
+def prepare_data(data_config):
+    """
+    Encode le jeu de données et le sépare en train/test (Parquet)
+
+    Réutilise les fichiers de `processed_dir` si le contenu des données et
+    la configuration sont ceux du dernier prétraitement. Retourne
+    ({'X_train': chemin, ...}, empreinte, réutilisé).
+    """
+    from sklearn.model_selection import train_test_split
+
+    processed_dir = Path(data_config.get('processed_dir', 'data/processed'))
+    paths = {name: processed_dir / f'{name}.parquet' for name in ('X_train', 'X_test', 'y_train', 'y_test')}
+    digest = config_digest(file_digest(data_config['path']), data_config)
+
+    manifest_path = processed_dir / PREPROCESSING_FILE
+    if _read_json(manifest_path).get('hash') == digest and all(path.exists() for path in paths.values()):
+        return paths, digest, True
+
+    data = encode_raw_labels(read_table(data_config['path']))
+    target = data_config.get('target', 'target')
+    missing = [col for col in FEATURE_COLUMNS + [target] if col not in data.columns]
+    if missing:
+        raise ValueError(f"Colonnes manquantes dans {data_config['path']}: {', '.join(missing)}")
+    data = data.dropna(subset=FEATURE_COLUMNS + [target])
+
+    X, y = data[FEATURE_COLUMNS], (data[target] > 0).astype(int).rename('target')
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=data_config.get('test_size', 0.2),
+        random_state=data_config.get('random_state', 42), stratify=y
+    )
+    for name, table in zip(paths, (X_train, X_test, y_train, y_test)):
+        write_table(table, paths[name])
+    _write_json(manifest_path, {'hash': digest, 'source': str(data_config['path']), 'rows': len(data)})
+    return paths, digest, False
+
+
+def build_estimator(name, params, n_jobs=1):
+    """Modèle non entraîné de la famille `name` (un thread : le parallélisme est dans la recherche)"""
+    params = dict(params)
+    if name == 'logistic_regression':
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import StandardScaler
+
+        return Pipeline([('scaler', StandardScaler()), ('model', LogisticRegression(**params))])
+    if name == 'random_forest':
+        from sklearn.ensemble import RandomForestClassifier
+
+        return RandomForestClassifier(n_jobs=n_jobs, **params)
+    if name == 'xgboost':
+        from xgboost import XGBClassifier
+
+        return XGBClassifier(n_jobs=n_jobs, **params)
+    if name == 'catboost':
+        from catboost import CatBoostClassifier
+
+        return CatBoostClassifier(thread_count=n_jobs, **params)
+    raise ValueError(f"Famille de modèles inconnue: {name}")
+
+
+def halving_min_samples(y, cv):
+    """
+    Taille du premier tour du successive halving sur les échantillons
+
+    Les sous-échantillons de HalvingRandomSearchCV ne sont pas stratifiés :
+    un premier tour trop petit donne, sur des données déséquilibrées, des
+    plis d'une seule classe (roc_auc NaN). Le tour est dimensionné pour que
+    chaque pli de test contienne en moyenne MIN_SAMPLES_PER_CLASS lignes de
+    la classe la plus rare de `y` (deux classes équilibrées sans `y`).
+    """
+    if y is None:
+        return 2 * cv * MIN_SAMPLES_PER_CLASS
+    rarest = pd.Series(y).value_counts(normalize=True).min()
+    return min(math.ceil(cv * MIN_SAMPLES_PER_CLASS / rarest), len(y))
+
+
+def build_search(name, model_config, search_config, n_jobs, y=None):
+    """
+    Recherche d'hyperparamètres selon `search_config['method']`
+
+    Avec 'halving', la ressource augmentée à chaque tour est le nombre
+    d'échantillons ou, si `resource` est défini pour le modèle, le nombre
+    d'arbres (les candidats éliminés ne vont pas au-delà des premiers arbres).
+    Sur les échantillons, le premier tour vaut `min_resources` s'il est
+    configuré, sinon halving_min_samples(y).
+    """
+    params = dict(model_config.get('params') or {})
+    space = dict(model_config.get('search') or {})
+    resource = model_config.get('resource', 'n_samples')
+    if resource != 'n_samples':
+        params[resource] = model_config['max_resources']
+    if name == 'logistic_regression':
+        space = {f'model__{key}': values for key, values in space.items()}
+
+    estimator = build_estimator(name, params)
+    method = search_config.get('method', 'halving')
+    n_candidates = search_config.get('n_candidates', 20)
+    if all(isinstance(values, list) for values in space.values()):
+        from sklearn.model_selection import ParameterGrid
+
+        n_candidates = min(n_candidates, len(ParameterGrid(space)))
+    common = {'cv': search_config.get('cv', 5), 'scoring': search_config.get('scoring', 'roc_auc'), 'n_jobs': n_jobs}
+
+    if method == 'grid':
+        from sklearn.model_selection import GridSearchCV
+
+        return GridSearchCV(estimator, space, **common)
+    if method == 'random':
+        from sklearn.model_selection import RandomizedSearchCV
+
+        return RandomizedSearchCV(estimator, space, n_iter=n_candidates,
+                                  random_state=search_config.get('random_state', 42), **common)
+    if method == 'halving':
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingRandomSearchCV
+
+        min_resources = model_config.get('min_resources')
+        if min_resources is None:
+            min_resources = halving_min_samples(y, common['cv']) if resource == 'n_samples' else 'exhaust'
+        halving = {'resource': resource, 'factor': search_config.get('factor', 3),
+                   'min_resources': min_resources}
+        if resource != 'n_samples':
+            halving['max_resources'] = model_config['max_resources']
+        return HalvingRandomSearchCV(estimator, space, n_candidates=n_candidates,
+                                     random_state=search_config.get('random_state', 42), **halving, **common)
+    raise ValueError(f"Méthode de recherche inconnue: {method}")
+
+
+def evaluate(model, X_test, y_test):
+    """Métriques de test du notebook (seuil DECISION_THRESHOLD, comme les prédictions servies)"""
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+    probabilities = model.predict_proba(X_test)[:, 1]
+    predictions = (probabilities > DECISION_THRESHOLD).astype(int)
+    return {
+        'Accuracy': accuracy_score(y_test, predictions),
+        'Precision': precision_score(y_test, predictions, zero_division=0),
+        'Recall': recall_score(y_test, predictions),
+        'F1-Score': f1_score(y_test, predictions),
+        'AUC': roc_auc_score(y_test, probabilities)
+    }
+
+
+def train_model(name, model_config, search_config, data_paths, model_path, n_jobs):
+    """
+    Recherche, entraînement final et évaluation d'une famille de modèles
+
+    Exécuté dans un processus séparé ; le modèle est écrit directement dans
+    `model_path` et seul le résumé est retourné.
+    """
+    start = time.perf_counter()
+    X_train = read_table(data_paths['X_train'], columns=FEATURE_COLUMNS)
+    y_train = read_table(data_paths['y_train'])['target']
+    X_test = read_table(data_paths['X_test'], columns=FEATURE_COLUMNS)
+    y_test = read_table(data_paths['y_test'])['target']
+
+    search = build_search(name, model_config, search_config, n_jobs, y=y_train)
+    search.fit(X_train, y_train)
+    model = search.best_estimator_
+
+    model_path = Path(model_path)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = model_path.with_name(f'.{model_path.name}.tmp')
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, model_path)
+
+    return {
+        'cv_score': float(search.best_score_),
+        'best_params': search.best_params_,
+        'metrics': evaluate(model, X_test, y_test),
+        'seconds': time.perf_counter() - start
+    }
+
+
+def export_compiled(names, output_dir, data_paths, log=print):
+    """Recompile les modèles réentraînés ; une version compilée périmée est supprimée"""
+    from src.data.preprocessing import encode_batch
+    from src.models.compiled import export_compiled_models
+
+    compiled_dir = Path(output_dir) / 'compiled'
+    reference = encode_batch(read_table(data_paths['X_test'], columns=FEATURE_COLUMNS))
+    for name in names:
+        source = Path(output_dir) / Path(MODEL_FILES[name]).name
+        model = joblib.load(source)
+        try:
+            error = export_compiled_models({name: model}, compiled_dir, reference,
+                                           sources={name: source})[name]
+            log(f"📦 {name} compilé (écart max: {error:.2e})")
+        except ValueError as e:
+            shutil.rmtree(compiled_dir / name, ignore_errors=True)
+            log(f"⚠️  {name} non compilé: {e}")
+
+
+def run_training(config_path=DEFAULT_CONFIG_PATH, model_names=None, force=False, log=print):
+    """
+    Entraîne les modèles de la configuration qui ont changé
+
+    Retourne {modèle: {'statut': 'entraîné' | 'inchangé', 'metrics': ...}}.
+    """
+    config = load_config(config_path)
+    data_config, search_config = config['data'], config.get('search', {})
+    training_config = config.get('training', {})
+    output_dir = Path(training_config.get('output_dir', 'models'))
+    models_config = config['models']
+    model_names = list(model_names or models_config)
+    unknown = [name for name in model_names if name not in models_config]
+    if unknown:
+        raise ValueError(f"Modèles absents de la configuration: {', '.join(unknown)}")
+
+    data_paths, data_hash, reused = prepare_data(data_config)
+    log(f"🗂️  Prétraitement {'réutilisé (données inchangées)' if reused else 'recalculé'}: {data_config['path']}")
+
+    manifest_path = output_dir / MANIFEST_FILE
+    manifest = _read_json(manifest_path)
+    hashes = {name: config_digest(data_hash, search_config, models_config[name]) for name in model_names}
+    model_paths = {name: output_dir / Path(MODEL_FILES[name]).name for name in model_names}
+
+    summary = {}
+    to_train = []
+    for name in model_names:
+        if not force and manifest.get(name, {}).get('hash') == hashes[name] and model_paths[name].exists():
+            summary[name] = {'statut': 'inchangé', **manifest[name]}
+            log(f"⏭️  {name}: inchangé depuis le {manifest[name].get('trained_at', '?')}")
+        else:
+            to_train.append(name)
+
+    if to_train:
+        total_jobs = training_config.get('n_jobs', -1)
+        total_jobs = os.cpu_count() or 1 if total_jobs in (None, -1) else total_jobs
+        jobs_per_model = max(1, total_jobs // len(to_train))
+        log(f"🚀 Entraînement de {', '.join(to_train)} ({len(to_train)} processus, {jobs_per_model} cœur(s) chacun)")
+
+        with ProcessPoolExecutor(len(to_train), mp_context=mp.get_context('spawn')) as pool:
+            futures = {
+                pool.submit(train_model, name, models_config[name], search_config, data_paths,
+                            model_paths[name], jobs_per_model): name
+                for name in to_train
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                result = future.result()
+                manifest[name] = {
+                    'hash': hashes[name],
+                    'trained_at': datetime.now().isoformat(timespec='seconds'),
+                    **result
+                }
+                _write_json(manifest_path, manifest)
+                summary[name] = {'statut': 'entraîné', **manifest[name]}
+                log(f"✅ {name}: AUC test {result['metrics']['AUC']:.3f}, CV {result['cv_score']:.3f} "
+                    f"({result['seconds']:.1f}s)")
+
+        if training_config.get('export_compiled', True):
+            export_compiled(to_train, output_dir, data_paths, log=log)
+
+    results_dir = Path(training_config.get('results_dir', 'results'))
+    results_dir.mkdir(parents=True, exist_ok=True)
+    results = pd.DataFrame({name: manifest[name]['metrics'] for name in models_config if name in manifest}).T
+    results[METRICS].round(3).to_csv(results_dir / 'model_performance.csv')
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Entraînement des modèles de diagnostic cardiaque")
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH, help="Fichier de configuration YAML")
+    parser.add_argument("--models", nargs="+", help="Familles à entraîner (défaut: toutes)")
+    parser.add_argument("--force", action="store_true", help="Réentraîner même les modèles inchangés")
+    args = parser.parse_args(argv)
+
+    summary = run_training(args.config, args.models, args.force)
+    results = pd.DataFrame({name: info['metrics'] for name, info in summary.items()}).T
+    print("\n📈 Performances sur le jeu de test:")
+    print(results[METRICS].round(3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Préchauffage des modèles au démarrage d'un service
+
+Sans préchauffage, le premier patient paie le chargement des modèles puis
+le coût du premier appel de chaque bibliothèque (allocation des tampons,
+pools de threads de CatBoost et XGBoost, pages des modèles compilés en
+mémoire mappée). `warm_up` charge chaque modèle du registre, lui fait
+évaluer un patient puis un lot synthétique, vérifie les probabilités
+obtenues et mesure chaque étape (durées exportées dans l'étape `warmup`
+des métriques). Le rapport sert de signal de disponibilité (voir
+src/utils/readiness.py).
+
+    python -m src.models.warmup              # préchauffage et durées, code 1 en cas d'échec
+    python -m src.models.warmup --rows 1024
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.data.preprocessing import FEATURE_COLUMNS, encode_batch
+from src.data.validation import ALLOWED_CODES, MEASUREMENT_RANGES
+from src.models.ensemble import _predict_proba, shared_executor
+from src.models.explanation import EXPLAINABLE_MODELS, load_background, load_explainer
+from src.models.registry import ModelRegistry
+from src.utils.config import env_int
+from src.utils.metrics import metrics
+
+# Taille du lot synthétique évalué par chaque modèle
+WARMUP_ROWS = env_int('WARMUP_ROWS', 256)
+
+
+@dataclass
+class WarmupReport:
+    """
+    Durées (secondes) par composant et par étape, modèles en échec
+
+    `errors` : modèles chargés dont l'évaluation a échoué ; `unavailable` :
+    modèles (ou explicateur) impossibles à charger, qui n'empêchent pas le
+    service de démarrer en mode dégradé.
+    """
+    rows: int
+    timings: dict = field(default_factory=dict)
+    errors: dict = field(default_factory=dict)
+    unavailable: dict = field(default_factory=dict)
+    duration: float = 0.0
+
+    @property
+    def ready(self):
+        """Au moins un modèle préchauffé et aucun modèle chargé en échec"""
+        return any(name != 'explication' for name in self.timings) and not self.errors
+
+    def to_dict(self):
+        return {
+            'lignes': self.rows,
+            'duree_ms': round(self.duration * 1000, 1),
+            'durees_ms': {
+                component: {step: round(seconds * 1000, 2) for step, seconds in steps.items()}
+                for component, steps in self.timings.items()
+            },
+            'erreurs': self.errors,
+            'indisponibles': self.unavailable
+        }
+
+
+def synthetic_features(rows=WARMUP_ROWS, seed=0):
+    """
+    Matrice encodée de `rows` patients tirés uniformément dans les domaines
+    du formulaire (mesures) et parmi les codes admis (variables catégorielles)
+    """
+    rng = np.random.default_rng(seed)
+    columns = {
+        col: rng.uniform(*MEASUREMENT_RANGES[col], rows) if col in MEASUREMENT_RANGES
+        else rng.choice(ALLOWED_CODES[col], rows)
+        for col in FEATURE_COLUMNS
+    }
+    return encode_batch(columns)
+
+
+def _check_probabilities(probabilities, rows):
+    probabilities = np.asarray(probabilities)
+    if probabilities.shape != (rows, 2) or not np.isfinite(probabilities).all():
+        raise ValueError(f"Probabilités invalides (forme {probabilities.shape})")
+
+
+def _observe(report, component, step, seconds):
+    report.timings.setdefault(component, {})[step] = seconds
+    metrics.observe('warmup', seconds, component=component, step=step)
+
+
+def warm_up(registry, rows=WARMUP_ROWS, explainer_factory=None, seed=0):
+    """
+    Préchauffe tous les modèles de `registry` (ModelRegistry)
+
+    Chaque modèle est chargé s'il ne l'est pas encore, puis évalue un
+    patient et un lot de `rows` patients synthétiques. `explainer_factory`,
+    appelé avec le dict des modèles préchauffés, construit l'explicateur
+    TreeSHAP, qui explique aussi un patient. Retourne un WarmupReport.
+    """
+    start = time.perf_counter()
+    report = WarmupReport(rows)
+    features = synthetic_features(rows, seed)
+    shared_executor()
+
+    warmed = {}
+    for name in registry.names:
+        loaded = registry.is_loaded(name)
+        step_start = time.perf_counter()
+        try:
+            model = registry.get(name)
+        except Exception as e:
+            report.unavailable[name] = str(e)
+            continue
+        if not loaded:
+            _observe(report, name, 'chargement', time.perf_counter() - step_start)
+
+        try:
+            for step, batch in (('premier_appel', features[:1]), ('lot', features)):
+                step_start = time.perf_counter()
+                _check_probabilities(_predict_proba(model, batch), len(batch))
+                _observe(report, name, step, time.perf_counter() - step_start)
+        except Exception as e:
+            report.errors[name] = str(e)
+            continue
+        warmed[name] = model
+
+    if explainer_factory is not None and warmed:
+        try:
+            step_start = time.perf_counter()
+            explainer = explainer_factory(warmed)
+            if explainer is not None:
+                _observe(report, 'explication', 'construction', time.perf_counter() - step_start)
+                step_start = time.perf_counter()
+                explainer.explain(features[:1])
+                _observe(report, 'explication', 'premier_appel', time.perf_counter() - step_start)
+        except Exception as e:
+            report.unavailable['explication'] = str(e)
+
+    report.duration = time.perf_counter() - start
+    metrics.observe('warmup', report.duration, component='total', step='total')
+    return report
+
+
+def default_explainer(models):
+    """Explicateur du premier modèle explicable préchauffé (CatBoost, puis XGBoost)"""
+    for name in EXPLAINABLE_MODELS:
+        if name in models:
+            return load_explainer(name, background=load_background())
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Préchauffage des modèles")
+    parser.add_argument("--rows", type=int, default=WARMUP_ROWS, help="Taille du lot synthétique")
+    parser.add_argument("--no-explain", action="store_true", help="Ne pas construire l'explicateur TreeSHAP")
+    args = parser.parse_args()
+
+    report = warm_up(ModelRegistry(), args.rows, None if args.no_explain else default_explainer)
+    for component, steps in report.to_dict()['durees_ms'].items():
+        details = " · ".join(f"{step} {ms:.1f} ms" for step, ms in steps.items())
+        print(f"✅ {component:<20} {details}")
+    for name, message in {**report.unavailable, **report.errors}.items():
+        print(f"⚠️  {name:<20} {message}")
+    print(f"{'🟢 Prêt' if report.ready else '🔴 Non prêt'} en {report.duration * 1000:.0f} ms")
+    sys.exit(0 if report.ready else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Utilitaires partagés (configuration...)
+"""
@@ -0,0 +1,30 @@
+"""
+Lecture de la configuration depuis les variables d'environnement
+
+Les noms de variables suivent .env.example ; une valeur absente ou vide
+prend la valeur par défaut fournie par l'appelant.
+"""
+
+import os
+
+
+def env_str(name, default=None):
+    value = os.getenv(name)
+    return value if value not in (None, '') else default
+
+
+def env_int(name, default):
+    value = env_str(name)
+    return int(value) if value is not None else default
+
+
+def env_float(name, default):
+    value = env_str(name)
+    return float(value) if value is not None else default
+
+
+def env_bool(name, default):
+    value = env_str(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
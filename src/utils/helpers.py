@@ -0,0 +1,32 @@
+"""
+Fonctions utilitaires partagées
+"""
+
+import hashlib
+from pathlib import Path
+
+
+def file_fingerprint(path):
+    """
+    Empreinte d'un fichier (chemin, taille, date de modification)
+
+    Change dès que le fichier est réécrit ; lève FileNotFoundError s'il
+    n'existe pas.
+    """
+    path = Path(path)
+    stat = path.stat()
+    return f'{path}:{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    Empreinte du contenu d'un fichier (blake2b, 16 octets en hexadécimal)
+
+    Contrairement à file_fingerprint, ne dépend ni du chemin ni de la date :
+    une copie identique du fichier donne la même empreinte.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
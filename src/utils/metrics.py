@@ -0,0 +1,226 @@
+"""
+Instrumentation du chemin d'inférence
+
+Durées par étape (chargement des modèles, encodage, predict_proba de
+chaque modèle, explication, graphiques, rendu des pages...) et compteurs
+(requêtes, erreurs, cache), partagés par tout le processus. Chaque durée
+garde une fenêtre glissante des METRICS_WINDOW dernières mesures pour les
+quantiles p50 / p95 / p99, plus un total et une somme depuis le démarrage.
+
+L'export est au format texte Prometheus : endpoint /metrics de l'API,
+page Administration de l'application, ou fichier METRICS_FILE (collecteur
+textfile de node_exporter). Avec METRICS_ENABLED=false, `span` retourne un
+contexte vide et `timed` appelle directement la fonction : le coût se
+limite à un test de booléen.
+"""
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+
+from src.utils.config import env_bool, env_int, env_str
+
+METRICS_ENABLED = env_bool('METRICS_ENABLED', True)
+
+# Nombre de mesures récentes conservées par étape pour les quantiles
+METRICS_WINDOW = env_int('METRICS_WINDOW', 1024)
+
+# Fichier texte Prometheus réécrit par export_metrics (désactivé si vide)
+METRICS_FILE = env_str('METRICS_FILE')
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+PREFIX = 'heart'
+
+DURATION_HELP = "Durée des étapes du chemin d'inférence (fenêtre glissante pour les quantiles)"
+
+COUNTER_HELP = {
+    'requests': "Diagnostics demandés",
+    'errors': "Erreurs (modèle en échec ou hors délai, requête rejetée)",
+    'cache_hits': "Patients servis par le cache des prédictions",
+    'cache_misses': "Patients évalués par les modèles",
+    'cascade_rows': "Patients évalués par le premier étage de la cascade",
+    'cascade_escalated': "Patients de la cascade escaladés vers l'ensemble complet",
+    'audit_written': "Diagnostics écrits dans le journal d'audit",
+    'audit_dropped': "Enregistrements d'audit rejetés (file pleine, fichier de reprise trop gros)"
+}
+
+_NULL_SPAN = nullcontext()
+
+
+class Histogram:
+    """Durées d'une étape : fenêtre glissante, nombre et somme cumulés"""
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.recent = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.recent.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def quantiles(self, quantiles=QUANTILES):
+        if not self.recent:
+            return {q: float('nan') for q in quantiles}
+        # Import différé : numpy n'est pas nécessaire au démarrage de l'application
+        import numpy as np
+
+        values = np.quantile(np.fromiter(self.recent, float, len(self.recent)), quantiles)
+        return dict(zip(quantiles, values.tolist()))
+
+
+class _Span:
+    """Contexte mesurant la durée d'une étape"""
+
+    __slots__ = ('registry', 'key', 'start')
+
+    def __init__(self, registry, key):
+        self.registry = registry
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry._observe(self.key, time.perf_counter() - self.start)
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+class MetricsRegistry:
+    """
+    Durées et compteurs du processus, thread-safe
+
+    `span(étape, **labels)` mesure un bloc, `observe` enregistre une durée
+    déjà mesurée et `increment(compteur, n, **labels)` ajoute à un compteur
+    (requests, errors, cache_hits, cache_misses...).
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED, window=METRICS_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self.started_at = time.time()
+        self._durations = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def span(self, stage, **labels):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, _key(stage, labels))
+
+    def observe(self, stage, seconds, **labels):
+        if self.enabled:
+            self._observe(_key(stage, labels), seconds)
+
+    def increment(self, counter, amount=1, **labels):
+        if not self.enabled or not amount:
+            return
+        key = _key(counter, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+    def durations(self):
+        """Liste de dicts (étape, labels, nombre, moyenne et quantiles en secondes)"""
+        with self._lock:
+            items = [(key, histogram, histogram.quantiles()) for key, histogram in self._durations.items()]
+        rows = []
+        for (stage, labels), histogram, quantiles in sorted(items, key=lambda item: item[0]):
+            rows.append({
+                'etape': stage,
+                'labels': dict(labels),
+                'nombre': histogram.count,
+                'moyenne': histogram.total / histogram.count,
+                **{f'p{round(q * 100)}': value for q, value in quantiles.items()}
+            })
+        return rows
+
+    def counters(self):
+        """Liste de dicts (compteur, labels, valeur)"""
+        with self._lock:
+            items = sorted(self._counters.items())
+        return [{'compteur': name, 'labels': dict(labels), 'valeur': value} for (name, labels), value in items]
+
+    def to_prometheus(self):
+        """Export au format texte Prometheus (version 0.0.4)"""
+        name = f'{PREFIX}_stage_duration_seconds'
+        lines = [f'# HELP {name} {DURATION_HELP}', f'# TYPE {name} summary']
+        for row in self.durations():
+            labels = {'stage': row['etape'], **row['labels']}
+            for q in QUANTILES:
+                lines.append(f"{name}{_format_labels({**labels, 'quantile': q})} {row[f'p{round(q * 100)}']:.9g}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {row['moyenne'] * row['nombre']:.9g}")
+            lines.append(f"{name}_count{_format_labels(labels)} {row['nombre']}")
+
+        declared = set()
+        for row in self.counters():
+            name = f"{PREFIX}_{row['compteur']}_total"
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# HELP {name} {COUNTER_HELP.get(row['compteur'], row['compteur'])}")
+                lines.append(f'# TYPE {name} counter')
+            lines.append(f"{name}{_format_labels(row['labels'])} {row['valeur']}")
+
+        name = f'{PREFIX}_start_time_seconds'
+        lines += [f'# TYPE {name} gauge', f'{name} {self.started_at:.3f}']
+        return '\n'.join(lines) + '\n'
+
+    def _observe(self, key, seconds):
+        with self._lock:
+            histogram = self._durations.get(key)
+            if histogram is None:
+                histogram = self._durations[key] = Histogram(self.window)
+            histogram.observe(seconds)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels.items()
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+# Registre du processus
+metrics = MetricsRegistry()
+
+
+def timed(stage, **labels):
+    """Décorateur : durée de chaque appel de la fonction dans l'étape `stage`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            with metrics.span(stage, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def export_metrics(path=METRICS_FILE):
+    """Réécrit le fichier Prometheus `path` (remplacement atomique) ; sans effet si `path` est vide"""
+    if not path or not metrics.enabled:
+        return None
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    tmp_path.write_text(metrics.to_prometheus(), encoding='utf-8')
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,112 @@
+"""
+Signal de disponibilité (readiness) d'un processus de service
+
+Un conteneur est vivant dès que son serveur répond, mais il n'est prêt à
+recevoir du trafic qu'une fois les modèles chargés et préchauffés (voir
+src/models/warmup.py). `Readiness` exécute le préchauffage dans un thread,
+expose son état (API : GET /ready) et écrit le fichier témoin READY_FILE
+quand il a réussi. La sonde du conteneur vérifie ce fichier sans charger
+les modèles ni numpy :
+
+    python -m src.utils.readiness    # code de sortie 0 si prêt, 1 sinon
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.utils.config import env_str
+
+# Fichier témoin écrit après un préchauffage réussi (désactivé si vide)
+READY_FILE = env_str('READY_FILE', str(Path(tempfile.gettempdir()) / 'heart-disease.ready'))
+
+STARTING, WARMING_UP, READY, FAILED = 'starting', 'warming_up', 'ready', 'failed'
+
+
+class Readiness:
+    """
+    État de préchauffage d'un processus : starting, warming_up, ready ou failed
+
+    Le fichier témoin d'un démarrage précédent est supprimé à la création ;
+    il n'est réécrit (avec le pid et le rapport) que si le préchauffage
+    retourne un rapport `ready`.
+    """
+
+    def __init__(self, ready_file=READY_FILE):
+        self.ready_file = Path(ready_file) if ready_file else None
+        self.state = STARTING
+        self.report = None
+        self.error = None
+        self._event = threading.Event()
+        self._thread = None
+        if self.ready_file is not None:
+            self.ready_file.unlink(missing_ok=True)
+
+    @property
+    def ready(self):
+        return self._event.is_set()
+
+    def run(self, warm_up, *args, **kwargs):
+        """Exécute `warm_up(*args, **kwargs)` (qui retourne un WarmupReport) et publie le résultat"""
+        self.state = WARMING_UP
+        try:
+            report = warm_up(*args, **kwargs)
+        except Exception as e:
+            self.state, self.error = FAILED, str(e)
+            return None
+        self.report = report
+        if not report.ready:
+            self.state, self.error = FAILED, "; ".join(
+                f"{name}: {message}" for name, message in report.errors.items()) or "Aucun modèle disponible"
+            return report
+        if self.ready_file is not None:
+            payload = {'pid': os.getpid(), 'ready_at': time.time(), 'report': report.to_dict()}
+            tmp_path = self.ready_file.with_name(f'.{self.ready_file.name}.tmp')
+            tmp_path.write_text(json.dumps(payload), encoding='utf-8')
+            os.replace(tmp_path, self.ready_file)
+        self.state = READY
+        self._event.set()
+        return report
+
+    def start(self, warm_up, *args, **kwargs):
+        """Lance `run` dans un thread d'arrière-plan ; retourne le thread"""
+        self._thread = threading.Thread(target=self.run, args=(warm_up, *args), kwargs=kwargs,
+                                        name='warmup', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def wait(self, timeout=None):
+        """Attend la fin d'un préchauffage réussi ; retourne False au bout de `timeout` secondes"""
+        return self._event.wait(timeout)
+
+    def status(self):
+        return {
+            'status': self.state,
+            'erreur': self.error,
+            'prechauffage': self.report.to_dict() if self.report is not None else None
+        }
+
+
+def probe(ready_file=READY_FILE):
+    """
+    Vrai si le fichier témoin existe et que le processus qui l'a écrit est
+    toujours en vie (un témoin laissé par un processus arrêté est ignoré)
+    """
+    try:
+        pid = json.loads(Path(ready_file).read_text(encoding='utf-8'))['pid']
+        # Sous Windows, os.kill termine le processus : seule la présence du témoin compte
+        if os.name == 'posix':
+            os.kill(pid, 0)
+    except PermissionError:
+        return True
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probe(sys.argv[1] if len(sys.argv) > 1 else READY_FILE) else 1)
@@ -6,8 +6,11 @@ Usage:
     python start.py --help
     python start.py --install
     python start.py --app
+    python start.py --api
     python start.py --notebook
     python start.py --train
+    python start.py --score input.csv --out output.csv
+    python start.py --export
 """
 
 import argparse
@@ -51,7 +54,7 @@ def install_dependencies():
                       "Installation des dépendances")
 
 def start_streamlit_app():
-    """Lance l'application Streamlit"""
+    """Lance l'application Streamlit, avec préchauffage des modèles (app/serve.py)"""
     app_path = Path("app/streamlit_app.py")
     
     if not app_path.exists():
@@ -63,15 +66,32 @@ def start_streamlit_app():
     print("Appuyez sur Ctrl+C pour arrêter l'application")
     
     try:
-        subprocess.run(["streamlit", "run", str(app_path)], check=True)
+        subprocess.run([sys.executable, "-m", "app.serve"], check=True)
     except KeyboardInterrupt:
         print("\n👋 Application arrêtée par l'utilisateur")
-    except FileNotFoundError:
-        print("❌ Streamlit non trouvé. Installez-le avec: pip install streamlit")
+    except subprocess.CalledProcessError:
+        print("❌ Impossible de lancer Streamlit. Installez-le avec: pip install streamlit")
         return False
     
     return True
 
+def start_api(port=8000):
+    """Lance l'API REST de prédiction (FastAPI)"""
+    print("\n🔌 Lancement de l'API de prédiction...")
+    print(f"L'API sera disponible à l'adresse: http://localhost:{port} (documentation: /docs)")
+    print("Appuyez sur Ctrl+C pour arrêter l'API")
+
+    try:
+        subprocess.run([sys.executable, "-m", "uvicorn", "src.api.main:app",
+                        "--host", "0.0.0.0", "--port", str(port)], check=True)
+    except KeyboardInterrupt:
+        print("\n👋 API arrêtée par l'utilisateur")
+    except subprocess.CalledProcessError:
+        print("❌ Impossible de lancer l'API. Installez uvicorn avec: pip install uvicorn")
+        return False
+
+    return True
+
 def start_jupyter():
     """Lance Jupyter Lab"""
     notebooks_path = Path("notebooks")
@@ -94,21 +114,194 @@ def start_jupyter():
     
     return True
 
-def train_models():
-    """Lance l'entraînement des modèles"""
-    notebook_path = Path("notebooks/01_heart_disease_complete_analysis.ipynb")
-    
-    if not notebook_path.exists():
-        print("❌ Notebook d'analyse non trouvé")
+def train_models(config_path=None, force=False):
+    """Lance l'entraînement des modèles (pipeline src/models/training.py)"""
+    from src.models.training import DEFAULT_CONFIG_PATH, run_training
+
+    config_path = Path(config_path or DEFAULT_CONFIG_PATH)
+    if not config_path.exists():
+        print(f"❌ Configuration d'entraînement non trouvée: {config_path}")
         return False
-    
+
     print("\n🤖 Lancement de l'entraînement des modèles...")
-    print("Cela peut prendre plusieurs minutes...")
-    
-    # Convertir et exécuter le notebook
-    return run_command(["jupyter", "nbconvert", "--to", "notebook", "--execute", 
-                       str(notebook_path), "--output", "executed_analysis.ipynb"], 
-                      "Entraînement des modèles")
+    try:
+        run_training(config_path, force=force)
+    except (OSError, ValueError) as e:
+        print(f"❌ Entraînement interrompu: {e}")
+        return False
+    print("✅ Entraînement terminé (performances: results/model_performance.csv)")
+    return True
+
+def load_available_models(prefer_compiled=True):
+    """Charge les modèles disponibles et signale ceux qui manquent"""
+    from src.models.registry import ModelRegistry
+
+    registry = ModelRegistry(prefer_compiled=prefer_compiled)
+    models = registry.load_available()
+    for name, error in registry.errors.items():
+        print(f"⚠️  Modèle {name} indisponible: {error}")
+    if not models:
+        print("❌ Modèles non trouvés. Lancez d'abord: python start.py --train")
+    return registry, models
+
+def export_models():
+    """Compile les modèles entraînés en tableaux NumPy (models/compiled/)"""
+    from src.data.preprocessing import FEATURE_COLUMNS, encode_batch
+    from src.data.storage import load_table
+    from src.models.compiled import COMPILED_DIR, export_compiled_models
+
+    print("\n📦 Compilation des modèles...")
+    registry, models = load_available_models(prefer_compiled=False)
+    if not models:
+        return False
+
+    # Données de référence pour vérifier que les scores sont identiques
+    reference_path = Path("data/processed/X_test")
+    reference_features = None
+    try:
+        reference_features = encode_batch(load_table(reference_path, columns=FEATURE_COLUMNS))
+    except FileNotFoundError:
+        print(f"⚠️  {reference_path} (.parquet/.csv) non trouvé, vérification des scores ignorée")
+
+    try:
+        errors = export_compiled_models(models, COMPILED_DIR, reference_features,
+                                        sources=registry.model_files)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+
+    for name, error in errors.items():
+        detail = f" (écart max: {error:.2e})" if error is not None else ""
+        print(f"✅ {name} compilé{detail}")
+    print(f"📄 Modèles compilés écrits dans {COMPILED_DIR}/")
+
+    # Référence de la surveillance de la dérive (distribution d'entraînement)
+    from src.models.drift import DRIFT_REFERENCE_FILE, TRAIN_FILE, build_reference
+
+    try:
+        reference = build_reference()
+    except FileNotFoundError:
+        print(f"⚠️  {TRAIN_FILE} (.parquet/.csv) non trouvé, référence de dérive non construite")
+        return True
+    print(f"📉 Référence de dérive écrite dans {DRIFT_REFERENCE_FILE} ({reference.n_rows:,} patients)")
+    return True
+
+def convert_data(directory="data/processed"):
+    """Convertit les CSV de data/processed en Parquet (types compacts)"""
+    from src.data.storage import convert_directory
+
+    print(f"\n🗜️  Conversion des CSV de {directory} en Parquet...")
+    if not Path(directory).exists():
+        print(f"❌ Dossier {directory} non trouvé")
+        return False
+
+    for path in convert_directory(directory):
+        print(f"✅ {path} ({path.stat().st_size / 1024:,.0f} Ko)")
+    return True
+
+def score_file(input_path, output_path=None, chunk_size=None, restart=False, workers=None,
+               explain=False, cascade=False):
+    """
+    Score un fichier de patients (CSV, Parquet ou Arrow) sans lancer l'interface
+
+    Le fichier est lu et écrit par blocs ; une exécution interrompue reprend
+    au dernier bloc terminé, sauf avec `restart`. Avec `workers` > 1, chaque
+    bloc est réparti sur autant de processus. Avec `explain`, les facteurs
+    principaux de chaque diagnostic (TreeSHAP) sont ajoutés aux résultats.
+    Avec `cascade`, seuls les patients proches d'un seuil de risque passent
+    par les modèles lourds (src/models/cascade.py).
+    """
+    input_path = Path(input_path)
+    if not input_path.exists():
+        print(f"❌ Fichier {input_path} non trouvé")
+        return False
+
+    if output_path is None:
+        output_path = input_path.with_name(f"{input_path.stem}_scored.csv")
+
+    from src.models.cache import PredictionCache, create_backend
+    from src.models.parallel import ParallelPredictor
+    from src.models.streaming import DEFAULT_STREAM_CHUNK_SIZE, checkpoint_path, stream_score
+
+    print(f"\n🩺 Diagnostic par lot de {input_path}...")
+    registry, models = load_available_models()
+    if not models:
+        return False
+    if cascade:
+        from src.models.cascade import CASCADE_BAND, CascadePredictor, cascade_available, escalation_models
+
+        if not cascade_available(models):
+            print("❌ Cascade impossible : régression logistique ou modèles d'escalade manquants")
+            return False
+        # Seuls les patients escaladés passent par le cache
+        cache = PredictionCache(create_backend(), escalation_models(models), registry.version())
+    else:
+        cache = PredictionCache(create_backend(), models, registry.version())
+
+    explainer = None
+    if explain:
+        from src.models.explanation import EXPLAINABLE_MODELS, load_explainer
+
+        name = next((name for name in EXPLAINABLE_MODELS if name in models), None)
+        if name is None:
+            print("❌ Aucun modèle explicable (CatBoost ou XGBoost) disponible")
+            return False
+        try:
+            explainer = load_explainer(name)
+        except (OSError, ValueError) as e:
+            print(f"❌ Explicateur {name} indisponible: {e}")
+            return False
+        print(f"🧠 Facteurs principaux calculés avec {name} (TreeSHAP)")
+
+    def report(progress):
+        done = f"{progress['lignes']:,}"
+        if progress['lignes_totales']:
+            done += f" / {progress['lignes_totales']:,} ({progress['lignes'] / progress['lignes_totales']:.0%})"
+        print(f"  ▸ bloc {progress['blocs']}: {done} lignes · {progress['lignes_par_s']:,.0f} lignes/s")
+
+    if not restart and checkpoint_path(output_path).exists():
+        print(f"↩️  Reprise possible depuis {checkpoint_path(output_path)}")
+    parallel = predictor = None
+    if workers and workers > 1:
+        print(f"🧵 {workers} processus de calcul")
+        parallel = predictor = ParallelPredictor(list(escalation_models(models) if cascade else models),
+                                                 workers=workers)
+    if cascade:
+        from src.models.ensemble import shared_executor
+
+        print(f"⚡ Cascade : régression logistique, puis ensemble complet à moins de {CASCADE_BAND} d'un seuil")
+        predictor = CascadePredictor(models, escalation=parallel, cache=cache, executor=shared_executor())
+    try:
+        progress = stream_score(input_path, output_path, models,
+                                chunk_size=chunk_size or DEFAULT_STREAM_CHUNK_SIZE,
+                                cache=None if cascade else cache, model_version=registry.version(),
+                                resume=not restart, on_progress=report, predictor=predictor,
+                                explainer=explainer)
+    except ValueError as e:
+        print(f"❌ Fichier invalide: {e}")
+        print("   Relancez la même commande après correction pour reprendre au dernier bloc terminé")
+        return False
+    finally:
+        if parallel is not None:
+            parallel.close()
+
+    n_rows = progress['lignes'] - progress['lignes_reprises']
+    if progress['lignes_reprises']:
+        print(f"↩️  {progress['lignes_reprises']:,} lignes reprises d'une exécution précédente")
+    print(f"✅ {n_rows:,} patients scorés en {progress['secondes']:.2f}s ({progress['lignes_par_s']:,.0f} lignes/s)")
+    if cascade:
+        stats = predictor.stats()
+        print(f"⚡ {stats['escaladees']:,} patients escaladés vers l'ensemble complet ({stats['taux_escalade']:.0%})")
+    stats = cache.stats()
+    print(f"♻️  Cache ({stats['backend']}): {stats['hits']} patients déjà connus, {stats['misses']} évalués")
+    print(f"📄 Résultats écrits dans {output_path}")
+
+    from src.utils.metrics import export_metrics
+
+    metrics_path = export_metrics()
+    if metrics_path is not None:
+        print(f"📈 Mesures Prometheus écrites dans {metrics_path}")
+    return True
 
 def check_environment():
     """Vérifie l'environnement de développement"""
@@ -151,9 +344,17 @@ def main():
 Exemples d'utilisation:
   python start.py --install          # Installer les dépendances
   python start.py --app              # Lancer l'application Streamlit
+  python start.py --api              # Lancer l'API REST (port 8000)
   python start.py --notebook         # Lancer Jupyter Lab
-  python start.py --train            # Entraîner les modèles
+  python start.py --train            # Entraîner les modèles (seuls ceux qui ont changé)
+  python start.py --train --force    # Tout réentraîner
   python start.py --check            # Vérifier l'environnement
+  python start.py --score input.csv --out output.csv  # Diagnostic par lot (reprend si interrompu)
+  python start.py --score input.parquet --workers 8    # Diagnostic par lot sur 8 processus
+  python start.py --score input.csv --explain           # Avec les facteurs principaux de chaque diagnostic
+  python start.py --score input.csv --cascade           # Modèles lourds seulement près des seuils de risque
+  python start.py --export           # Compiler les modèles (models/compiled/) et la référence de dérive
+  python start.py --convert-data     # Convertir data/processed/*.csv en Parquet
         """
     )
     
@@ -161,12 +362,36 @@ Exemples d'utilisation:
                        help="Installer les dépendances")
     parser.add_argument("--app", action="store_true", 
                        help="Lancer l'application Streamlit")
+    parser.add_argument("--api", action="store_true",
+                       help="Lancer l'API REST de prédiction")
     parser.add_argument("--notebook", action="store_true", 
                        help="Lancer Jupyter Lab")
     parser.add_argument("--train", action="store_true", 
                        help="Entraîner les modèles")
+    parser.add_argument("--config", metavar="YAML",
+                       help="Avec --train, configuration d'entraînement (défaut: config/training_config.yaml)")
+    parser.add_argument("--force", action="store_true",
+                       help="Avec --train, réentraîner même les modèles inchangés")
     parser.add_argument("--check", action="store_true", 
                        help="Vérifier l'environnement")
+    parser.add_argument("--export", action="store_true",
+                       help="Compiler les modèles entraînés en tableaux NumPy et construire la référence de dérive")
+    parser.add_argument("--convert-data", action="store_true",
+                       help="Convertir les CSV de data/processed en Parquet")
+    parser.add_argument("--score", metavar="INPUT",
+                       help="Scorer un fichier de patients (CSV, Parquet ou Arrow), par blocs")
+    parser.add_argument("--out", metavar="OUTPUT",
+                       help="Sortie pour --score : .csv, ou dossier .parquet (défaut: <input>_scored.csv)")
+    parser.add_argument("--chunk-size", type=int,
+                       help="Nombre de lignes lues, évaluées et écrites par bloc")
+    parser.add_argument("--workers", type=int,
+                       help="Avec --score, nombre de processus de calcul (défaut: 1)")
+    parser.add_argument("--explain", action="store_true",
+                       help="Avec --score, ajouter les facteurs principaux de chaque diagnostic (TreeSHAP)")
+    parser.add_argument("--cascade", action="store_true",
+                       help="Avec --score, régression logistique d'abord et ensemble complet près des seuils")
+    parser.add_argument("--restart", action="store_true",
+                       help="Avec --score, ignorer le point de reprise et tout recalculer")
     
     args = parser.parse_args()
     
@@ -187,7 +412,17 @@ Exemples d'utilisation:
         success &= install_dependencies()
     
     if args.train:
-        success &= train_models()
+        success &= train_models(args.config, args.force)
+    
+    if args.export:
+        success &= export_models()
+    
+    if args.convert_data:
+        success &= convert_data()
+    
+    if args.score:
+        success &= score_file(args.score, args.out, args.chunk_size, args.restart, args.workers,
+                              args.explain, args.cascade)
     
     if args.notebook:
         success &= start_jupyter()
@@ -195,6 +430,9 @@ Exemples d'utilisation:
     if args.app:
         success &= start_streamlit_app()
     
+    if args.api:
+        success &= start_api()
+    
     if success:
         print("\n🎉 Opération terminée avec succès!")
     else:
@@ -0,0 +1,11 @@
+"""
+Configuration commune des tests : racine du projet dans le path pour
+importer les packages src et app
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
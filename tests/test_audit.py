@@ -0,0 +1,145 @@
+"""
+Tests du journal d'audit (src/models/audit.py)
+
+Base SQLite et fichier de reprise dans un dossier temporaire ; un backend
+factice simule une base injoignable.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.data.preprocessing import FEATURE_COLUMNS
+from src.models.audit import AuditLog, SQLiteBackend, audit_records
+from src.models.ensemble import EnsembleResult
+
+
+class FailingBackend:
+    """Base injoignable : chaque insertion échoue"""
+
+    name = 'injoignable'
+
+    def __init__(self):
+        self.attempts = 0
+
+    def insert_many(self, records):
+        self.attempts += 1
+        raise ConnectionError("base injoignable")
+
+    def close(self):
+        pass
+
+
+def make_records(n_rows, source='test'):
+    features = np.arange(n_rows * len(FEATURE_COLUMNS), dtype=np.float32).reshape(n_rows, -1)
+    probabilities = np.column_stack([np.linspace(0.1, 0.9, n_rows), np.linspace(0.2, 0.8, n_rows)])
+    result = EnsembleResult(['catboost', 'xgboost'], probabilities, 'catboost')
+    return audit_records(features, result, source, {'catboost': 'abc', 'xgboost': 'def'})
+
+
+def make_log(tmp_path, backend=None, **kwargs):
+    backend = backend if backend is not None else SQLiteBackend(tmp_path / 'audit.db')
+    options = {'flush_interval': 0.01, 'batch_size': 50, 'queue_size': 1000}
+    options.update(kwargs)
+    return AuditLog(backend, spool_path=tmp_path / 'audit.spool.jsonl', **options)
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return tmp_path / 'audit.spool.jsonl'
+
+
+def test_records_describe_each_patient():
+    """Test qu'un enregistrement contient variables, probabilités et versions de chaque patient"""
+    records = make_records(3)
+
+    assert len({record['id'] for record in records}) == 3
+    assert list(records[0]['features']) == FEATURE_COLUMNS
+    assert records[2]['probabilities'] == pytest.approx({'catboost': 0.9, 'xgboost': 0.8})
+    assert records[2]['prediction'] == 1
+    assert records[2]['risk_level'] == 'élevé'
+    assert records[0]['model_versions'] == {'catboost': 'abc', 'xgboost': 'def'}
+
+
+def test_submitted_records_are_written_in_batches(tmp_path, spool):
+    """Test que les enregistrements soumis sont écrits par lots puis le fichier de reprise vidé"""
+    log = make_log(tmp_path).start()
+
+    assert log.submit(make_records(120)) == 120
+    assert log.flush(timeout=5)
+    stats = log.stats()
+    log.close()
+
+    assert SQLiteBackend(tmp_path / 'audit.db').count() == 120
+    assert stats['ecrits'] == 120
+    assert stats['rejetes'] == 0
+    assert not spool.exists()
+
+
+def test_full_queue_drops_and_counts(tmp_path):
+    """Test qu'une file pleine rejette et compte les enregistrements, sans lever"""
+    log = make_log(tmp_path, queue_size=2)
+
+    accepted = log.submit(make_records(5))
+
+    assert accepted == 2
+    assert log.stats()['soumis'] == 2
+    assert log.stats()['rejetes'] == 3
+    log.close()
+
+
+def test_unreachable_database_keeps_records_for_replay(tmp_path, spool):
+    """Test qu'une base injoignable laisse les lots dans le fichier de reprise, réinsérés au démarrage suivant"""
+    backend = FailingBackend()
+    log = make_log(tmp_path, backend=backend).start()
+    records = make_records(30)
+
+    log.submit(records)
+    assert log.flush(timeout=5)
+    log.close()
+
+    assert backend.attempts >= 1
+    assert log.stats()['echecs'] >= 1
+    assert log.stats()['en_reprise'] == 30
+    assert [json.loads(line)['id'] for line in spool.read_text().splitlines()] == [r['id'] for r in records]
+
+    replay = make_log(tmp_path).start()
+    assert replay.flush(timeout=5)
+    replay.close()
+
+    assert replay.stats()['reprises_au_demarrage'] == 30
+    assert SQLiteBackend(tmp_path / 'audit.db').count() == 30
+    assert not spool.exists()
+
+
+def test_replay_skips_truncated_line_and_duplicates(tmp_path, spool):
+    """Test que la reprise ignore une ligne tronquée et n'insère pas deux fois un enregistrement"""
+    records = make_records(10)
+    # Arrêt brutal après l'insertion mais avant l'effacement du fichier de reprise
+    SQLiteBackend(tmp_path / 'audit.db').insert_many(records[:4])
+    spool.write_text(''.join(json.dumps(record) + '\n' for record in records) + '{"id": "tronq')
+
+    log = make_log(tmp_path).start()
+    assert log.flush(timeout=5)
+    log.close()
+
+    assert log.stats()['reprises_au_demarrage'] == 10
+    assert SQLiteBackend(tmp_path / 'audit.db').count() == 10
+
+
+def test_full_spool_drops_and_counts(tmp_path, spool):
+    """Test qu'au-delà de la taille maximale du fichier de reprise les lots sont rejetés et comptés"""
+    log = make_log(tmp_path, backend=FailingBackend(), spool_max_mb=1e-6).start()
+
+    log.submit(make_records(5))
+    assert log.flush(timeout=5)
+    log.submit(make_records(7))
+    assert log.flush(timeout=5)
+    log.close()
+
+    stats = log.stats()
+    assert stats['soumis'] == 12
+    assert stats['rejetes'] == 7
+    assert stats['en_reprise'] == 5
+    assert len(spool.read_text().splitlines()) == 5
@@ -0,0 +1,154 @@
+"""
+Tests du micro-batching de l'API (src/api/batching.py)
+
+Les tests asynchrones sont exécutés avec asyncio.run ; la fonction de
+prédiction renvoie la première variable comme probabilité, ce qui permet
+de vérifier que chaque requête reçoit ses propres lignes.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.api.batching import MicroBatcher
+from src.models.ensemble import EnsembleResult
+
+
+class RecordingPredict:
+    """Fonction de prédiction qui enregistre la taille des lots et la concurrence"""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.batch_sizes = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, features):
+        with self._lock:
+            self.batch_sizes.append(len(features))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+            return EnsembleResult(['modele'], features[:, :1].astype(np.float64), 'modele')
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def patient(value, rows=1):
+    return np.full((rows, 3), value, dtype=np.float32)
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=10))
+
+
+def test_each_request_gets_its_own_rows():
+    """Test que le résultat d'un lot est découpé par requête, dans l'ordre"""
+    predict = RecordingPredict()
+
+    async def scenario():
+        batcher = MicroBatcher(predict, max_wait_ms=50, max_rows=1000, executor=ThreadPoolExecutor(2))
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.submit(patient(i, rows=i + 1)) for i in range(5)))
+        await batcher.stop()
+        return batcher, results
+
+    batcher, results = run(scenario())
+
+    for i, result in enumerate(results):
+        assert result.probabilities.shape == (i + 1, 1)
+        assert np.all(result.probabilities == i)
+    assert predict.batch_sizes == [15]
+    assert batcher.stats()['requetes'] == 5
+    assert batcher.stats()['lots'] == 1
+
+
+def test_batch_leaves_at_max_rows_without_waiting():
+    """Test qu'un lot part dès max_rows lignes, sans attendre la fenêtre"""
+    predict = RecordingPredict()
+
+    async def scenario():
+        batcher = MicroBatcher(predict, max_wait_ms=60000, max_rows=4, executor=ThreadPoolExecutor(2))
+        await batcher.start()
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(patient(i)) for i in range(8))), timeout=2)
+        await batcher.stop()
+        return results
+
+    results = run(scenario())
+
+    assert [float(result.probabilities[0, 0]) for result in results] == list(range(8))
+    assert predict.batch_sizes == [4, 4]
+
+
+def test_error_is_sent_to_every_request_of_the_batch():
+    """Test qu'une erreur de prédiction est transmise à toutes les requêtes du lot"""
+    predict = RecordingPredict(error=ValueError("modèle indisponible"))
+
+    async def scenario():
+        batcher = MicroBatcher(predict, max_wait_ms=50, max_rows=1000, executor=ThreadPoolExecutor(2))
+        await batcher.start()
+        outcomes = await asyncio.gather(*(batcher.submit(patient(i)) for i in range(3)),
+                                        return_exceptions=True)
+        # Le lot suivant est évalué normalement
+        predict.error = None
+        after = await batcher.submit(patient(7))
+        await batcher.stop()
+        return outcomes, after
+
+    outcomes, after = run(scenario())
+
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert float(after.probabilities[0, 0]) == 7
+
+
+def test_concurrent_batches_are_bounded():
+    """Test que max_concurrency lots au plus sont évalués en même temps"""
+    predict = RecordingPredict(delay=0.05)
+
+    async def scenario():
+        batcher = MicroBatcher(predict, max_wait_ms=1, max_rows=1, executor=ThreadPoolExecutor(8),
+                               max_concurrency=3)
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.submit(patient(i)) for i in range(12)))
+        await batcher.stop()
+        return results
+
+    results = run(scenario())
+
+    assert [float(result.probabilities[0, 0]) for result in results] == list(range(12))
+    assert predict.peak == 3
+
+
+def test_stop_fails_waiting_requests_and_finishes_running_batches():
+    """Test qu'à l'arrêt les requêtes en attente échouent et les lots en cours se terminent"""
+    predict = RecordingPredict(delay=0.2)
+
+    async def scenario():
+        batcher = MicroBatcher(predict, max_wait_ms=1, max_rows=1, executor=ThreadPoolExecutor(2),
+                               max_concurrency=1)
+        await batcher.start()
+        running = asyncio.create_task(batcher.submit(patient(1)))
+        await asyncio.sleep(0.05)
+        waiting = [asyncio.create_task(batcher.submit(patient(i))) for i in range(2, 5)]
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        outcomes = await asyncio.gather(running, *waiting, return_exceptions=True)
+        with pytest.raises(RuntimeError):
+            await batcher.submit(patient(9))
+        return outcomes
+
+    first, *others = run(scenario())
+
+    assert float(first.probabilities[0, 0]) == 1
+    assert all(isinstance(outcome, RuntimeError) for outcome in others)
@@ -0,0 +1,143 @@
+"""
+Tests du cache des prédictions (src/models/cache.py)
+
+Les modèles factices renvoient une fonction simple de la première variable
+et notent les lignes reçues, pour vérifier que seuls les patients distincts
+absents du cache passent par les modèles.
+"""
+
+import numpy as np
+import pytest
+
+from src.models.cache import CachedPredictor, MemoryBackend, PredictionCache, canonicalize
+from src.models.ensemble import EnsemblePredictor
+
+
+class FakeModel:
+    """Modèle dont la probabilité positive vaut `scale` × première variable"""
+
+    def __init__(self, scale, error=None):
+        self.scale = scale
+        self.error = error
+        self.seen = []
+
+    def predict_proba(self, features):
+        if self.error is not None:
+            raise self.error
+        self.seen.append(np.array(features))
+        positive = self.scale * features[:, 0].astype(np.float64)
+        return np.column_stack([1 - positive, positive])
+
+
+def make_predictor(**models):
+    models = models or {'catboost': FakeModel(0.1), 'xgboost': FakeModel(0.05)}
+    cache = PredictionCache(MemoryBackend(max_entries=100, ttl=3600), list(models), version='v1')
+    return CachedPredictor(EnsemblePredictor(models), cache), models, cache
+
+
+def rows(*values):
+    return np.array([[value, 1.0, 2.0] for value in values], dtype=np.float32)
+
+
+def expected(values, scale):
+    return scale * np.asarray(values, dtype=np.float64)
+
+
+def test_duplicate_rows_are_scored_once():
+    """Test que les lignes identiques d'un lot ne passent qu'une fois par les modèles"""
+    predictor, models, cache = make_predictor()
+
+    result = predictor.predict(rows(3, 1, 3, 3, 1))
+
+    assert [len(seen) for seen in models['catboost'].seen] == [2]
+    np.testing.assert_allclose(result.probabilities[:, 0], expected([3, 1, 3, 3, 1], 0.1))
+    np.testing.assert_allclose(result.probabilities[:, 1], expected([3, 1, 3, 3, 1], 0.05))
+    assert cache.misses == 2
+
+
+def test_partial_hit_scores_only_missing_rows():
+    """Test qu'un lot mêlant patients connus et nouveaux n'envoie que les nouveaux aux modèles"""
+    predictor, models, cache = make_predictor()
+    predictor.predict(rows(1, 2))
+
+    result = predictor.predict(rows(2, 5, 1, 5))
+
+    last_call = models['catboost'].seen[-1]
+    np.testing.assert_array_equal(last_call[:, 0], [5])
+    np.testing.assert_allclose(result.probabilities[:, 0], expected([2, 5, 1, 5], 0.1))
+    assert result.model_names == ['catboost', 'xgboost']
+    assert cache.hits == 2
+    assert cache.misses == 3
+
+
+def test_full_hit_does_not_call_models():
+    """Test qu'un lot entièrement en cache ne rappelle pas les modèles"""
+    predictor, models, _ = make_predictor()
+    first = predictor.predict(rows(4, 6))
+
+    second = predictor.predict(rows(6, 4))
+
+    assert len(models['catboost'].seen) == 1
+    np.testing.assert_allclose(second.probabilities, first.probabilities[::-1])
+
+
+def test_incomplete_ensemble_is_not_cached():
+    """Test qu'un résultat partiel (modèle en échec) n'est pas mis en cache"""
+    failing = FakeModel(0.05, error=RuntimeError("modèle corrompu"))
+    predictor, models, cache = make_predictor(catboost=FakeModel(0.1), xgboost=failing)
+
+    result = predictor.predict(rows(1, 2, 1))
+
+    assert result.model_names == ['catboost']
+    assert 'xgboost' in result.errors
+    assert [len(seen) for seen in models['catboost'].seen] == [2]
+    np.testing.assert_allclose(result.probabilities[:, 0], expected([1, 2, 1], 0.1))
+    assert len(cache.backend) == 0
+
+    failing.error = None
+    repaired = predictor.predict(rows(1, 2))
+    assert repaired.model_names == ['catboost', 'xgboost']
+    assert len(cache.backend) == 2
+
+
+def test_incomplete_ensemble_keeps_cached_rows_of_answering_models():
+    """Test qu'avec un modèle en échec les lignes en cache sont réduites aux modèles qui ont répondu"""
+    xgboost = FakeModel(0.05)
+    predictor, models, cache = make_predictor(catboost=FakeModel(0.1), xgboost=xgboost)
+    predictor.predict(rows(1, 2))
+    xgboost.error = RuntimeError("modèle corrompu")
+
+    result = predictor.predict(rows(2, 3, 3))
+
+    assert result.model_names == ['catboost']
+    np.testing.assert_array_equal(models['catboost'].seen[-1][:, 0], [3])
+    np.testing.assert_allclose(result.probabilities[:, 0], expected([2, 3, 3], 0.1))
+    assert len(cache.backend) == 2
+
+
+def test_strict_mode_propagates_model_errors():
+    """Test que strict=True propage l'erreur d'un modèle au lieu de l'écarter"""
+    predictor, _, _ = make_predictor(catboost=FakeModel(0.1, error=ValueError("entrée invalide")))
+
+    with pytest.raises(ValueError):
+        predictor.predict(rows(1), strict=True)
+
+
+def test_negative_zero_shares_the_key_of_zero():
+    """Test que -0.0 et 0.0 donnent la même clé de cache"""
+    _, _, cache = make_predictor()
+    features = canonicalize(np.array([[0.0, 1.0], [-0.0, 1.0]], dtype=np.float32))
+
+    first, second = cache.keys(features)
+
+    assert first == second
+
+
+def test_memory_backend_evicts_least_recently_used():
+    """Test que le LRU borné écarte l'entrée la moins récemment utilisée"""
+    backend = MemoryBackend(max_entries=2, ttl=3600)
+    backend.set_many([('a', b'1'), ('b', b'2')])
+    backend.get_many(['a'])
+    backend.set_many([('c', b'3')])
+
+    assert backend.get_many(['a', 'b', 'c']) == [b'1', None, b'3']
@@ -0,0 +1,59 @@
+"""
+Tests de l'inférence en cascade (src/models/cascade.py)
+
+Le premier étage factice renvoie la première variable comme probabilité,
+ce qui place chaque patient exactement où l'on veut par rapport aux seuils.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.models.cascade import CASCADE_THRESHOLDS, CascadePredictor, uncertain
+
+
+class IdentityModel:
+    def predict_proba(self, features):
+        positive = features[:, 0].astype(np.float64)
+        return np.column_stack([1 - positive, positive])
+
+
+def make_cascade(**kwargs):
+    models = {'logistic_regression': IdentityModel(), 'catboost': IdentityModel()}
+    return CascadePredictor(models, first_stage='logistic_regression', main_model='catboost', **kwargs)
+
+
+def patients(*probabilities):
+    return np.column_stack([probabilities, np.zeros(len(probabilities))]).astype(np.float32)
+
+
+def test_default_bands_surround_risk_thresholds_only():
+    """Test que par défaut seuls les patients proches de 0.3 et 0.7 sont escaladés, pas ceux proches de 0.5"""
+    assert CASCADE_THRESHOLDS == (0.3, 0.7)
+
+    result = make_cascade(band=0.1).predict(patients(0.1, 0.25, 0.5, 0.55, 0.72, 0.95))
+
+    np.testing.assert_array_equal(result.escalated, [False, True, False, False, True, False])
+
+
+def test_decision_threshold_is_opt_in():
+    """Test qu'ajouter 0.5 aux seuils réunit les bandes sur (0.2, 0.8)"""
+    probabilities = np.array([0.15, 0.25, 0.5, 0.75, 0.85])
+
+    mask = uncertain(probabilities, band=0.1, thresholds=(0.3, 0.5, 0.7))
+
+    np.testing.assert_array_equal(mask, [False, True, True, True, False])
+
+
+def test_counters_are_exact_under_concurrency():
+    """Test que les compteurs de lignes et d'escalade restent exacts avec des appels concurrents"""
+    cascade = make_cascade(band=0.1)
+    batch = patients(0.1, 0.3, 0.9, 0.65)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: cascade.predict(batch), range(200)))
+
+    stats = cascade.stats()
+    assert stats['lignes'] == 800
+    assert stats['escaladees'] == 400
+    assert stats['taux_escalade'] == 0.5
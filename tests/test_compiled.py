@@ -0,0 +1,109 @@
+"""
+Tests des modèles compilés (src/models/compiled.py) et de leur chargement
+par le registre (src/models/registry.py)
+
+Les modèles sont entraînés sur des données synthétiques à graine fixe ; une
+partie des variables est entière, comme les variables catégorielles du jeu
+cardiaque, pour que des valeurs tombent exactement sur les seuils des arbres.
+"""
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from src.models.compiled import (DEFAULT_TOLERANCE, compile_model, export_compiled_models,
+                                 load_compiled)
+from src.models.registry import ModelRegistry
+
+
+def synthetic_data(n_rows=600, seed=42):
+    rng = np.random.default_rng(seed)
+    continuous = rng.normal(size=(n_rows, 4)) * [10, 20, 1, 5] + [55, 130, 1, 150]
+    categorical = rng.integers(0, 4, size=(n_rows, 3))
+    features = np.column_stack([continuous, categorical]).astype(np.float32)
+    margin = (0.05 * (features[:, 0] - 55) + 0.8 * features[:, 2] - 0.6 * features[:, 4]
+              + 0.4 * (features[:, 5] == 2) + rng.normal(scale=0.5, size=n_rows))
+    return features, (margin > 0).astype(int)
+
+
+def random_forest():
+    return RandomForestClassifier(n_estimators=30, max_depth=6, random_state=0)
+
+
+def logistic_regression():
+    return LogisticRegression(max_iter=1000)
+
+
+def scaled_logistic_regression():
+    return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+
+
+def xgboost():
+    xgb = pytest.importorskip('xgboost')
+    return xgb.XGBClassifier(n_estimators=40, max_depth=4, learning_rate=0.2, random_state=0)
+
+
+def catboost():
+    cb = pytest.importorskip('catboost')
+    return cb.CatBoostClassifier(iterations=40, depth=4, random_seed=0, verbose=False,
+                                 allow_writing_files=False)
+
+
+@pytest.mark.parametrize('make_model', [
+    random_forest, logistic_regression, scaled_logistic_regression, xgboost, catboost
+])
+def test_compiled_model_matches_original(make_model, tmp_path):
+    """Test que le modèle compilé, sauvegardé puis rechargé, reproduit predict_proba de l'original"""
+    X, y = synthetic_data()
+    X_train, y_train, X_test = X[:400], y[:400], X[400:]
+    model = make_model().fit(X_train, y_train)
+
+    export_compiled_models({'modele': model}, tmp_path, X_test)
+    compiled = load_compiled(tmp_path / 'modele')
+
+    expected = model.predict_proba(X_test)
+    actual = compiled.predict_proba(X_test)
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=DEFAULT_TOLERANCE)
+
+
+def test_unsupported_model_is_rejected():
+    """Test qu'un type de modèle inconnu lève ValueError au lieu d'être mal compilé"""
+    with pytest.raises(ValueError):
+        compile_model(object())
+
+
+def make_registry(tmp_path):
+    X, y = synthetic_data()
+    source = tmp_path / 'logistic_regression_model.pkl'
+    model = logistic_regression().fit(X, y)
+    joblib.dump(model, source)
+    export_compiled_models({'logistic_regression': model}, tmp_path / 'compiled',
+                           sources={'logistic_regression': source})
+    registry = ModelRegistry({'logistic_regression': str(source)}, tmp_path / 'compiled')
+    return registry, source, X, y
+
+
+def test_registry_loads_compiled_model_matching_its_pickle(tmp_path):
+    """Test que le registre charge la version compilée quand l'empreinte du pickle correspond"""
+    registry, _, _, _ = make_registry(tmp_path)
+
+    assert type(registry.get('logistic_regression')).__name__ == 'CompiledLinearModel'
+
+
+def test_registry_falls_back_to_retrained_pickle(tmp_path, caplog):
+    """Test qu'un pickle réentraîné après la compilation est chargé à la place de la version compilée périmée"""
+    registry, source, X, y = make_registry(tmp_path)
+    retrained = LogisticRegression(C=0.01, max_iter=1000).fit(X, y)
+    joblib.dump(retrained, source)
+
+    with caplog.at_level('WARNING', logger='src.models.registry'):
+        model = registry.get('logistic_regression')
+
+    assert type(model).__name__ == 'LogisticRegression'
+    np.testing.assert_allclose(model.predict_proba(X), retrained.predict_proba(X))
+    assert 'périmé' in caplog.text
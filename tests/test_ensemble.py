@@ -0,0 +1,91 @@
+"""
+Tests de l'inférence d'ensemble concurrente (src/models/ensemble.py)
+
+Un modèle bloqué sur un événement simule un calcul plus long que le délai :
+il ne rend son thread qu'une fois l'événement levé.
+"""
+
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.models.ensemble import EnsemblePredictor
+
+
+class FastModel:
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, features):
+        self.calls += 1
+        positive = np.full(len(features), 0.3)
+        return np.column_stack([1 - positive, positive])
+
+
+class BlockedModel(FastModel):
+    """Modèle qui attend `release` avant de répondre"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def predict_proba(self, features):
+        self.release.wait(timeout=10)
+        return super().predict_proba(features)
+
+
+def features():
+    return np.zeros((2, 3), dtype=np.float32)
+
+
+def test_overdue_model_is_skipped_until_its_call_finishes():
+    """Test qu'un modèle hors délai n'est plus soumis au pool tant que son appel tourne"""
+    fast, blocked = FastModel(), BlockedModel()
+    executor = ThreadPoolExecutor(4)
+    predictor = EnsemblePredictor({'fast': fast, 'blocked': blocked}, main_model='fast',
+                                  executor=executor, timeout=0.05)
+
+    first = predictor.predict(features())
+    second = predictor.predict(features())
+
+    assert first.model_names == second.model_names == ['fast']
+    assert 'Délai dépassé' in first.errors['blocked']
+    assert 'toujours en cours' in second.errors['blocked']
+    assert blocked.calls == 0
+
+    blocked.release.set()
+    executor.shutdown(wait=True)
+    executor = ThreadPoolExecutor(4)
+    predictor.executor = executor
+    third = predictor.predict(features())
+    executor.shutdown()
+
+    assert third.model_names == ['fast', 'blocked']
+    assert blocked.calls == 2
+
+
+def test_overdue_model_fails_fast_in_strict_mode():
+    """Test qu'en mode strict un modèle occupé par un appel hors délai lève TimeoutError sans attendre"""
+    blocked = BlockedModel()
+    executor = ThreadPoolExecutor(2)
+    predictor = EnsemblePredictor({'blocked': blocked}, executor=executor, timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        predictor.predict(features(), strict=True)
+    with pytest.raises(TimeoutError, match='occupé'):
+        predictor.predict(features(), strict=True)
+
+    blocked.release.set()
+    executor.shutdown()
+
+
+def test_feature_name_warning_filter_is_scoped():
+    """Test que le filtre de l'avertissement scikit-learn ne reste pas actif après l'inférence"""
+    filters = list(warnings.filters)
+
+    EnsemblePredictor({'fast': FastModel()}, main_model='fast').predict(features())
+
+    assert warnings.filters == filters
@@ -0,0 +1,138 @@
+"""
+Tests des statistiques incrémentales (src/data/incremental.py)
+
+Table cardiaque synthétique à graine fixe dans un dossier temporaire, avec
+quelques valeurs manquantes pour vérifier les corrélations par paire
+d'observations complètes. Moins de lignes que la taille des esquisses :
+les quartiles sont donc exacts. La référence est pandas sur la table typée
+par apply_schema, comme dans les pages.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import incremental
+from src.data.incremental import IncrementalStats, append_rows, refresh_stats, stats_path
+from src.data.storage import apply_schema
+
+
+def heart_table(n_rows, seed):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        'age': rng.integers(29, 78, n_rows),
+        'sex': rng.integers(0, 2, n_rows),
+        'cp': rng.integers(0, 4, n_rows),
+        'trestbps': rng.integers(94, 200, n_rows),
+        'chol': rng.integers(126, 565, n_rows).astype(float),
+        'thalach': rng.integers(71, 203, n_rows),
+        'oldpeak': rng.uniform(0, 6.2, n_rows).round(1),
+        'target': rng.integers(0, 2, n_rows)
+    })
+    data.loc[rng.choice(n_rows, size=max(1, n_rows // 20), replace=False), 'chol'] = np.nan
+    return data
+
+
+@pytest.fixture
+def table(tmp_path):
+    path = tmp_path / 'heart.csv'
+    heart_table(150, seed=1).to_csv(path, index=False)
+    return path
+
+
+def assert_matches_frame(stats, data):
+    # Mêmes types que les pages (mesures en float32)
+    numeric = apply_schema(data).select_dtypes(include=[np.number]).astype(np.float64)
+    assert stats.n_rows == len(data)
+    pd.testing.assert_frame_equal(stats.description(), numeric.describe(), check_exact=False, rtol=1e-9)
+    pd.testing.assert_frame_equal(stats.correlation(), numeric.corr(), check_exact=False, atol=1e-12)
+
+
+def test_appended_rows_match_pandas(table):
+    """Test qu'après ajout de lignes, describe() et corr() sont ceux de toute la table"""
+    refresh_stats(table)
+    extra = heart_table(60, seed=2)
+
+    stats = append_rows(extra, table)
+
+    assert_matches_frame(stats, pd.read_csv(table))
+    assert stats.target_counts == pd.read_csv(table)['target'].value_counts().to_dict()
+
+
+def test_appended_rows_match_full_rebuild(table):
+    """Test que la mise à jour par ajout donne les mêmes statistiques qu'un recalcul complet"""
+    refresh_stats(table)
+    append_rows(heart_table(40, seed=3), table)
+    append_rows(heart_table(25, seed=4), table)
+
+    updated = refresh_stats(table)
+    rebuilt = refresh_stats(table, rebuild=True)
+
+    assert updated.n_rows == rebuilt.n_rows == 215
+    pd.testing.assert_frame_equal(updated.description(), rebuilt.description(), check_exact=False, rtol=1e-9)
+    pd.testing.assert_frame_equal(updated.correlation(), rebuilt.correlation(), check_exact=False, atol=1e-12)
+    assert updated.target_counts == rebuilt.target_counts
+
+
+def test_only_appended_bytes_are_read(table, monkeypatch):
+    """Test qu'un ajout ne relit que les nouvelles lignes, sans recalcul complet"""
+    refresh_stats(table)
+    calls = []
+    monkeypatch.setattr(incremental, 'build_stats', lambda path: calls.append(path))
+    updates = []
+    update = IncrementalStats.update
+
+    def counting_update(self, data):
+        updates.append(len(data))
+        update(self, data)
+
+    monkeypatch.setattr(IncrementalStats, 'update', counting_update)
+
+    append_rows(heart_table(30, seed=5), table)
+
+    assert calls == []
+    assert sum(updates) == 30
+
+
+def test_rewritten_file_forces_rebuild(table, monkeypatch):
+    """Test qu'un fichier réécrit (et non complété) est relu entièrement"""
+    refresh_stats(table)
+    rewritten = heart_table(120, seed=6)
+    rewritten.to_csv(table, index=False)
+    rebuilds = []
+    build_stats = incremental.build_stats
+    monkeypatch.setattr(incremental, 'build_stats', lambda path: rebuilds.append(path) or build_stats(path))
+
+    stats = refresh_stats(table)
+
+    assert rebuilds == [table]
+    assert_matches_frame(stats, rewritten)
+
+
+def test_state_round_trips_through_save_and_load(table):
+    """Test que l'état enregistré puis relu redonne les mêmes statistiques et reprend les ajouts"""
+    stats = refresh_stats(table)
+
+    loaded = IncrementalStats.load(stats_path(table))
+
+    assert loaded.columns == stats.columns
+    assert loaded.numeric == stats.numeric
+    assert loaded.n_rows == stats.n_rows
+    assert loaded.source == stats.source
+    assert loaded.target_counts == stats.target_counts
+    pd.testing.assert_frame_equal(loaded.description(), stats.description())
+    pd.testing.assert_frame_equal(loaded.correlation(), stats.correlation())
+    pd.testing.assert_frame_equal(loaded.preview, stats.preview)
+
+    extra = heart_table(20, seed=7)
+    loaded.update(extra[loaded.columns])
+    stats.update(extra[stats.columns])
+    pd.testing.assert_frame_equal(loaded.description(), stats.description())
+
+
+def test_unreadable_state_is_ignored(table):
+    """Test qu'un état illisible est ignoré et les statistiques recalculées"""
+    stats_path(table).write_text('{"format": 1, "tronq')
+
+    assert IncrementalStats.load(stats_path(table)) is None
+    assert refresh_stats(table).n_rows == 150
@@ -0,0 +1,124 @@
+"""
+Tests du diagnostic en continu avec points de reprise (src/models/streaming.py)
+
+L'entrée reprend data/sample_data.csv avec un identifiant par ligne. Une
+exécution est interrompue par un modèle qui lève une exception au n-ième
+bloc, après que les blocs précédents ont été écrits et enregistrés ; la
+reprise doit produire exactement la sortie d'une exécution sans
+interruption, sans ligne manquante ni en double.
+"""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.ensemble import EnsemblePredictor
+from src.models.streaming import checkpoint_path, stream_score
+
+SAMPLE_FILE = Path(__file__).resolve().parent.parent / 'data' / 'sample_data.csv'
+CHUNK_SIZE = 16
+
+
+class Interrupted(Exception):
+    """Arrêt simulé du processus"""
+
+
+class AgeModel:
+    """Probabilité positive proportionnelle à l'âge ; lève Interrupted au bloc `fail_at`"""
+
+    def __init__(self, scale, fail_at=None):
+        self.scale = scale
+        self.fail_at = fail_at
+        self.calls = 0
+        self.rows = 0
+
+    def predict_proba(self, features):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise Interrupted(f"arrêt au bloc {self.calls}")
+        self.rows += len(features)
+        positive = np.clip(self.scale * features[:, 0].astype(np.float64) / 100, 0, 1)
+        return np.column_stack([1 - positive, positive])
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    sample = pd.read_csv(SAMPLE_FILE)
+    data = pd.concat([sample] * 2, ignore_index=True)
+    data.insert(0, 'patient_id', np.arange(len(data)))
+    path = tmp_path / 'patients.csv'
+    data.to_csv(path, index=False)
+    return path
+
+
+def run(input_file, output, fail_at=None):
+    models = {'catboost': AgeModel(1.0, fail_at), 'xgboost': AgeModel(0.8)}
+    progress = stream_score(input_file, output, models, chunk_size=CHUNK_SIZE,
+                            predictor=EnsemblePredictor(models))
+    return progress, models
+
+
+def read_output(path):
+    return pd.read_csv(path) if path.suffix == '.csv' else pd.read_parquet(path)
+
+
+@pytest.mark.parametrize('output_name', ['scores.csv', 'scores.parquet'])
+def test_resumed_run_matches_uninterrupted_run(input_file, tmp_path, output_name):
+    """Test qu'une exécution interrompue puis reprise produit la sortie d'une exécution sans interruption"""
+    reference_path = tmp_path / 'reference' / output_name
+    reference_path.parent.mkdir()
+    run(input_file, reference_path)
+    reference = read_output(reference_path)
+
+    output = tmp_path / output_name
+    with pytest.raises(Interrupted):
+        run(input_file, output, fail_at=4)
+    assert checkpoint_path(output).exists()
+
+    progress, models = run(input_file, output)
+    result = read_output(output)
+
+    n_rows = len(pd.read_csv(input_file))
+    assert progress['lignes'] == n_rows
+    assert progress['lignes_reprises'] == 3 * CHUNK_SIZE
+    assert models['catboost'].rows == n_rows - 3 * CHUNK_SIZE
+    assert result['patient_id'].tolist() == list(range(n_rows))
+    pd.testing.assert_frame_equal(result, reference)
+    assert not checkpoint_path(output).exists()
+
+
+def test_partially_written_csv_chunk_is_truncated(input_file, tmp_path):
+    """Test qu'un bloc CSV écrit en partie avant l'arrêt est tronqué à la reprise"""
+    reference_path = tmp_path / 'reference.csv'
+    run(input_file, reference_path)
+
+    output = tmp_path / 'scores.csv'
+    with pytest.raises(Interrupted):
+        run(input_file, output, fail_at=3)
+    with open(output, 'a') as f:
+        f.write('31,63,1,3,145')
+
+    run(input_file, output)
+
+    pd.testing.assert_frame_equal(read_output(output), read_output(reference_path))
+
+
+def test_parquet_part_without_checkpoint_is_replaced(input_file, tmp_path):
+    """Test qu'une partie Parquet écrite sans point de reprise est réécrite, pas dupliquée"""
+    reference_path = tmp_path / 'reference.parquet'
+    run(input_file, reference_path)
+
+    output = tmp_path / 'scores.parquet'
+    with pytest.raises(Interrupted):
+        run(input_file, output, fail_at=3)
+    # Arrêt entre l'écriture de la partie 2 et l'enregistrement du point de reprise
+    shutil.copy(output / 'part-000001.parquet', output / 'part-000002.parquet')
+
+    run(input_file, output)
+
+    result = read_output(output)
+    assert result['patient_id'].is_unique
+    pd.testing.assert_frame_equal(result, read_output(reference_path))